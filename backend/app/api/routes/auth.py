@@ -1,5 +1,7 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 
+from app.core.rate_limit import login_throttle
 from app.models.schemas import LoginRequest, AuthResponse
 from app.db.repositories.users import UsersRepository
 from app.db.repositories.tokens import TokensRepository
@@ -7,12 +9,21 @@ from app.db.repositories.tokens import TokensRepository
 router = APIRouter()
 
 @router.post("/login", response_model=AuthResponse)
-def login(payload: LoginRequest) -> AuthResponse:
-    users = UsersRepository()
-    user = users.authenticate(payload.username, payload.password)
+async def login(payload: LoginRequest, request: Request) -> AuthResponse:
+    client_ip = request.client.host if request.client else None
+    retry_after = login_throttle.check(payload.username, client_ip)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts. Please try again later.",
+            headers={"Retry-After": str(int(retry_after))},
+        )
+
+    # Async so requests waiting on bcrypt do not each hold a threadpool thread
+    user = await UsersRepository().aauthenticate(payload.username, payload.password)
     if not user:
+        login_throttle.record_failure(payload.username)
         raise HTTPException(status_code=401, detail="Invalid username or password.")
-
-    tokens = TokensRepository()
-    token = tokens.issue_token(user["username"])
+    token = await run_in_threadpool(TokensRepository().issue_token, user["username"])
+    login_throttle.reset(payload.username)
     return AuthResponse(access_token=token, user=user)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
 from app.core.deps import get_current_user
 from app.models.schemas import (
@@ -8,23 +8,65 @@ from app.models.schemas import (
     ChatMessagePublic,
 )
 from app.db.repositories.chat import ChatRepository
+from app.services.chat_writer import chat_writer
 
 router = APIRouter()
 
+
+def _etag(*parts) -> str:
+    return 'W/"' + "-".join(str(p) for p in parts) + '"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    candidates = [t.strip() for t in request.headers.get("if-none-match", "").split(",")]
+    return etag in candidates or "*" in candidates
+
+
 @router.get("/sessions", response_model=list[ChatSessionPublic])
-def list_sessions(current=Depends(get_current_user)) -> list[ChatSessionPublic]:
-    return ChatRepository().list_sessions(current["username"])
+def list_sessions(
+    request: Request,
+    response: Response,
+    before_id: int | None = Query(default=None, ge=1),
+    after_id: int | None = Query(default=None, ge=0),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    current=Depends(get_current_user),
+) -> list[ChatSessionPublic]:
+    """Newest first; pass the last id seen as before_id for the next page. Supports If-None-Match."""
+    repo = ChatRepository()
+    etag = _etag("s", *repo.sessions_version(current["username"]), before_id, after_id, limit)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return repo.list_sessions(current["username"], before_id=before_id, after_id=after_id, limit=limit)
 
 @router.post("/sessions", response_model=ChatSessionPublic)
 def create_session(payload: ChatSessionCreateRequest, current=Depends(get_current_user)) -> ChatSessionPublic:
     return ChatRepository().create_session(current["username"], payload.first_user_message)
 
 @router.get("/sessions/{session_id}/messages", response_model=list[ChatMessagePublic])
-def get_messages(session_id: int, current=Depends(get_current_user)) -> list[ChatMessagePublic]:
+def get_messages(
+    session_id: int,
+    request: Request,
+    response: Response,
+    before_id: int | None = Query(default=None, ge=1),
+    after_id: int | None = Query(default=None, ge=0),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    current=Depends(get_current_user),
+) -> list[ChatMessagePublic]:
+    """
+    Oldest first. With `limit` alone: the latest messages; `before_id` pages back,
+    `after_id` fetches only what was added since. Supports If-None-Match.
+    """
     repo = ChatRepository()
     if not repo.session_belongs_to_user(session_id, current["username"]):
         raise HTTPException(status_code=404, detail="Session not found.")
-    return repo.get_messages(session_id)
+    # Read-your-writes: turns queued by /crag/query land before the list is read
+    chat_writer.wait_for(session_id)
+    etag = _etag("m", session_id, *repo.messages_version(session_id), before_id, after_id, limit)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return repo.get_messages(session_id, before_id=before_id, after_id=after_id, limit=limit)
 
 @router.post("/sessions/{session_id}/messages", response_model=ChatMessagePublic)
 def append_message(session_id: int, payload: ChatMessageCreateRequest, current=Depends(get_current_user)) -> ChatMessagePublic:
@@ -1,63 +1,244 @@
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+import asyncio
+import json
+import os
+import shutil
+import tempfile
 
-from app.core.deps import get_current_user
-from app.models.schemas import QueryRequest, QueryResponse
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.conversation_memory import conversation_memory
+from app.core.deps import get_current_user, get_crag_service, require_role
+from app.core.metrics import trace_query
+from app.models.schemas import (
+    QueryRequest,
+    QueryResponse,
+    QueryTimings,
+    DocumentCatalogPage,
+    IngestionJobStatus,
+    ModelReloadRequest,
+    ServiceStatus,
+)
 from app.services.crag_service import CRAGService
+from app.services.chat_writer import chat_writer
+from app.services.registry import ServiceNotReady
 from app.db.repositories.chat import ChatRepository
+from app.db.repositories.documents import DocumentsRepository
 
 router = APIRouter()
 
 @router.post("/query", response_model=QueryResponse)
-def query(payload: QueryRequest, current=Depends(get_current_user)) -> QueryResponse:
-    # Instantiate the real CRAG Service
-    service = CRAGService()
-    
-    # We pass an empty history for now, or fetch from repo if needed
-    # Ideally, we should fetch previous messages from ChatRepository to pass as history
-    # For this migration, we kept it simple as per original design
-    
-    # generate_response returns a dict: {'answer': str, 'sources': List[str]}
-    result_dict = service.generate_response(query=payload.question, history=[])
-    
-    answer_text = result_dict["answer"]
-    sources_list = result_dict["sources"]
-    confidence = 1.0 # Placeholder, as CRAGService doesn't return raw confidence score easily in this dict
+async def query(
+    payload: QueryRequest,
+    current=Depends(get_current_user),
+    service: CRAGService = Depends(get_crag_service),
+) -> QueryResponse:
+    with trace_query("query") as trace:
+        history = await run_in_threadpool(_load_history, current["username"], payload.session_id)
 
-    repo = ChatRepository()
-    session_id = payload.session_id
-    if session_id is None:
-        session = repo.create_session(current["username"], payload.question)
-        session_id = session.id
-
-    repo.append_message(session_id, {"role": "user", "content": payload.question})
-    repo.append_message(
-        session_id,
-        {
-            "role": "assistant",
-            "content": answer_text,
-            "sources": sources_list,
-            "confidence": confidence,
-        },
-    )
+        # generate_response returns a dict: {'answer': str, 'sources': List[str]}
+        result_dict = await service.agenerate_response(query=payload.question, history=history)
+
+        answer_text = result_dict["answer"]
+        sources_list = result_dict["sources"]
+        confidence = 1.0 # Placeholder, as CRAGService doesn't return raw confidence score easily in this dict
+
+        with service.timings.measure("persist"):
+            session_id = await _persist_turn(current["username"], payload, answer_text, sources_list, confidence)
 
     return QueryResponse(
         session_id=session_id,
         answer=answer_text,
         sources=sources_list, # List[str]
         confidence=confidence,
+        timings=QueryTimings(**trace.summary()) if payload.include_timings else None,
     )
 
 
-@router.post("/ingest")
-def ingest_document(file: UploadFile = File(...), current=Depends(get_current_user)):
+@router.post("/query/stream")
+async def query_stream(
+    payload: QueryRequest,
+    current=Depends(get_current_user),
+    service: CRAGService = Depends(get_crag_service),
+) -> StreamingResponse:
+    """
+    Server-Sent Events version of /query.
+    Emits `intent`, `sources`, many `token` events, then `done` (with session_id) once the turn is saved.
+    With include_timings, `done` also carries the per-stage breakdown under `timings`.
+    """
+    username = current["username"]
+    # Resolved before streaming starts so an unknown session is a plain 404
+    history = await run_in_threadpool(_load_history, username, payload.session_id)
+
+    async def event_stream():
+        with trace_query("query_stream") as trace:
+            try:
+                async for event in service.astream_response(query=payload.question, history=history):
+                    if event["event"] == "done":
+                        confidence = 1.0
+                        with service.timings.measure("persist"):
+                            event["session_id"] = await _persist_turn(
+                                username, payload, event["answer"], event["sources"], confidence
+                            )
+                        event["confidence"] = confidence
+                        if payload.include_timings:
+                            event["timings"] = trace.summary()
+                    yield _sse(event)
+            except Exception as e:
+                yield _sse({"event": "error", "detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _sse(event: dict) -> str:
+    data = {k: v for k, v in event.items() if k != "event"}
+    return f"event: {event['event']}\ndata: {json.dumps(data)}\n\n"
+
+
+def _load_history(username: str, session_id: int | None) -> list[str]:
+    """Recent turns of the session for query rewriting; 404 if the session is not the user's."""
+    if session_id is None:
+        return []
+    # The previous turn may still be in the write-behind queue
+    chat_writer.wait_for(session_id)
+    # The database stays the authority on ownership; the memory only saves the tail query
+    repo = ChatRepository()
+    if not repo.session_belongs_to_user(session_id, username):
+        raise HTTPException(status_code=404, detail="Session not found.")
+    history = conversation_memory.history(session_id, username)
+    if history is not None:
+        return history
+    return conversation_memory.load(
+        session_id, username, repo.get_recent_messages(session_id, settings.MEMORY_TAIL_MESSAGES)
+    )
+
+
+def _turn_messages(payload: QueryRequest, answer: str, sources: list[str], confidence: float) -> list[dict]:
+    return [
+        {"role": "user", "content": payload.question},
+        {"role": "assistant", "content": answer, "sources": sources, "confidence": confidence},
+    ]
+
+
+async def _persist_turn(username: str, payload: QueryRequest, answer: str, sources: list[str], confidence: float) -> int:
+    """
+    Hands the turn to the write-behind writer. Only a new session is awaited (its id is
+    part of the response); turns for existing sessions are written in the background.
+    Inline writes (writer not running) are always awaited, so a failed save is a 500.
+    """
+    messages = _turn_messages(payload, answer, sources, confidence)
+    if not chat_writer.running:
+        # Inline write; keep it off the event loop
+        future = await run_in_threadpool(chat_writer.submit, username, payload.session_id, messages)
+        return future.result()
+
+    if payload.session_id is not None:
+        # The session may have been deleted while the answer was generated; catch that here,
+        # while the client can still be told, so background failures are real DB errors
+        owned = await run_in_threadpool(ChatRepository().session_belongs_to_user, payload.session_id, username)
+        if not owned:
+            raise HTTPException(status_code=404, detail="Session not found.")
+        chat_writer.submit(username, payload.session_id, messages)
+        return payload.session_id
+    return await asyncio.wrap_future(chat_writer.submit(username, payload.session_id, messages))
+
+
+@router.post("/ingest", response_model=IngestionJobStatus, status_code=202)
+async def ingest_document(
+    file: UploadFile = File(...),
+    current=Depends(get_current_user),
+    service: CRAGService = Depends(get_crag_service),
+) -> IngestionJobStatus:
+    """Queues a background ingestion job and returns immediately; poll /ingest/{job_id} for progress."""
     if not current.get("role") in ["admin", "master"]:
         raise HTTPException(status_code=403, detail="Admin/Master access required.")
 
-    service = CRAGService()
+    tmp_path = None
     try:
-        content = file.file.read()
-        res = service.ingest_file(filename=file.filename, content=content)
-        return {"message": res, "filename": file.filename}
+        tmp_path = await run_in_threadpool(_spool_upload, file)
+        job = service.ingestion.submit(file_name=file.filename, path=tmp_path)
     except Exception as e:
+        # The job owns the spooled file only once it is queued
+        if tmp_path is not None:
+            os.unlink(tmp_path)
         raise HTTPException(status_code=500, detail=str(e))
+    return IngestionJobStatus(**job.to_dict())
+
+
+@router.get("/ingest/{job_id}", response_model=IngestionJobStatus)
+def ingestion_status(
+    job_id: str,
+    current=Depends(get_current_user),
+    service: CRAGService = Depends(get_crag_service),
+) -> IngestionJobStatus:
+    require_role(current, allowed={"admin", "master"})
+    job = service.ingestion.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Ingestion job not found.")
+    return IngestionJobStatus(**job.to_dict())
+
+
+@router.get("/documents", response_model=DocumentCatalogPage)
+def list_documents(
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    current=Depends(get_current_user),
+) -> DocumentCatalogPage:
+    """Paginated document catalog, served from SQLite so it does not depend on the collection size."""
+    require_role(current, allowed={"admin", "master"})
+    repo = DocumentsRepository()
+    return DocumentCatalogPage(
+        items=repo.list_documents(limit=limit, offset=offset),
+        total=repo.count_documents(),
+        limit=limit,
+        offset=offset,
+    )
 
+
+@router.delete("/documents/{file_name}")
+def delete_document(
+    file_name: str,
+    current=Depends(get_current_user),
+    service: CRAGService = Depends(get_crag_service),
+) -> dict:
+    require_role(current, allowed={"admin", "master"})
+    if not service.ingestion.delete_document(file_name):
+        raise HTTPException(status_code=404, detail="Document not found.")
+    return {"status": "ok", "message": f"Deleted document {file_name}."}
+
+
+def _spool_upload(file: UploadFile) -> str:
+    # Copy in chunks rather than reading the whole upload into memory
+    suffix = os.path.splitext(file.filename or "")[1]
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        try:
+            shutil.copyfileobj(file.file, tmp, length=1024 * 1024)
+        except BaseException:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+        return tmp.name
+
+
+@router.get("/status", response_model=ServiceStatus)
+def service_status(request: Request, current=Depends(get_current_user)) -> ServiceStatus:
+    return ServiceStatus(**request.app.state.services.status())
+
+
+@router.post("/reload", response_model=ServiceStatus)
+def reload_model(payload: ModelReloadRequest, request: Request, current=Depends(get_current_user)) -> ServiceStatus:
+    require_role(current, allowed={"master"})
+    services = request.app.state.services
+    try:
+        services.reload(payload.component, payload.model)
+    except ServiceNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Reload failed: {e}")
+    return ServiceStatus(**services.status())
@@ -2,7 +2,9 @@ from fastapi import APIRouter, Depends, HTTPException
 
 from app.core.deps import get_current_user, require_role
 from app.models.schemas import UserCreateRequest, UserPublic, UserUpdateRequest, RoleUpdateRequest
+from app.core.security import hash_password
 from app.db.repositories.users import UsersRepository
+from app.db.sqlite import unit_of_work
 
 router = APIRouter()
 
@@ -21,20 +23,23 @@ def create_user(payload: UserCreateRequest, current=Depends(get_current_user)) -
 @router.put("/{username}", response_model=UserPublic)
 def update_user(username: str, payload: UserUpdateRequest, current=Depends(get_current_user)) -> UserPublic:
     repo = UsersRepository()
-    target = repo.get_user(username)
-    if not target:
-        raise HTTPException(status_code=404, detail="User not found.")
-
-    if current["role"] == "master":
-        pass
-    elif current["role"] == "admin":
-        if target["role"] != "staff":
-            raise HTTPException(status_code=403, detail="Admins can only update staff users.")
-    else:
-        if current["username"] != username:
-            raise HTTPException(status_code=403, detail="Not allowed.")
-
-    return repo.update_user(username, payload)
+    # Hash before the unit of work takes the write lock
+    password_hash = hash_password(payload.password) if payload.password is not None else None
+    with unit_of_work():
+        target = repo.get_user(username)
+        if not target:
+            raise HTTPException(status_code=404, detail="User not found.")
+
+        if current["role"] == "master":
+            pass
+        elif current["role"] == "admin":
+            if target["role"] != "staff":
+                raise HTTPException(status_code=403, detail="Admins can only update staff users.")
+        else:
+            if current["username"] != username:
+                raise HTTPException(status_code=403, detail="Not allowed.")
+
+        return repo.update_user(username, payload, password_hash=password_hash)
 
 @router.put("/{username}/role", response_model=UserPublic)
 def update_role(username: str, payload: RoleUpdateRequest, current=Depends(get_current_user)) -> UserPublic:
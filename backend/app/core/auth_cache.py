@@ -0,0 +1,59 @@
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from app.core.config import settings
+
+
+class AuthCache:
+    """
+    Bounded token -> user principal cache for bearer-token validation.
+    An entry lives for at most `ttl_s` and never past the token's own expiry.
+    User mutations (role/profile change, delete) must call invalidate_user().
+    """
+
+    def __init__(self, ttl_s: float, max_entries: int):
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, token: str) -> dict | None:
+        with self._lock:
+            hit = self._entries.get(token)
+            if hit is None:
+                return None
+            user, deadline = hit
+            if time.time() >= deadline:
+                del self._entries[token]
+                return None
+            self._entries.move_to_end(token)
+            return dict(user)
+
+    def put(self, token: str, user: dict, token_expires_at: datetime) -> None:
+        # Token expiry is stored as naive UTC
+        token_deadline = (token_expires_at - datetime.utcnow()).total_seconds() + time.time()
+        deadline = min(time.time() + self.ttl_s, token_deadline)
+        with self._lock:
+            self._entries[token] = (dict(user), deadline)
+            self._entries.move_to_end(token)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, username: str) -> None:
+        with self._lock:
+            stale = [t for t, (user, _) in self._entries.items() if user["username"] == username]
+            for token in stale:
+                del self._entries[token]
+
+    def invalidate_token(self, token: str) -> None:
+        with self._lock:
+            self._entries.pop(token, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+auth_cache = AuthCache(ttl_s=settings.auth_cache_ttl_seconds, max_entries=settings.auth_cache_max_entries)
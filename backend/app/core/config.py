@@ -3,16 +3,112 @@ import os
 
 class Settings(BaseModel):
     database_path: str = os.getenv("SQLITE_PATH", "app.db")
+    db_pool_size: int = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+    db_cache_size_kb: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", "20000"))
+    db_mmap_size_bytes: int = int(os.getenv("SQLITE_MMAP_SIZE_BYTES", str(256 * 1024 * 1024)))
+    db_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    db_statement_cache_size: int = int(os.getenv("SQLITE_STATEMENT_CACHE_SIZE", "256"))
+    # Also seed datasets/malaysia_tenancy_qa.json into knowledge_docs (demo/benchmark corpus; off in production)
+    seed_dataset_docs: bool = os.getenv("SEED_DATASET_DOCS", "false").lower() == "true"
+    # Chat turns from /crag/query are persisted by a background writer (see ChatWriter)
+    chat_write_behind_enabled: bool = os.getenv("CHAT_WRITE_BEHIND_ENABLED", "true").lower() == "true"
+    chat_write_batch_max_turns: int = int(os.getenv("CHAT_WRITE_BATCH_MAX_TURNS", "64"))
     token_ttl_minutes: int = int(os.getenv("TOKEN_TTL_MINUTES", "720"))
+    token_purge_interval_minutes: int = int(os.getenv("TOKEN_PURGE_INTERVAL_MINUTES", "30"))
+    auth_cache_ttl_seconds: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    auth_cache_max_entries: int = int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "10000"))
+    # Password hashing & login throttling
+    bcrypt_rounds: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    password_hash_workers: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    password_hash_max_concurrency: int = int(os.getenv("PASSWORD_HASH_MAX_CONCURRENCY", "8"))
+    login_max_failures_per_username: int = int(os.getenv("LOGIN_MAX_FAILURES_PER_USERNAME", "5"))
+    login_max_attempts_per_ip: int = int(os.getenv("LOGIN_MAX_ATTEMPTS_PER_IP", "30"))
+    login_throttle_window_seconds: int = int(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "300"))
+
     cors_allow_origins: list[str] = os.getenv("CORS_ALLOW_ORIGINS", "*").split(",")
+    # Prometheus text exposition at /metrics (unauthenticated, aggregate timings only)
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
 
     # AI Configuration
     LLM_MODEL: str = "phi3:mini"
     EMBEDDING_MODEL: str = "BAAI/bge-small-en-v1.5"
     RERANKER_MODEL: str = "cross-encoder/ms-marco-MiniLM-L-6-v2"
 
+    # Semantic answer cache (near-duplicate questions reuse a previous answer)
+    SEMANTIC_CACHE_ENABLED: bool = os.getenv("SEMANTIC_CACHE_ENABLED", "true").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    SEMANTIC_CACHE_TTL_SECONDS: int = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+    SEMANTIC_CACHE_MAX_ENTRIES: int = int(os.getenv("SEMANTIC_CACHE_MAX_ENTRIES", "1000"))
+
+    # Query embedding service (concurrent queries are encoded together)
+    EMBED_BATCH_SIZE: int = int(os.getenv("EMBED_BATCH_SIZE", "32"))
+    EMBED_BATCH_WAIT_MS: float = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+    EMBED_QUERY_CACHE_SIZE: int = int(os.getenv("EMBED_QUERY_CACHE_SIZE", "2048"))
+    EMBED_NUM_THREADS: int = int(os.getenv("EMBED_NUM_THREADS", "0"))  # torch intra-op threads; 0 = torch default
+    # Prepended to queries only (not documents); BGE models are trained with this prefix for retrieval
+    EMBED_QUERY_INSTRUCTION: str = os.getenv(
+        "EMBED_QUERY_INSTRUCTION", "Represent this question for searching relevant passages: "
+    )
+
+    # Intent classification: keyword rules -> embedding nearest-centroid -> LLM when not confident
+    INTENT_CLASSIFIER_ENABLED: bool = os.getenv("INTENT_CLASSIFIER_ENABLED", "true").lower() == "true"
+    # Query-to-centroid cosine cut-offs (both sides embedded as queries); re-tune with bench_intent.py --sweep
+    INTENT_MIN_SIMILARITY: float = float(os.getenv("INTENT_MIN_SIMILARITY", "0.6"))
+    INTENT_MIN_MARGIN: float = float(os.getenv("INTENT_MIN_MARGIN", "0.02"))
+
+    # Conversation memory for rewriting follow-up (DEPENDENT) questions; sized for num_ctx=2048
+    MEMORY_WINDOW_MESSAGES: int = int(os.getenv("MEMORY_WINDOW_MESSAGES", "4"))
+    MEMORY_TAIL_MESSAGES: int = int(os.getenv("MEMORY_TAIL_MESSAGES", "16"))  # loaded on a cold session
+    MEMORY_MESSAGE_CHARS: int = int(os.getenv("MEMORY_MESSAGE_CHARS", "600"))
+    MEMORY_SUMMARY_TOKENS: int = int(os.getenv("MEMORY_SUMMARY_TOKENS", "256"))
+    MEMORY_MAX_SESSIONS: int = int(os.getenv("MEMORY_MAX_SESSIONS", "1000"))
+
+    # Retrieval: dense (Qdrant) + keyword (SQLite FTS5/BM25) fused by reciprocal rank
+    HYBRID_RETRIEVAL_ENABLED: bool = os.getenv("HYBRID_RETRIEVAL_ENABLED", "true").lower() == "true"
+    RETRIEVAL_DENSE_TOP_K: int = int(os.getenv("RETRIEVAL_DENSE_TOP_K", "15"))
+    RETRIEVAL_KEYWORD_TOP_K: int = int(os.getenv("RETRIEVAL_KEYWORD_TOP_K", "10"))
+    RETRIEVAL_FUSED_TOP_K: int = int(os.getenv("RETRIEVAL_FUSED_TOP_K", "15"))
+    RETRIEVAL_RRF_K: int = int(os.getenv("RETRIEVAL_RRF_K", "60"))
+
+    # Reranking (cross-encoder over the fused candidates)
+    RERANK_TOP_N: int = int(os.getenv("RERANK_TOP_N", "5"))
+    RERANK_MAX_TOKENS: int = int(os.getenv("RERANK_MAX_TOKENS", "256"))
+    # Skip the cross-encoder when the top dense score is >= MIN_SCORE and leads the runner-up by >= MARGIN
+    RERANK_SKIP_MIN_SCORE: float = float(os.getenv("RERANK_SKIP_MIN_SCORE", "0.80"))
+    RERANK_SKIP_MARGIN: float = float(os.getenv("RERANK_SKIP_MARGIN", "0.10"))
+    RERANK_BATCH_SIZE: int = int(os.getenv("RERANK_BATCH_SIZE", "64"))
+    RERANK_BATCH_WAIT_MS: float = float(os.getenv("RERANK_BATCH_WAIT_MS", "5"))
+    RERANKER_BACKEND: str = os.getenv("RERANKER_BACKEND", "torch")  # torch | onnx | openvino
+    RERANKER_ONNX_FILE: str = os.getenv("RERANKER_ONNX_FILE", "")  # e.g. onnx/model_qint8_avx2.onnx
+
+    # Background ingestion
+    INGEST_PARSE_WORKERS: int = int(os.getenv("INGEST_PARSE_WORKERS", "2"))
+    INGEST_MAX_CONCURRENT_JOBS: int = int(os.getenv("INGEST_MAX_CONCURRENT_JOBS", "1"))
+    INGEST_EMBED_BATCH_SIZE: int = int(os.getenv("INGEST_EMBED_BATCH_SIZE", "64"))
+    INGEST_UPSERT_BATCH_SIZE: int = int(os.getenv("INGEST_UPSERT_BATCH_SIZE", "256"))
+
     # Database
     QDRANT_URL: str = os.getenv("QDRANT_URL", "http://localhost:6333")
+    # gRPC on a persistent HTTP/2 channel (same host as QDRANT_URL); REST stays the default
+    QDRANT_PREFER_GRPC: bool = os.getenv("QDRANT_PREFER_GRPC", "false").lower() == "true"
+    QDRANT_GRPC_PORT: int = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+    QDRANT_TIMEOUT_S: int = int(os.getenv("QDRANT_TIMEOUT_S", "10"))
+    QDRANT_GRPC_RETRIES: int = int(os.getenv("QDRANT_GRPC_RETRIES", "2"))  # retried on UNAVAILABLE only
+    # Embedded mode: a directory path runs Qdrant in-process (no server). It searches exactly,
+    # so the HNSW / quantization / on-disk settings below only apply to a Qdrant server.
+    QDRANT_PATH: str = os.getenv("QDRANT_PATH", "")
     COLLECTION_NAME: str = "crag_llamaindex"
 
+    # Collection layout (applied when created, and to an existing collection at startup)
+    QDRANT_HNSW_M: int = int(os.getenv("QDRANT_HNSW_M", "16"))
+    QDRANT_HNSW_EF_CONSTRUCT: int = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "100"))
+    QDRANT_ON_DISK: bool = os.getenv("QDRANT_ON_DISK", "false").lower() == "true"  # mmap original vectors + HNSW graph
+    QDRANT_QUANTIZATION: str = os.getenv("QDRANT_QUANTIZATION", "none")  # none | int8
+    QDRANT_QUANTIZATION_ALWAYS_RAM: bool = os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "true").lower() == "true"
+
+    # Search-time parameters
+    QDRANT_SEARCH_HNSW_EF: int = int(os.getenv("QDRANT_SEARCH_HNSW_EF", "0"))  # 0 = server default (ef_construct)
+    QDRANT_QUANTIZATION_RESCORE: bool = os.getenv("QDRANT_QUANTIZATION_RESCORE", "true").lower() == "true"
+    QDRANT_QUANTIZATION_OVERSAMPLING: float = float(os.getenv("QDRANT_QUANTIZATION_OVERSAMPLING", "2.0"))
+
 settings = Settings()
@@ -0,0 +1,103 @@
+import re
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+
+from app.core.config import settings
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+@dataclass
+class _SessionWindow:
+    username: str
+    messages: deque = field(default_factory=deque)  # (role, content), oldest first
+    summary: list[str] = field(default_factory=list)
+
+
+class ConversationMemory:
+    """
+    Recent turns per chat session, used as history for DEPENDENT query rewriting.
+
+    Keeps the last `window_messages` messages of recently active sessions (LRU over
+    `max_sessions`). Messages that fall out of the window are folded into a rolling
+    extractive summary (first sentence of each), trimmed from the oldest end to
+    `summary_tokens`, so the rendered history stays well inside the LLM's num_ctx.
+    ChatRepository.append_message records new messages; a session that is not in
+    memory is loaded once from a bounded tail query (see load()).
+    """
+
+    def __init__(self, window_messages: int, max_sessions: int, message_chars: int, summary_tokens: int):
+        self.window_messages = window_messages
+        self.max_sessions = max_sessions
+        self.message_chars = message_chars
+        self.summary_chars = summary_tokens * 4  # ~4 characters per token for English text
+        self._sessions: OrderedDict[int, _SessionWindow] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def history(self, session_id: int, username: str) -> list[str] | None:
+        """Rendered history for the session, or None if it is not in memory (or not the user's)."""
+        with self._lock:
+            window = self._sessions.get(session_id)
+            if window is None or window.username != username:
+                return None
+            self._sessions.move_to_end(session_id)
+            return self._render(window)
+
+    def load(self, session_id: int, username: str, messages: list[dict]) -> list[str]:
+        """Caches a session from its most recent messages (oldest first) and returns its history."""
+        window = _SessionWindow(username=username)
+        for message in messages:
+            self._push(window, message["role"], message["content"])
+        with self._lock:
+            self._sessions[session_id] = window
+            self._sessions.move_to_end(session_id)
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+            return self._render(window)
+
+    def record(self, session_id: int, role: str, content: str) -> None:
+        """Appends a message to a cached session; sessions not in memory are loaded on next use."""
+        with self._lock:
+            window = self._sessions.get(session_id)
+            if window is not None:
+                self._push(window, role, content)
+
+    def invalidate(self, session_id: int) -> None:
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sessions.clear()
+
+    def _push(self, window: _SessionWindow, role: str, content: str) -> None:
+        if role not in ("user", "assistant"):
+            return
+        window.messages.append((role, content))
+        while len(window.messages) > self.window_messages:
+            old_role, old_content = window.messages.popleft()
+            window.summary.append(self._summarise(old_role, old_content))
+        while window.summary and sum(len(s) for s in window.summary) > self.summary_chars:
+            window.summary.pop(0)
+
+    @staticmethod
+    def _summarise(role: str, content: str) -> str:
+        first = _SENTENCE_END.split(content.strip(), maxsplit=1)[0][:160]
+        return f"{'User asked' if role == 'user' else 'Assistant said'}: {first}"
+
+    def _render(self, window: _SessionWindow) -> list[str]:
+        lines = []
+        if window.summary:
+            lines.append("Earlier in this conversation: " + " | ".join(window.summary))
+        for role, content in window.messages:
+            lines.append(f"{'User' if role == 'user' else 'Assistant'}: {content[:self.message_chars]}")
+        return lines
+
+
+conversation_memory = ConversationMemory(
+    window_messages=settings.MEMORY_WINDOW_MESSAGES,
+    max_sessions=settings.MEMORY_MAX_SESSIONS,
+    message_chars=settings.MEMORY_MESSAGE_CHARS,
+    summary_tokens=settings.MEMORY_SUMMARY_TOKENS,
+)
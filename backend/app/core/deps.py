@@ -1,7 +1,8 @@
-from fastapi import Header, HTTPException
+from fastapi import Header, HTTPException, Request
 
+from app.core.auth_cache import auth_cache
 from app.db.repositories.tokens import TokensRepository
-from app.db.repositories.users import UsersRepository
+from app.services.registry import ServiceNotReady
 
 
 def get_current_user(authorization: str | None = Header(default=None)) -> dict:
@@ -9,17 +10,25 @@ def get_current_user(authorization: str | None = Header(default=None)) -> dict:
         raise HTTPException(status_code=401, detail="Missing bearer token.")
     token = authorization.split(" ", 1)[1].strip()
 
-    tokens = TokensRepository()
-    username = tokens.validate_token(token)
-    if not username:
-        raise HTTPException(status_code=401, detail="Invalid or expired token.")
+    user = auth_cache.get(token)
+    if user is not None:
+        return user
 
-    user = UsersRepository().get_user(username)
-    if not user:
-        raise HTTPException(status_code=401, detail="User no longer exists.")
+    principal = TokensRepository().get_principal(token)
+    if not principal:
+        raise HTTPException(status_code=401, detail="Invalid or expired token.")
+    user, expires_at = principal
+    auth_cache.put(token, user, expires_at)
     return user
 
 
 def require_role(current_user: dict, allowed: set[str]) -> None:
     if current_user.get("role") not in allowed:
         raise HTTPException(status_code=403, detail="Forbidden.")
+
+
+def get_crag_service(request: Request):
+    try:
+        return request.app.state.services.get_crag()
+    except ServiceNotReady as e:
+        raise HTTPException(status_code=503, detail=str(e))
@@ -0,0 +1,195 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Seconds; spans range from sub-millisecond cache lookups to multi-minute CPU generations
+LATENCY_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_label_str(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus text format (le buckets, _sum, _count)."""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS_S):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(values)) for key, values in self._series.items())
+        for key, values in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), values[:-1]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _label_str(self.labelnames, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_label_str(self.labelnames, key)} {values[-1]:.6f}")
+            lines.append(f"{self.name}_count{_label_str(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: list[Counter | Histogram] = []
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        metric = Counter(name, help_text, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, help_text: str, labelnames: tuple[str, ...] = (), buckets=LATENCY_BUCKETS_S) -> Histogram:
+        metric = Histogram(name, help_text, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_SECONDS = metrics.histogram(
+    "crag_stage_duration_seconds", "Time spent in each CRAG pipeline stage.", ("stage",)
+)
+QUERY_SECONDS = metrics.histogram(
+    "crag_query_duration_seconds", "End-to-end CRAG query time (excluding auth).", ("endpoint", "intent")
+)
+LLM_TOKENS = metrics.counter(
+    "crag_llm_tokens_total", "Tokens processed by the LLM, as reported by Ollama.", ("kind",)
+)
+CHAT_WRITE_FAILURES = metrics.counter(
+    "crag_chat_write_failures_total", "Chat turns the write-behind writer failed to save."
+)
+
+
+class QueryTrace:
+    """Per-request span collector; stages measured more than once (e.g. two LLM calls) are summed."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.intent: str | None = None
+        self.stages_ms: dict[str, float] = {}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._lock = threading.Lock()
+
+    def add_stage(self, stage: str, elapsed_ms: float) -> None:
+        with self._lock:
+            self.stages_ms[stage] = self.stages_ms.get(stage, 0.0) + elapsed_ms
+
+    def add_tokens(self, prompt: int, completion: int) -> None:
+        with self._lock:
+            self.prompt_tokens += prompt
+            self.completion_tokens += completion
+
+    @property
+    def total_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def summary(self) -> dict:
+        with self._lock:
+            stages = {stage: round(ms, 2) for stage, ms in self.stages_ms.items()}
+        return {
+            "total_ms": round(self.total_ms, 2),
+            "stages_ms": stages,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+        }
+
+
+# Context variables follow the request into asyncio.to_thread / run_in_threadpool workers
+_current_trace: ContextVar[QueryTrace | None] = ContextVar("crag_query_trace", default=None)
+
+
+def current_trace() -> QueryTrace | None:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_query(endpoint: str):
+    """Collects spans recorded anywhere below this point in the request; exports the total on exit."""
+    trace = QueryTrace()
+    token = _current_trace.set(trace)
+    try:
+        yield trace
+    finally:
+        try:
+            _current_trace.reset(token)
+        except ValueError:
+            # A streaming generator closed from another task; its context dies with it
+            pass
+        QUERY_SECONDS.observe(trace.total_ms / 1000, endpoint=endpoint, intent=trace.intent or "unknown")
+
+
+def record_stage(stage: str, elapsed_ms: float) -> None:
+    STAGE_SECONDS.observe(elapsed_ms / 1000, stage=stage)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_stage(stage, elapsed_ms)
+
+
+def record_tokens(prompt: int, completion: int) -> None:
+    LLM_TOKENS.inc(prompt, kind="prompt")
+    LLM_TOKENS.inc(completion, kind="completion")
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_tokens(prompt, completion)
+
+
+def set_intent(intent: str) -> None:
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.intent = intent
@@ -0,0 +1,71 @@
+import threading
+import time
+from collections import deque
+
+from app.core.config import settings
+
+
+class LoginThrottle:
+    """
+    Sliding-window limits checked before any bcrypt work is done:
+    - failed attempts per username (stops password guessing on one account)
+    - all attempts per client IP (stops one client spraying many accounts)
+    """
+
+    def __init__(self, max_failures_per_username: int, max_attempts_per_ip: int, window_s: float, max_keys: int = 50_000):
+        self.max_failures_per_username = max_failures_per_username
+        self.max_attempts_per_ip = max_attempts_per_ip
+        self.window_s = window_s
+        self.max_keys = max_keys
+        self._failures: dict[str, deque] = {}
+        self._attempts: dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def check(self, username: str, ip: str | None) -> float | None:
+        """Registers an attempt. Returns seconds to wait if the attempt must be rejected, else None."""
+        now = time.monotonic()
+        with self._lock:
+            failures = self._window(self._failures, f"user:{username.lower()}", now)
+            if len(failures) >= self.max_failures_per_username:
+                return self._retry_after(failures, now)
+
+            if ip:
+                attempts = self._window(self._attempts, f"ip:{ip}", now)
+                if len(attempts) >= self.max_attempts_per_ip:
+                    return self._retry_after(attempts, now)
+                attempts.append(now)
+        return None
+
+    def record_failure(self, username: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._window(self._failures, f"user:{username.lower()}", now).append(now)
+
+    def reset(self, username: str) -> None:
+        with self._lock:
+            self._failures.pop(f"user:{username.lower()}", None)
+
+    def _window(self, buckets: dict[str, deque], key: str, now: float) -> deque:
+        bucket = buckets.get(key)
+        if bucket is None:
+            if len(buckets) >= self.max_keys:
+                self._prune(buckets, now)
+            bucket = buckets[key] = deque()
+        while bucket and now - bucket[0] > self.window_s:
+            bucket.popleft()
+        return bucket
+
+    def _prune(self, buckets: dict[str, deque], now: float) -> None:
+        stale = [k for k, b in buckets.items() if not b or now - b[-1] > self.window_s]
+        for k in stale:
+            del buckets[k]
+
+    def _retry_after(self, bucket: deque, now: float) -> float:
+        return max(1.0, self.window_s - (now - bucket[0]))
+
+
+login_throttle = LoginThrottle(
+    max_failures_per_username=settings.login_max_failures_per_username,
+    max_attempts_per_ip=settings.login_max_attempts_per_ip,
+    window_s=settings.login_throttle_window_seconds,
+)
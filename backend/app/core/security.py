@@ -1,13 +1,85 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 import bcrypt
 
+from app.core.config import settings
 
-def hash_password(plain: str) -> str:
-    salt = bcrypt.gensalt(rounds=12)
+# bcrypt is deliberately slow (~250ms at cost 12). It runs in a small dedicated
+# process pool, and the semaphores cap how many calls can be queued on it at once.
+# The login route uses the async variants, which wait on the event loop rather than
+# on a threadpool thread, so a login burst cannot starve the sync routes' threads.
+_executor: ProcessPoolExecutor | None = None
+_executor_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(settings.password_hash_max_concurrency)
+_async_slots = asyncio.Semaphore(settings.password_hash_max_concurrency)
+
+
+def _hash(plain: str, rounds: int) -> str:
+    salt = bcrypt.gensalt(rounds=rounds)
     return bcrypt.hashpw(plain.encode("utf-8"), salt).decode("utf-8")
 
 
-def verify_password(plain: str, hashed: str) -> bool:
+def _verify(plain: str, hashed: str) -> bool:
     try:
         return bcrypt.checkpw(plain.encode("utf-8"), hashed.encode("utf-8"))
     except Exception:
         return False
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # spawn, not fork: the API process already runs threads (uvicorn, model warm-up)
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.password_hash_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def _run(fn, *args):
+    with _slots:
+        return _get_executor().submit(fn, *args).result()
+
+
+async def _arun(fn, *args):
+    async with _async_slots:
+        return await asyncio.wrap_future(_get_executor().submit(fn, *args))
+
+
+def hash_password(plain: str) -> str:
+    return _run(_hash, plain, settings.bcrypt_rounds)
+
+
+def verify_password(plain: str, hashed: str) -> bool:
+    return _run(_verify, plain, hashed)
+
+
+async def ahash_password(plain: str) -> str:
+    return await _arun(_hash, plain, settings.bcrypt_rounds)
+
+
+async def averify_password(plain: str, hashed: str) -> bool:
+    return await _arun(_verify, plain, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    """True when the stored hash was made with a different cost factor than BCRYPT_ROUNDS."""
+    try:
+        # Format: $2b$<cost>$<salt+hash>
+        return int(hashed.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return False
+
+
+def shutdown_password_pool() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
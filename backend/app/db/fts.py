@@ -0,0 +1,24 @@
+import re
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+# Words too common in questions to be worth matching on
+STOPWORDS = frozenset(
+    "the and for are was were can could does did has have had how what when where which who why "
+    "will would should with from that this there their they them you your about into any not "
+    "but all its our out too very just than then also may might must shall".split()
+)
+
+
+def match_query(text: str) -> str | None:
+    """
+    Turns free text into an FTS5 MATCH expression: each distinct term quoted (so user
+    input can't inject FTS syntax) and OR-ed together; ranking is left to bm25().
+    Returns None when nothing searchable is left.
+    """
+    terms = dict.fromkeys(
+        t for t in (w.lower() for w in _TOKEN.findall(text)) if len(t) > 2 and t not in STOPWORDS
+    )
+    if not terms:
+        return None
+    return " OR ".join(f'"{t}"' for t in terms)
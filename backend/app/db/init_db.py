@@ -1,54 +1,8 @@
+from app.db.migrations import migrate
 from app.db.sqlite import db
 
 
 def ensure_schema() -> None:
+    """Brings the database up to the latest schema version (see app/db/migrations.py)."""
     with db() as conn:
-        conn.executescript(
-            """
-            CREATE TABLE IF NOT EXISTS users (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              username TEXT UNIQUE NOT NULL,
-              password_hash TEXT NOT NULL,
-              role TEXT NOT NULL CHECK(role IN ('master','admin','staff')),
-              name TEXT NOT NULL,
-              email TEXT NOT NULL,
-              created_at TEXT NOT NULL,
-              last_login TEXT
-            );
-
-            CREATE TABLE IF NOT EXISTS auth_tokens (
-              token TEXT PRIMARY KEY,
-              username TEXT NOT NULL,
-              issued_at TEXT NOT NULL,
-              expires_at TEXT NOT NULL,
-              FOREIGN KEY(username) REFERENCES users(username) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS chat_sessions (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              username TEXT NOT NULL,
-              title TEXT NOT NULL,
-              created_at TEXT NOT NULL,
-              FOREIGN KEY(username) REFERENCES users(username) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS chat_messages (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              session_id INTEGER NOT NULL,
-              role TEXT NOT NULL CHECK(role IN ('user','assistant','system')),
-              content TEXT NOT NULL,
-              timestamp TEXT NOT NULL,
-              sources TEXT,
-              confidence REAL,
-              FOREIGN KEY(session_id) REFERENCES chat_sessions(id) ON DELETE CASCADE
-            );
-
-            CREATE TABLE IF NOT EXISTS knowledge_docs (
-              id INTEGER PRIMARY KEY AUTOINCREMENT,
-              title TEXT NOT NULL,
-              content TEXT NOT NULL,
-              tags TEXT,
-              created_at TEXT NOT NULL
-            );
-            """
-        )
+        migrate(conn)
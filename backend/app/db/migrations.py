@@ -0,0 +1,250 @@
+"""
+Versioned schema migrations.
+
+The applied version is stored in SQLite's `PRAGMA user_version`. Each migration runs
+in its own transaction together with the version bump, so a failed migration leaves
+the database at the previous version. Append new migrations to MIGRATIONS; never
+edit one that has shipped.
+
+Usage:
+  python -m app.db.migrations            # upgrade to latest
+  python -m app.db.migrations --status
+  python -m app.db.migrations --db other.db --target 1
+"""
+
+import argparse
+import sqlite3
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    sql: str
+
+
+MIGRATIONS: list[Migration] = [
+    Migration(
+        1,
+        "initial schema",
+        """
+        CREATE TABLE IF NOT EXISTS users (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          username TEXT UNIQUE NOT NULL,
+          password_hash TEXT NOT NULL,
+          role TEXT NOT NULL CHECK(role IN ('master','admin','staff')),
+          name TEXT NOT NULL,
+          email TEXT NOT NULL,
+          created_at TEXT NOT NULL,
+          last_login TEXT
+        );
+
+        CREATE TABLE IF NOT EXISTS auth_tokens (
+          token TEXT PRIMARY KEY,
+          username TEXT NOT NULL,
+          issued_at TEXT NOT NULL,
+          expires_at TEXT NOT NULL,
+          FOREIGN KEY(username) REFERENCES users(username) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS chat_sessions (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          username TEXT NOT NULL,
+          title TEXT NOT NULL,
+          created_at TEXT NOT NULL,
+          FOREIGN KEY(username) REFERENCES users(username) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS chat_messages (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          session_id INTEGER NOT NULL,
+          role TEXT NOT NULL CHECK(role IN ('user','assistant','system')),
+          content TEXT NOT NULL,
+          timestamp TEXT NOT NULL,
+          sources TEXT,
+          confidence REAL,
+          FOREIGN KEY(session_id) REFERENCES chat_sessions(id) ON DELETE CASCADE
+        );
+
+        CREATE TABLE IF NOT EXISTS knowledge_docs (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          title TEXT NOT NULL,
+          content TEXT NOT NULL,
+          tags TEXT,
+          created_at TEXT NOT NULL
+        );
+        """,
+    ),
+    Migration(
+        2,
+        "chat and token indexes",
+        """
+        -- list_sessions: WHERE username=? ORDER BY id DESC; also serves the users -> sessions cascade
+        CREATE INDEX IF NOT EXISTS idx_chat_sessions_username_id ON chat_sessions(username, id);
+        -- get_messages: WHERE session_id=? ORDER BY id; also serves the sessions -> messages cascade
+        CREATE INDEX IF NOT EXISTS idx_chat_messages_session_id_id ON chat_messages(session_id, id);
+        -- expired token purge
+        CREATE INDEX IF NOT EXISTS idx_auth_tokens_expires_at ON auth_tokens(expires_at);
+        -- users -> tokens cascade
+        CREATE INDEX IF NOT EXISTS idx_auth_tokens_username ON auth_tokens(username);
+        """,
+    ),
+    Migration(
+        3,
+        "ingested document registry",
+        """
+        -- One row per uploaded file (keyed by the name it was uploaded with)
+        CREATE TABLE IF NOT EXISTS documents (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          file_name TEXT UNIQUE NOT NULL,
+          file_hash TEXT NOT NULL,
+          size_bytes INTEGER NOT NULL,
+          page_count INTEGER NOT NULL DEFAULT 0,
+          chunk_count INTEGER NOT NULL DEFAULT 0,
+          ingested_at TEXT NOT NULL,
+          updated_at TEXT NOT NULL
+        );
+
+        -- Content hash of every chunk and the Qdrant point that holds its embedding
+        CREATE TABLE IF NOT EXISTS document_chunks (
+          document_id INTEGER NOT NULL,
+          chunk_hash TEXT NOT NULL,
+          point_id TEXT NOT NULL,
+          PRIMARY KEY (document_id, chunk_hash),
+          FOREIGN KEY(document_id) REFERENCES documents(id) ON DELETE CASCADE
+        );
+        """,
+    ),
+    Migration(
+        4,
+        "full-text search (BM25) over knowledge docs and document chunks",
+        """
+        -- Chunks get a stable rowid (FTS external content is keyed on it) plus their text
+        CREATE TABLE document_chunks_v4 (
+          id INTEGER PRIMARY KEY AUTOINCREMENT,
+          document_id INTEGER NOT NULL,
+          chunk_hash TEXT NOT NULL,
+          point_id TEXT NOT NULL,
+          page_label TEXT,
+          text TEXT NOT NULL DEFAULT '',
+          UNIQUE (document_id, chunk_hash),
+          FOREIGN KEY(document_id) REFERENCES documents(id) ON DELETE CASCADE
+        );
+        INSERT INTO document_chunks_v4 (document_id, chunk_hash, point_id)
+          SELECT document_id, chunk_hash, point_id FROM document_chunks;
+        DROP TABLE document_chunks;
+        ALTER TABLE document_chunks_v4 RENAME TO document_chunks;
+
+        CREATE VIRTUAL TABLE IF NOT EXISTS knowledge_docs_fts USING fts5(
+          title, content, tags,
+          content='knowledge_docs', content_rowid='id', tokenize='porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS knowledge_docs_fts_ai AFTER INSERT ON knowledge_docs BEGIN
+          INSERT INTO knowledge_docs_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags);
+        END;
+        CREATE TRIGGER IF NOT EXISTS knowledge_docs_fts_ad AFTER DELETE ON knowledge_docs BEGIN
+          INSERT INTO knowledge_docs_fts(knowledge_docs_fts, rowid, title, content, tags)
+            VALUES ('delete', old.id, old.title, old.content, old.tags);
+        END;
+        CREATE TRIGGER IF NOT EXISTS knowledge_docs_fts_au AFTER UPDATE ON knowledge_docs BEGIN
+          INSERT INTO knowledge_docs_fts(knowledge_docs_fts, rowid, title, content, tags)
+            VALUES ('delete', old.id, old.title, old.content, old.tags);
+          INSERT INTO knowledge_docs_fts(rowid, title, content, tags) VALUES (new.id, new.title, new.content, new.tags);
+        END;
+        INSERT INTO knowledge_docs_fts(knowledge_docs_fts) VALUES ('rebuild');
+
+        -- Chunks ingested before this migration have no text until their file is re-uploaded
+        CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(
+          text, content='document_chunks', content_rowid='id', tokenize='porter unicode61'
+        );
+        CREATE TRIGGER IF NOT EXISTS document_chunks_fts_ai AFTER INSERT ON document_chunks BEGIN
+          INSERT INTO chunks_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS document_chunks_fts_ad AFTER DELETE ON document_chunks BEGIN
+          INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+        END;
+        CREATE TRIGGER IF NOT EXISTS document_chunks_fts_au AFTER UPDATE OF text ON document_chunks BEGIN
+          INSERT INTO chunks_fts(chunks_fts, rowid, text) VALUES ('delete', old.id, old.text);
+          INSERT INTO chunks_fts(rowid, text) VALUES (new.id, new.text);
+        END;
+        INSERT INTO chunks_fts(chunks_fts) VALUES ('rebuild');
+        """,
+    ),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def _statements(script: str) -> list[str]:
+    """Splits a migration script into statements; semicolons in trigger bodies and comments stay put."""
+    statements, buffer = [], ""
+    for part in script.split(";"):
+        buffer += part + ";"
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip(" \n;"):
+                statements.append(buffer.strip())
+            buffer = ""
+    return statements
+
+
+def migrate(conn: sqlite3.Connection, target: int | None = None) -> list[Migration]:
+    """
+    Applies every pending migration up to `target` (default: latest). Returns the ones applied.
+
+    Each migration runs in its own BEGIN IMMEDIATE transaction and re-reads user_version
+    once it holds the write lock, so workers starting together apply it exactly once.
+    """
+    target = LATEST_VERSION if target is None else target
+    applied: list[Migration] = []
+
+    for migration in MIGRATIONS:
+        if migration.version <= current_version(conn) or migration.version > target:
+            continue
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if migration.version <= current_version(conn):
+                # Another worker applied it while we waited for the lock
+                conn.commit()
+                continue
+            print(f" [DB] Applying migration {migration.version}: {migration.name}")
+            for statement in _statements(migration.sql):
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied.append(migration)
+    return applied
+
+
+def main() -> None:
+    from app.core.config import settings
+
+    ap = argparse.ArgumentParser(description="Apply SQLite schema migrations.")
+    ap.add_argument("--db", default=settings.database_path, help="Path to the SQLite database")
+    ap.add_argument("--target", type=int, default=None, help="Migrate up to this version")
+    ap.add_argument("--status", action="store_true", help="Only print the current version")
+    args = ap.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        version = current_version(conn)
+        if args.status:
+            print(f"{args.db}: version {version} (latest {LATEST_VERSION})")
+            return
+        applied = migrate(conn, args.target)
+        print(f"{args.db}: version {current_version(conn)} ({len(applied)} migration(s) applied)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
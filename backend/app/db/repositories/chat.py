@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import json
 
+from app.core.conversation_memory import conversation_memory
 from app.db.sqlite import db
 
 
@@ -14,20 +15,42 @@ class ChatSession:
 
 
 class ChatRepository:
-    def list_sessions(self, username: str) -> list[dict]:
+    def list_sessions(
+        self, username: str, before_id: int | None = None, after_id: int | None = None, limit: int | None = None
+    ) -> list[dict]:
+        """Newest first. `before_id`/`after_id` are exclusive id cursors (older/newer sessions)."""
+        sql = "SELECT id, username, title, created_at FROM chat_sessions WHERE username=?"
+        params: list = [username]
+        if before_id is not None:
+            sql += " AND id < ?"
+            params.append(before_id)
+        if after_id is not None:
+            sql += " AND id > ?"
+            params.append(after_id)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(-1 if limit is None else limit)
         with db() as conn:
-            rows = conn.execute(
-                "SELECT id, username, title, created_at FROM chat_sessions WHERE username=? ORDER BY id DESC",
-                (username,),
-            ).fetchall()
+            rows = conn.execute(sql, params).fetchall()
             return [dict(r) for r in rows]
 
-    def create_session(self, username: str, first_user_message: str) -> ChatSession:
-        title = (
+    def sessions_version(self, username: str) -> tuple[int, int]:
+        """(count, max id) of the user's sessions; sessions are never edited, so this changes iff the list does."""
+        with db() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM chat_sessions WHERE username=?", (username,)
+            ).fetchone()
+            return row[0], row[1]
+
+    @staticmethod
+    def _title_for(first_user_message: str) -> str:
+        return (
             (first_user_message[:40] + "...")
             if len(first_user_message) > 40
             else first_user_message
         )
+
+    def create_session(self, username: str, first_user_message: str) -> ChatSession:
+        title = self._title_for(first_user_message)
         created_at = datetime.now().strftime("%Y-%m-%d %H:%M")
         with db() as conn:
             cur = conn.execute(
@@ -45,12 +68,29 @@ class ChatRepository:
             ).fetchone()
             return row is not None
 
-    def get_messages(self, session_id: int) -> list[dict]:
+    def get_messages(
+        self, session_id: int, before_id: int | None = None, after_id: int | None = None, limit: int | None = None
+    ) -> list[dict]:
+        """
+        Messages oldest first. `after_id` pages forward (the first `limit` newer messages);
+        otherwise the page is the last `limit` messages, before `before_id` if given.
+        """
+        sql = "SELECT id, role, content, timestamp, sources, confidence FROM chat_messages WHERE session_id=?"
+        params: list = [session_id]
+        if before_id is not None:
+            sql += " AND id < ?"
+            params.append(before_id)
+        if after_id is not None:
+            sql += " AND id > ?"
+            params.append(after_id)
+        newest_first = after_id is None and limit is not None
+        sql += f" ORDER BY id {'DESC' if newest_first else 'ASC'} LIMIT ?"
+        params.append(-1 if limit is None else limit)
+
         with db() as conn:
-            rows = conn.execute(
-                "SELECT role, content, timestamp, sources, confidence FROM chat_messages WHERE session_id=? ORDER BY id ASC",
-                (session_id,),
-            ).fetchall()
+            rows = conn.execute(sql, params).fetchall()
+            if newest_first:
+                rows.reverse()
             out: list[dict] = []
             for r in rows:
                 item = dict(r)
@@ -64,35 +104,96 @@ class ChatRepository:
                 out.append(item)
             return out
 
-    def append_message(self, session_id: int, payload: dict) -> dict:
-        role = payload["role"]
-        content = payload["content"]
-        ts = payload.get("timestamp") or datetime.now().isoformat()
-        sources = payload.get("sources")
-        confidence = payload.get("confidence")
+    def messages_version(self, session_id: int) -> tuple[int, int]:
+        """(count, max id) of the session's messages; messages are append-only."""
+        with db() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*), COALESCE(MAX(id), 0) FROM chat_messages WHERE session_id=?", (session_id,)
+            ).fetchone()
+            return row[0], row[1]
+
+    def get_recent_messages(self, session_id: int, limit: int) -> list[dict]:
+        """The last `limit` messages of a session, oldest first (role and content only)."""
+        with db() as conn:
+            rows = conn.execute(
+                "SELECT role, content FROM chat_messages WHERE session_id=? ORDER BY id DESC LIMIT ?",
+                (session_id, limit),
+            ).fetchall()
+            return [dict(r) for r in reversed(rows)]
 
+    @staticmethod
+    def _message_row(session_id: int, payload: dict) -> tuple:
+        sources = payload.get("sources")
         sources_json = (
             json.dumps(sources)
             if isinstance(sources, list)
             else (json.dumps([sources]) if sources else None)
         )
+        return (
+            session_id,
+            payload["role"],
+            payload["content"],
+            payload.get("timestamp") or datetime.now().isoformat(),
+            sources_json,
+            payload.get("confidence"),
+        )
 
+    def append_message(self, session_id: int, payload: dict) -> dict:
+        row = self._message_row(session_id, payload)
         with db() as conn:
-            conn.execute(
+            cur = conn.execute(
                 "INSERT INTO chat_messages (session_id, role, content, timestamp, sources, confidence) VALUES (?,?,?,?,?,?)",
-                (session_id, role, content, ts, sources_json, confidence),
+                row,
             )
-            msg_id = conn.execute("SELECT last_insert_rowid() AS id").fetchone()["id"]
+            msg_id = cur.lastrowid
 
+        _, role, content, ts, _, confidence = row
+        conversation_memory.record(session_id, role, content)
         return {
             "id": msg_id,
             "role": role,
             "content": content,
             "timestamp": ts,
-            "sources": sources or [],
+            "sources": payload.get("sources") or [],
             "confidence": confidence,
         }
 
+    def save_turn(self, username: str, session_id: int | None, messages: list[dict]) -> tuple[int, list[int]]:
+        """
+        Persists a conversation turn in one transaction: the session (created when
+        session_id is None, titled after the first message) and all of its messages
+        in a single multi-row INSERT ... RETURNING. Returns (session_id, message ids).
+        """
+        with db() as conn:
+            if session_id is None:
+                title = self._title_for(messages[0]["content"])
+                session_id = conn.execute(
+                    "INSERT INTO chat_sessions (username, title, created_at) VALUES (?,?,?) RETURNING id",
+                    (username, title, datetime.now().strftime("%Y-%m-%d %H:%M")),
+                ).fetchone()[0]
+
+            rows = [self._message_row(session_id, m) for m in messages]
+            placeholders = ",".join(["(?,?,?,?,?,?)"] * len(rows))
+            # RETURNING order is unspecified; AUTOINCREMENT ids follow insertion order
+            ids = sorted(
+                r[0]
+                for r in conn.execute(
+                    f"INSERT INTO chat_messages (session_id, role, content, timestamp, sources, confidence) "
+                    f"VALUES {placeholders} RETURNING id",
+                    [value for row in rows for value in row],
+                ).fetchall()
+            )
+
+        for _, role, content, *_ in rows:
+            conversation_memory.record(session_id, role, content)
+        return session_id, ids
+
     def clear_sessions(self, username: str) -> None:
         with db() as conn:
-            conn.execute("DELETE FROM chat_sessions WHERE username=?", (username,))
+            session_ids = [
+                r[0] for r in conn.execute(
+                    "DELETE FROM chat_sessions WHERE username=? RETURNING id", (username,)
+                ).fetchall()
+            ]
+        for session_id in session_ids:
+            conversation_memory.invalidate(session_id)
@@ -1,22 +1,23 @@
+from app.db.fts import match_query
 from app.db.sqlite import db
 
 
 class DocsRepository:
     def search_keyword(self, query: str, limit: int = 5) -> list[dict]:
-        # Split query into terms to improve recall (simple "OR" search)
-        terms = [t.strip() for t in query.lower().split() if len(t.strip()) > 2]
-        if not terms:
-            terms = [query.lower()]
-
-        conditions = []
-        params = []
-        for term in terms:
-            conditions.append("(lower(title) LIKE ? OR lower(content) LIKE ?)")
-            params.extend([f"%{term}%", f"%{term}%"])
-        
-        sql = f"SELECT id, title, content, tags FROM knowledge_docs WHERE {' OR '.join(conditions)} LIMIT ?"
-        params.append(limit)
+        """BM25-ranked full-text search over knowledge_docs (best match first)."""
+        expression = match_query(query)
+        if expression is None:
+            return []
 
+        # bm25() is lower-is-better; title matches weigh more than body matches
+        sql = """
+            SELECT d.id, d.title, d.content, d.tags, -bm25(knowledge_docs_fts, 5.0, 1.0, 2.0) AS score
+            FROM knowledge_docs_fts
+            JOIN knowledge_docs d ON d.id = knowledge_docs_fts.rowid
+            WHERE knowledge_docs_fts MATCH ?
+            ORDER BY score DESC
+            LIMIT ?
+        """
         with db() as conn:
-            rows = conn.execute(sql, params).fetchall()
+            rows = conn.execute(sql, (expression, limit)).fetchall()
             return [dict(r) for r in rows]
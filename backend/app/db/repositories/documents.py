@@ -0,0 +1,129 @@
+from datetime import datetime
+
+from app.db.fts import match_query
+from app.db.sqlite import db
+
+
+class DocumentsRepository:
+    def get_document(self, file_name: str) -> dict | None:
+        with db() as conn:
+            row = conn.execute(
+                "SELECT * FROM documents WHERE file_name=?", (file_name,)
+            ).fetchone()
+            return dict(row) if row else None
+
+    def get_chunk_points(self, document_id: int) -> dict[str, str]:
+        """chunk_hash -> Qdrant point id for every chunk currently stored for the document."""
+        with db() as conn:
+            rows = conn.execute(
+                "SELECT chunk_hash, point_id FROM document_chunks WHERE document_id=?",
+                (document_id,),
+            ).fetchall()
+            return {r["chunk_hash"]: r["point_id"] for r in rows}
+
+    def save_document(
+        self,
+        file_name: str,
+        file_hash: str,
+        size_bytes: int,
+        page_count: int,
+        chunks: dict[str, tuple[str, str | None, str]],
+    ) -> int:
+        """
+        Creates or updates the registry entry and its chunk list in one transaction.
+        `chunks` maps chunk_hash -> (point_id, page_label, text); unchanged chunks keep
+        their rows (and full-text index entries), only removed/new ones are written.
+        """
+        now = datetime.now().isoformat()
+        with db() as conn:
+            row = conn.execute(
+                "SELECT id FROM documents WHERE file_name=?", (file_name,)
+            ).fetchone()
+            if row:
+                document_id = row["id"]
+                conn.execute(
+                    "UPDATE documents SET file_hash=?, size_bytes=?, page_count=?, chunk_count=?, updated_at=? WHERE id=?",
+                    (file_hash, size_bytes, page_count, len(chunks), now, document_id),
+                )
+                stored = conn.execute(
+                    "SELECT chunk_hash FROM document_chunks WHERE document_id=?", (document_id,)
+                ).fetchall()
+                conn.executemany(
+                    "DELETE FROM document_chunks WHERE document_id=? AND chunk_hash=?",
+                    [(document_id, r["chunk_hash"]) for r in stored if r["chunk_hash"] not in chunks],
+                )
+            else:
+                cur = conn.execute(
+                    "INSERT INTO documents (file_name,file_hash,size_bytes,page_count,chunk_count,ingested_at,updated_at) VALUES (?,?,?,?,?,?,?)",
+                    (file_name, file_hash, size_bytes, page_count, len(chunks), now, now),
+                )
+                document_id = cur.lastrowid
+
+            # Rows stored before chunk text was kept are backfilled when their chunk is seen again
+            conn.executemany(
+                """
+                INSERT INTO document_chunks (document_id, chunk_hash, point_id, page_label, text) VALUES (?,?,?,?,?)
+                ON CONFLICT(document_id, chunk_hash) DO UPDATE
+                SET page_label=excluded.page_label, text=excluded.text
+                WHERE document_chunks.text = ''
+                """,
+                [(document_id, h, p, page, text) for h, (p, page, text) in chunks.items()],
+            )
+            return document_id
+
+    def search_chunks(self, query: str, limit: int = 10) -> list[dict]:
+        """BM25-ranked full-text search over ingested chunks (best match first)."""
+        expression = match_query(query)
+        if expression is None:
+            return []
+        with db() as conn:
+            rows = conn.execute(
+                """
+                SELECT c.point_id, c.page_label, c.text, d.file_name, -bm25(chunks_fts) AS score
+                FROM chunks_fts
+                JOIN document_chunks c ON c.id = chunks_fts.rowid
+                JOIN documents d ON d.id = c.document_id
+                WHERE chunks_fts MATCH ?
+                ORDER BY score DESC
+                LIMIT ?
+                """,
+                (expression, limit),
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def delete_document(self, file_name: str) -> bool:
+        with db() as conn:
+            cur = conn.execute("DELETE FROM documents WHERE file_name=?", (file_name,))
+            return cur.rowcount > 0
+
+    def list_documents(self, limit: int = 50, offset: int = 0) -> list[dict]:
+        with db() as conn:
+            rows = conn.execute(
+                """
+                SELECT file_name, size_bytes, page_count, chunk_count, ingested_at, updated_at
+                FROM documents ORDER BY file_name LIMIT ? OFFSET ?
+                """,
+                (limit, offset),
+            ).fetchall()
+            return [dict(r) for r in rows]
+
+    def count_documents(self) -> int:
+        with db() as conn:
+            return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def register_untracked(self, chunk_counts: dict[str, int]) -> int:
+        """
+        Adds catalog rows for files present in Qdrant but not in the registry (ingested before it existed).
+        They get an empty file hash, so the next upload of the same name replaces their points.
+        """
+        now = datetime.now().isoformat()
+        with db() as conn:
+            cur = conn.executemany(
+                "INSERT OR IGNORE INTO documents (file_name,file_hash,size_bytes,page_count,chunk_count,ingested_at,updated_at) VALUES (?,?,?,?,?,?,?)",
+                [(name, "", 0, 0, count, now, now) for name, count in chunk_counts.items()],
+            )
+            return cur.rowcount
+
+    def clear(self) -> None:
+        with db() as conn:
+            conn.execute("DELETE FROM documents")
@@ -29,3 +29,33 @@ class TokensRepository:
                 conn.execute("DELETE FROM auth_tokens WHERE token=?", (token,))
                 return None
             return row["username"]
+
+    def get_principal(self, token: str) -> tuple[dict, datetime] | None:
+        """
+        Token validation and user lookup in one query.
+        Returns (public user dict, token expiry) or None for unknown/expired tokens or deleted users.
+        """
+        with db() as conn:
+            row = conn.execute(
+                """
+                SELECT t.expires_at, u.username, u.role, u.name, u.email, u.created_at, u.last_login
+                FROM auth_tokens t JOIN users u ON u.username = t.username
+                WHERE t.token=?
+                """,
+                (token,),
+            ).fetchone()
+            if not row:
+                return None
+            expires_at = datetime.fromisoformat(row["expires_at"])
+            if datetime.utcnow() > expires_at:
+                conn.execute("DELETE FROM auth_tokens WHERE token=?", (token,))
+                return None
+            user = {k: row[k] for k in ("username", "role", "name", "email", "created_at", "last_login")}
+            return user, expires_at
+
+    def purge_expired(self) -> int:
+        with db() as conn:
+            cur = conn.execute(
+                "DELETE FROM auth_tokens WHERE expires_at < ?", (datetime.utcnow().isoformat(),)
+            )
+            return cur.rowcount
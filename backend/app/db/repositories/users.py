@@ -1,25 +1,47 @@
+import asyncio
 from datetime import datetime
 from fastapi import HTTPException
 
-from app.db.sqlite import db
-from app.core.security import hash_password, verify_password
+from app.core.auth_cache import auth_cache
+from app.core.conversation_memory import conversation_memory
+from app.db.sqlite import after_commit, db
+from app.core.security import ahash_password, averify_password, hash_password, needs_rehash, verify_password
 from app.models.schemas import UserCreateRequest, UserUpdateRequest, UserPublic
 
 
 class UsersRepository:
     def authenticate(self, username: str, password: str) -> dict | None:
+        # bcrypt runs between the two short transactions so no pooled connection is held during it
+        row = self._find_row(username)
+        if not row or not verify_password(password, row["password_hash"]):
+            return None
+        # Transparently upgrade hashes made with an older BCRYPT_ROUNDS
+        new_hash = hash_password(password) if needs_rehash(row["password_hash"]) else None
+        return self._record_login(row, new_hash)
+
+    async def aauthenticate(self, username: str, password: str) -> dict | None:
+        """Async twin of authenticate for the login route: bcrypt is awaited, not waited on in a thread."""
+        row = await asyncio.to_thread(self._find_row, username)
+        if not row or not await averify_password(password, row["password_hash"]):
+            return None
+        new_hash = await ahash_password(password) if needs_rehash(row["password_hash"]) else None
+        return await asyncio.to_thread(self._record_login, row, new_hash)
+
+    def _find_row(self, username: str):
         with db() as conn:
-            row = conn.execute(
+            return conn.execute(
                 "SELECT * FROM users WHERE username=?", (username,)
             ).fetchone()
-            if not row:
-                return None
-            if not verify_password(password, row["password_hash"]):
-                return None
 
-            now = datetime.now().strftime("%Y-%m-%d %H:%M")
-            conn.execute("UPDATE users SET last_login=? WHERE username=?", (now, username))
-            return self._row_to_public_dict(row, last_login=now)
+    def _record_login(self, row, new_hash: str | None) -> dict:
+        now = datetime.now().strftime("%Y-%m-%d %H:%M")
+        with db() as conn:
+            conn.execute("UPDATE users SET last_login=? WHERE username=?", (now, row["username"]))
+            if new_hash:
+                conn.execute(
+                    "UPDATE users SET password_hash=? WHERE username=?", (new_hash, row["username"])
+                )
+        return self._row_to_public_dict(row, last_login=now)
 
     def get_user(self, username: str) -> dict | None:
         with db() as conn:
@@ -36,6 +58,8 @@ class UsersRepository:
             return [UserPublic(**self._row_to_public_dict(r)) for r in rows]
 
     def create_user(self, payload: UserCreateRequest) -> UserPublic:
+        # bcrypt runs before the connection is borrowed
+        password_hash = hash_password(payload.password)
         with db() as conn:
             exists = conn.execute(
                 "SELECT 1 FROM users WHERE username=?", (payload.username,)
@@ -48,7 +72,7 @@ class UsersRepository:
                 "INSERT INTO users (username,password_hash,role,name,email,created_at,last_login) VALUES (?,?,?,?,?,?,?)",
                 (
                     payload.username,
-                    hash_password(payload.password),
+                    password_hash,
                     payload.role,
                     payload.name,
                     payload.email,
@@ -61,7 +85,12 @@ class UsersRepository:
             ).fetchone()
             return UserPublic(**self._row_to_public_dict(row))
 
-    def update_user(self, username: str, payload: UserUpdateRequest) -> UserPublic:
+    def update_user(
+        self, username: str, payload: UserUpdateRequest, password_hash: str | None = None
+    ) -> UserPublic:
+        """Callers inside a unit_of_work() pass `password_hash`, hashed before the unit began."""
+        if password_hash is None and payload.password is not None:
+            password_hash = hash_password(payload.password)
         with db() as conn:
             row = conn.execute(
                 "SELECT * FROM users WHERE username=?", (username,)
@@ -78,9 +107,9 @@ class UsersRepository:
             if payload.email is not None:
                 updates.append("email=?")
                 params.append(payload.email)
-            if payload.password is not None:
+            if password_hash is not None:
                 updates.append("password_hash=?")
-                params.append(hash_password(payload.password))
+                params.append(password_hash)
 
             if updates:
                 params.append(username)
@@ -91,7 +120,8 @@ class UsersRepository:
             updated = conn.execute(
                 "SELECT * FROM users WHERE username=?", (username,)
             ).fetchone()
-            return UserPublic(**self._row_to_public_dict(updated))
+        after_commit(lambda: auth_cache.invalidate_user(username))
+        return UserPublic(**self._row_to_public_dict(updated))
 
     def update_role(self, username: str, role: str) -> UserPublic:
         with db() as conn:
@@ -104,7 +134,8 @@ class UsersRepository:
             updated = conn.execute(
                 "SELECT * FROM users WHERE username=?", (username,)
             ).fetchone()
-            return UserPublic(**self._row_to_public_dict(updated))
+        after_commit(lambda: auth_cache.invalidate_user(username))
+        return UserPublic(**self._row_to_public_dict(updated))
 
     def delete_user(self, username: str) -> bool:
         with db() as conn:
@@ -113,8 +144,21 @@ class UsersRepository:
             ).fetchone()
             if not row:
                 return False
+            # chat_sessions rows go with the user (ON DELETE CASCADE)
+            session_ids = [
+                r[0] for r in conn.execute(
+                    "SELECT id FROM chat_sessions WHERE username=?", (username,)
+                ).fetchall()
+            ]
             conn.execute("DELETE FROM users WHERE username=?", (username,))
-            return True
+
+        def evict() -> None:
+            auth_cache.invalidate_user(username)
+            for session_id in session_ids:
+                conversation_memory.invalidate(session_id)
+
+        after_commit(evict)
+        return True
 
     @staticmethod
     def _row_to_public_dict(row, last_login: str | None = None) -> dict:
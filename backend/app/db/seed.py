@@ -1,6 +1,8 @@
 from datetime import datetime
+import json
 import os
 
+from app.core.config import settings
 from app.db.sqlite import db
 from app.core.security import hash_password
 
@@ -22,6 +24,22 @@ DEFAULT_DOCS = [
     ),
 ]
 
+# Tenancy Q&A set shipped with the backend (title/content/tags entries). The retrieval
+# benchmarks score against it, so it is only seeded with SEED_DATASET_DOCS=true.
+DATASET_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "datasets",
+    "malaysia_tenancy_qa.json",
+)
+
+
+def dataset_docs() -> list[tuple[str, str, str]]:
+    """The dataset as (title, content, tags), like DEFAULT_DOCS."""
+    if not os.path.exists(DATASET_PATH):
+        return []
+    with open(DATASET_PATH, encoding="utf-8") as f:
+        return [(d["title"], d["content"], d.get("tags", "")) for d in json.load(f)]
+
 
 def _user_exists(conn, username: str) -> bool:
     return conn.execute("SELECT 1 FROM users WHERE username=?", (username,)).fetchone() is not None
@@ -59,8 +77,17 @@ def seed_defaults() -> None:
                 ),
             )
 
+        dataset = dataset_docs()
+        if not settings.seed_dataset_docs:
+            # Remove unedited copies left by earlier versions, which always seeded the dataset
+            conn.executemany(
+                "DELETE FROM knowledge_docs WHERE title=? AND content=?",
+                [(title, content) for title, content, _ in dataset],
+            )
+            dataset = []
+
         # Always ensure default docs are present and up-to-date
-        for title, content, tags in DEFAULT_DOCS:
+        for title, content, tags in DEFAULT_DOCS + dataset:
             # Check if doc exists by title
             row = conn.execute("SELECT id FROM knowledge_docs WHERE title=?", (title,)).fetchone()
             if row:
@@ -1,21 +1,172 @@
+import queue
 import sqlite3
+import threading
 from contextlib import contextmanager
+from contextvars import ContextVar
 
 from app.core.config import settings
 
 
 def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(settings.database_path, check_same_thread=False)
+    conn = sqlite3.connect(
+        settings.database_path,
+        check_same_thread=False,
+        # Long-lived pooled connections keep their compiled statements across requests
+        cached_statements=settings.db_statement_cache_size,
+    )
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA foreign_keys = ON;")
+    conn.execute("PRAGMA journal_mode = WAL;")
+    conn.execute("PRAGMA synchronous = NORMAL;")
+    conn.execute(f"PRAGMA cache_size = -{settings.db_cache_size_kb};")
+    conn.execute(f"PRAGMA mmap_size = {settings.db_mmap_size_bytes};")
+    conn.execute("PRAGMA temp_store = MEMORY;")
+    conn.execute(f"PRAGMA busy_timeout = {settings.db_busy_timeout_ms};")
     return conn
 
 
+class ConnectionPool:
+    """
+    Bounded pool of SQLite connections. Connections are opened lazily up to `size`;
+    callers block (up to `timeout_s`) when all of them are checked out.
+    """
+
+    def __init__(self, size: int, timeout_s: float = 30.0):
+        self.size = size
+        self.timeout_s = timeout_s
+        self._idle: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                try:
+                    return _connect()
+                except Exception:
+                    self._opened -= 1
+                    raise
+        try:
+            return self._idle.get(timeout=self.timeout_s)
+        except queue.Empty:
+            raise RuntimeError("Timed out waiting for a database connection.")
+
+    def release(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            while True:
+                try:
+                    self._idle.get_nowait().close()
+                except queue.Empty:
+                    break
+            self._opened = 0
+
+
+_pool: ConnectionPool | None = None
+_pool_lock = threading.Lock()
+
+# Connection owned by the active unit_of_work() in this context, if any
+_current_conn: ContextVar[sqlite3.Connection | None] = ContextVar("current_conn", default=None)
+# Callbacks deferred until the active unit_of_work() commits
+_after_commit: ContextVar[list | None] = ContextVar("after_commit", default=None)
+
+
+def get_pool() -> ConnectionPool:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(size=settings.db_pool_size)
+    return _pool
+
+
+def close_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
+
+
 @contextmanager
 def db() -> sqlite3.Connection:
-    conn = _connect()
+    """
+    Borrow a pooled connection and commit on success.
+    Inside unit_of_work() the shared connection is returned instead, and committing is left to the unit of work.
+    """
+    shared = _current_conn.get()
+    if shared is not None:
+        yield shared
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
     try:
         yield conn
         conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
     finally:
-        conn.close()
+        pool.release(conn)
+
+
+@contextmanager
+def unit_of_work() -> sqlite3.Connection:
+    """
+    One connection and one transaction for everything inside the block, across repositories.
+
+        with unit_of_work():
+            session = ChatRepository().create_session(...)
+            ChatRepository().append_message(session.id, ...)
+
+    Nested unit_of_work() blocks join the outer one. The write lock is taken up front
+    (BEGIN IMMEDIATE): a deferred read-then-write transaction fails with SQLITE_BUSY
+    in WAL mode if another writer commits in between, and busy_timeout cannot retry it.
+    Keep slow work (e.g. password hashing) outside the block.
+    """
+    shared = _current_conn.get()
+    if shared is not None:
+        yield shared
+        return
+
+    pool = get_pool()
+    conn = pool.acquire()
+    token = _current_conn.set(conn)
+    callbacks: list = []
+    callbacks_token = _after_commit.set(callbacks)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        _after_commit.reset(callbacks_token)
+        _current_conn.reset(token)
+        pool.release(conn)
+    for callback in callbacks:
+        callback()
+
+
+def after_commit(callback) -> None:
+    """
+    Runs `callback` once the active unit_of_work() commits (dropped on rollback), or
+    right away outside one. Call it after leaving db(), e.g. to evict caches only when
+    the change is visible to other connections.
+    """
+    callbacks = _after_commit.get()
+    if callbacks is None:
+        callback()
+    else:
+        callbacks.append(callback)
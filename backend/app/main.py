@@ -1,9 +1,17 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import shutdown_password_pool
 from app.db.init_db import ensure_schema
+from app.db.sqlite import close_pool
 from app.db.seed import seed_defaults
+from app.services.chat_writer import chat_writer
+from app.services.registry import ServiceRegistry
+from app.services.token_purger import TokenPurger
 from app.api.routes import auth, users, chat, crag
 
 app = FastAPI(title="CRAG Real Estate API", version="1.0.0")
@@ -15,13 +23,41 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Chat histories and user lists compress well; SSE (text/event-stream) is left uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 @app.on_event("startup")
 def _startup() -> None:
     ensure_schema()
     seed_defaults()
 
+    # Load the AI models once per process; requests share them via get_crag_service
+    app.state.services = ServiceRegistry()
+    app.state.services.start_warm_up()
+
+    # Expired bearer tokens are otherwise only removed when presented
+    app.state.token_purger = TokenPurger(interval_s=settings.token_purge_interval_minutes * 60)
+    app.state.token_purger.start()
+
+    if settings.chat_write_behind_enabled:
+        chat_writer.start()
+
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    app.state.token_purger.stop()
+    # Flush queued chat turns before the connection pool closes
+    chat_writer.stop()
+    app.state.services.shutdown()
+    shutdown_password_pool()
+    close_pool()
+
 app.include_router(auth.router, prefix="/auth", tags=["auth"])
 app.include_router(users.router, prefix="/users", tags=["users"])
 app.include_router(chat.router, prefix="/chat", tags=["chat"])
 app.include_router(crag.router, prefix="/crag", tags=["crag"])
+
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    def prometheus_metrics() -> PlainTextResponse:
+        # Stage/query latency histograms and LLM token counters for a Prometheus scrape
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
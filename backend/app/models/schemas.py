@@ -53,6 +53,7 @@ class ChatSessionCreateRequest(BaseModel):
 
 
 class ChatMessagePublic(BaseModel):
+    id: int | None = None
     role: Literal["user", "assistant", "system"]
     content: str
     timestamp: str
@@ -71,6 +72,15 @@ class ChatMessageCreateRequest(BaseModel):
 class QueryRequest(BaseModel):
     question: str = Field(min_length=1)
     session_id: int | None = None
+    # Return the per-stage latency breakdown with the answer
+    include_timings: bool = False
+
+
+class QueryTimings(BaseModel):
+    total_ms: float
+    stages_ms: dict[str, float] = {}
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
 
 
 class QueryResponse(BaseModel):
@@ -78,3 +88,57 @@ class QueryResponse(BaseModel):
     answer: str
     sources: list[str]
     confidence: float
+    timings: QueryTimings | None = None
+
+
+class IngestionJobStatus(BaseModel):
+    job_id: str
+    file_name: str
+    status: Literal["queued", "parsing", "embedding", "done", "failed"]
+    pages: int = 0
+    chunks_total: int = 0
+    chunks_embedded: int = 0
+    chunks_reused: int = 0
+    chunks_deleted: int = 0
+    duplicates_skipped: int = 0
+    elapsed_s: float | None = None
+    chunks_per_s: float | None = None
+    message: str | None = None
+    error: str | None = None
+    created_at: str
+
+
+class DocumentInfo(BaseModel):
+    file_name: str
+    size_bytes: int
+    page_count: int
+    chunk_count: int
+    ingested_at: str
+    updated_at: str
+
+
+class DocumentCatalogPage(BaseModel):
+    items: list[DocumentInfo]
+    total: int
+    limit: int
+    offset: int
+
+
+class ModelReloadRequest(BaseModel):
+    component: Literal["llm", "reranker", "embeddings"]
+    model: str | None = None
+
+
+class ServiceStatus(BaseModel):
+    state: Literal["cold", "warming", "ready", "failed"]
+    ready: bool
+    error: str | None = None
+    ready_at: str | None = None
+    reloading: str | None = None
+    models: dict[str, str | None] = {}
+    cache: dict | None = None
+    reranker: dict | None = None
+    embeddings: dict | None = None
+    intent: dict | None = None
+    # Per-stage latency (stage -> count/p50_ms/p95_ms/max_ms) over recent queries
+    timings: dict[str, dict] = {}
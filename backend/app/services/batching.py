@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Generic, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """
+    Coalesces work from concurrent callers into batches for one model call.
+
+    Callers block in submit() while a single worker thread collects requests until
+    `max_batch_size` items are pending or the oldest has waited `max_wait_ms`, runs
+    `fn` once on all of them and hands each caller its slice of the results.
+    `fn` must return exactly one result per input item, in order.
+    After close(), submit() runs `fn` inline in the caller's thread, so requests still
+    holding a replaced model (e.g. during a reload) finish unbatched instead of failing.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[list[T]], Sequence[R]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        self.fn = fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_s = max_wait_ms / 1000
+        self._queue: queue.Queue[tuple[list[T], Future] | None] = queue.Queue()
+        self._lock = threading.Lock()
+        self._batches = 0
+        self._items = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, items: Sequence[T]) -> list[R]:
+        """Runs `fn` on `items` as part of a shared batch; blocks until the results are ready."""
+        if not items:
+            return []
+        future: Future = Future()
+        # Checked and enqueued under the lock so nothing can land behind close()'s sentinel
+        with self._lock:
+            closed = self._closed
+            if not closed:
+                self._queue.put((list(items), future))
+        if closed:
+            return list(self.fn(list(items)))
+        return future.result()
+
+    def close(self) -> None:
+        """Runs everything already queued, then stops the worker."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(None)
+        self._thread.join(timeout=5)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batches": self._batches,
+                "items": self._items,
+                "avg_batch_size": round(self._items / self._batches, 2) if self._batches else None,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait_s * 1000,
+            }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                self._drain()
+                return
+            requests = [first]
+            pending = len(first[0])
+            deadline = time.monotonic() + self.max_wait_s
+            stop = False
+
+            while pending < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if request is None:
+                    stop = True
+                    break
+                requests.append(request)
+                pending += len(request[0])
+
+            self._execute(requests)
+            if stop:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        # Defensive: submit() cannot enqueue after the sentinel, but no caller may be left waiting
+        while True:
+            try:
+                request = self._queue.get_nowait()
+            except queue.Empty:
+                return
+            if request is not None:
+                request[1].set_exception(RuntimeError("MicroBatcher is closed."))
+
+    def _execute(self, requests: list[tuple[list[T], Future]]) -> None:
+        items = [item for request_items, _ in requests for item in request_items]
+        try:
+            results = list(self.fn(items))
+        except Exception as e:
+            for _, future in requests:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self._batches += 1
+            self._items += len(items)
+        start = 0
+        for request_items, future in requests:
+            future.set_result(results[start:start + len(request_items)])
+            start += len(request_items)
@@ -0,0 +1,169 @@
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+
+from app.core.config import settings
+from app.core.conversation_memory import conversation_memory
+from app.core.metrics import CHAT_WRITE_FAILURES
+from app.db.repositories.chat import ChatRepository
+from app.db.sqlite import unit_of_work
+
+
+@dataclass
+class _Turn:
+    username: str
+    session_id: int | None
+    messages: list[dict]
+    future: Future = field(default_factory=Future)
+
+
+class ChatWriter:
+    """
+    Write-behind persistence for chat turns, so a query's response does not wait on SQLite.
+
+    submit() queues a turn and returns a Future of its session id. A background thread
+    drains the queue and writes everything pending in one transaction (up to
+    `batch_max_turns` turns). Callers that need the id of a new session await the
+    future; for existing sessions the write completes in the background.
+    Readers call wait_for(session_id) to see their own writes, and stop() flushes the
+    queue on shutdown. When the writer is not running, submit() writes inline.
+    """
+
+    def __init__(self, batch_max_turns: int = 64):
+        self.batch_max_turns = batch_max_turns
+        self._queue: queue.Queue[_Turn | None] = queue.Queue()
+        self._pending: dict[int, int] = {}  # session_id -> queued turns
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._repo = ChatRepository()
+        self._written = 0
+        self._failed = 0
+        self._batches = 0
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="chat-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout_s: float = 10.0) -> None:
+        """Writes everything still queued, then stops the thread."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join(timeout=timeout_s)
+        self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def submit(self, username: str, session_id: int | None, messages: list[dict]) -> Future:
+        turn = _Turn(username=username, session_id=session_id, messages=messages)
+        if self._thread is None:
+            self._write_one(turn)
+            return turn.future
+
+        if session_id is not None:
+            with self._cond:
+                self._pending[session_id] = self._pending.get(session_id, 0) + 1
+        self._queue.put(turn)
+        return turn.future
+
+    def wait_for(self, session_id: int, timeout_s: float = 5.0) -> None:
+        """Blocks until turns queued for the session are written (read-your-writes)."""
+        with self._cond:
+            self._cond.wait_for(lambda: not self._pending.get(session_id), timeout=timeout_s)
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": self._queue.qsize(),
+                "written": self._written,
+                "failed": self._failed,
+                "batches": self._batches,
+            }
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stop = False
+            while len(batch) < self.batch_max_turns:
+                try:
+                    turn = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if turn is None:
+                    stop = True
+                    break
+                batch.append(turn)
+
+            self._write_batch(batch)
+            if stop:
+                # Sentinel arrived mid-drain; flush whatever was queued behind it
+                remaining = []
+                while not self._queue.empty():
+                    turn = self._queue.get_nowait()
+                    if turn is not None:
+                        remaining.append(turn)
+                if remaining:
+                    self._write_batch(remaining)
+                return
+
+    def _write_batch(self, batch: list[_Turn]) -> None:
+        try:
+            results = []
+            with unit_of_work():
+                for turn in batch:
+                    results.append(self._repo.save_turn(turn.username, turn.session_id, turn.messages))
+        except Exception as e:
+            # One bad turn must not drop the others; retry them one transaction each
+            print(f" [Chat] Batched write of {len(batch)} turns failed ({e}); retrying individually.")
+            for turn in batch:
+                if turn.session_id is not None:
+                    # Turns recorded into memory before the rollback would otherwise appear twice
+                    conversation_memory.invalidate(turn.session_id)
+            for turn in batch:
+                self._write_one(turn)
+            return
+
+        with self._cond:
+            self._batches += 1
+        for turn, (session_id, _) in zip(batch, results):
+            self._finish(turn, session_id)
+
+    def _write_one(self, turn: _Turn) -> None:
+        try:
+            session_id, _ = self._repo.save_turn(turn.username, turn.session_id, turn.messages)
+        except Exception as e:
+            print(f" [Chat] Failed to save turn for session {turn.session_id}: {e}")
+            if turn.session_id is not None:
+                # The memory window may hold messages that were rolled back
+                conversation_memory.invalidate(turn.session_id)
+            self._finish(turn, None, error=e)
+            return
+        self._finish(turn, session_id)
+
+    def _finish(self, turn: _Turn, session_id: int | None, error: Exception | None = None) -> None:
+        with self._cond:
+            if error is None:
+                self._written += 1
+            else:
+                self._failed += 1
+                CHAT_WRITE_FAILURES.inc()
+            if turn.session_id is not None:
+                left = self._pending.get(turn.session_id, 0) - 1
+                if left > 0:
+                    self._pending[turn.session_id] = left
+                else:
+                    self._pending.pop(turn.session_id, None)
+            self._cond.notify_all()
+        if error is None:
+            turn.future.set_result(session_id)
+        else:
+            turn.future.set_exception(error)
+
+
+chat_writer = ChatWriter(batch_max_turns=settings.chat_write_batch_max_turns)
@@ -1,44 +1,82 @@
-from typing import List, Dict
+from typing import AsyncIterator, List, Dict
+import asyncio
 import re
+import time
+import numpy as np
 from llama_index.llms.ollama import Ollama
 from llama_index.core import Settings as LlamaSettings, get_response_synthesizer, PromptTemplate
-from llama_index.core.retrievers import VectorIndexRetriever
-from llama_index.core.postprocessor import SentenceTransformerRerank
+from llama_index.core.schema import QueryBundle
 from app.core.config import settings
+from app.core.metrics import set_intent
+from app.services.hybrid_retriever import HybridRetriever
+from app.services.ingestion import IngestionManager
+from app.services.intent_classifier import IntentClassifier, load_examples
+from app.services.llm_metrics import install_token_counter
+from app.services.reranker import AdaptiveReranker
+from app.services.semantic_cache import SemanticCache
+from app.services.timings import StageTimings
 from app.services.vector_store import VectorService
 
+CLASSIFY_TEMPLATE = (
+    "Analyze the User Query. Classify it into exactly one category:\n"
+    "1. GREETING: (Hello, Hi, Thanks, Bye)\n"
+    "2. GENERAL: (Weather, Date, Time, Jokes, General Knowledge not related to Real Estate)\n"
+    "3. DOMAIN: (Real Estate, Tenancy, Contracts, Rent, Property, Fees)\n"
+    "4. DEPENDENT: (Ambiguous questions referring to previous context, e.g., 'Who pays it?', 'How much?')\n\n"
+    "Query: {query_str}\n"
+    "Answer ONLY with the Category Name (GREETING, GENERAL, DOMAIN, DEPENDENT)."
+)
+
+
+def build_llm(model: str | None = None) -> Ollama:
+    return Ollama(
+        model=model or settings.LLM_MODEL,
+        request_timeout=300.0,
+        additional_kwargs={"num_ctx": 2048, "num_predict": 512}
+    )
+
+
+def build_reranker(model: str | None = None) -> AdaptiveReranker:
+    return AdaptiveReranker(model=model)
+
 
 class CRAGService:
-    def __init__(self):
+    def __init__(self, llm=None, vector_service: VectorService | None = None, reranker=None):
         print(f" [CRAG] Initializing with Model: {settings.LLM_MODEL}...")
 
         # 1. Setup Phi-3 (SLM)
-        self.llm = Ollama(
-            model=settings.LLM_MODEL,
-            request_timeout=300.0,
-            additional_kwargs={"num_ctx": 2048, "num_predict": 512}
-        )
+        self.llm = llm or build_llm()
         LlamaSettings.llm = self.llm
 
         # 2. Setup Vector Store & Reranker
-        self.vector_service = VectorService()
+        self.vector_service = vector_service or VectorService()
         self.index = self.vector_service.get_index()
-        self.reranker = SentenceTransformerRerank(
-            model=settings.RERANKER_MODEL, top_n=5
-        )
+        self.reranker = reranker or build_reranker()
+        # Per-stage latency (also exported to /metrics) and Ollama token counts
+        self.timings = StageTimings()
+        install_token_counter()
+
+        # 3. Semantic answer cache, dropped whenever the corpus changes
+        self.cache = None
+        if settings.SEMANTIC_CACHE_ENABLED:
+            self.cache = SemanticCache(
+                embed_fn=self._embed_query,
+                threshold=settings.SEMANTIC_CACHE_THRESHOLD,
+                ttl_s=settings.SEMANTIC_CACHE_TTL_SECONDS,
+                max_entries=settings.SEMANTIC_CACHE_MAX_ENTRIES,
+            )
+            self.vector_service.add_change_listener(self.cache.invalidate)
+
+        # 4. Background ingestion jobs
+        self.ingestion = IngestionManager(self.vector_service)
+
+        # 5. Local intent classifier (embedding nearest-centroid), the LLM is only asked when it is unsure
+        self.intent_classifier = self._build_intent_classifier()
 
         # --- PROMPTS ---
 
         # A. INTENT CLASSIFIER (The Gatekeeper)
-        self.classify_prompt = PromptTemplate(
-            "Analyze the User Query. Classify it into exactly one category:\n"
-            "1. GREETING: (Hello, Hi, Thanks, Bye)\n"
-            "2. GENERAL: (Weather, Date, Time, Jokes, General Knowledge not related to Real Estate)\n"
-            "3. DOMAIN: (Real Estate, Tenancy, Contracts, Rent, Property, Fees)\n"
-            "4. DEPENDENT: (Ambiguous questions referring to previous context, e.g., 'Who pays it?', 'How much?')\n\n"
-            "Query: {query_str}\n"
-            "Answer ONLY with the Category Name (GREETING, GENERAL, DOMAIN, DEPENDENT)."
-        )
+        self.classify_prompt = PromptTemplate(CLASSIFY_TEMPLATE)
 
         # B. REWRITE PROMPT
         self.rewrite_prompt = PromptTemplate(
@@ -48,111 +86,374 @@ class CRAGService:
             "Rewritten Question:"
         )
 
-    def generate_response(self, query: str, history: List[str] = []) -> str:
+    GREETING_ANSWER = "Hello! I am your Real Estate AI Assistant..."
+    GENERAL_ANSWER = "I am designed specifically for Real Estate queries..."
+    CLARIFY_ANSWER = "Could you please clarify what specific property or agreement you are asking about?"
+    LOW_CONFIDENCE_ANSWER = "I found some documents, but they don't seem closely related to your question. Could you be more specific?"
+
+    def generate_response(self, query: str, history: List[str] = []) -> dict:
         """
         Pipeline: Classify -> Gatekeep -> Route -> Execute
         Returns a Dictionary: {'answer': str, 'sources': List[str]}
         """
+        category, search_query, canned = self._route(query, history)
+        if canned is not None:
+            return {"answer": canned, "sources": []}
+
+        # STEP 4: EXECUTE RAG
+        return self._run_rag_pipeline(search_query)
+
+    async def agenerate_response(self, query: str, history: List[str] = []) -> dict:
+        """Async twin of generate_response: LLM and Qdrant calls are awaited instead of blocking a thread."""
+        category, search_query, canned = await self._aroute(query, history)
+        if canned is not None:
+            return {"answer": canned, "sources": []}
+
+        return await self._arun_rag_pipeline(search_query)
+
+    async def astream_response(self, query: str, history: List[str] = []) -> AsyncIterator[dict]:
+        """
+        Same pipeline as agenerate_response, but yields events as soon as each stage finishes:
+        intent -> sources -> token* -> done. The final 'done' event carries the full answer.
+        """
+        category, search_query, canned = await self._aroute(query, history)
+        yield {"event": "intent", "intent": category, "search_query": search_query}
+
+        if canned is not None:
+            yield {"event": "token", "text": canned}
+            yield {"event": "done", "answer": canned, "sources": []}
+            return
+
+        cached, embedding, generation = await self._acache_lookup(search_query)
+        if cached is not None:
+            yield {"event": "sources", "sources": cached["sources"]}
+            yield {"event": "token", "text": cached["answer"]}
+            yield {"event": "done", **cached}
+            return
+
+        nodes = await self._aretrieve(search_query, embedding)
+        if self._is_low_confidence(nodes):
+            yield {"event": "token", "text": self.LOW_CONFIDENCE_ANSWER}
+            yield {"event": "done", "answer": self.LOW_CONFIDENCE_ANSWER, "sources": []}
+            return
+
+        sources = self._format_sources(nodes)
+        yield {"event": "sources", "sources": sources}
+
+        synthesizer = get_response_synthesizer(llm=self.llm, response_mode="compact", streaming=True)
+        started = time.perf_counter()
+        streaming_response = await synthesizer.asynthesize(search_query, nodes=nodes)
+
+        parts = []
+        async for delta in streaming_response.async_response_gen():
+            if not parts:
+                self.timings.record("first_token", (time.perf_counter() - started) * 1000)
+            parts.append(delta)
+            yield {"event": "token", "text": delta}
+        # Includes the time the client took to receive the tokens
+        self.timings.record("synthesize", (time.perf_counter() - started) * 1000)
+
+        result = {"answer": "".join(parts), "sources": sources}
+        self._cache_store(search_query, embedding, generation, result)
+        yield {"event": "done", **result}
+
+    # --- ROUTING ---
+
+    def _route(self, query: str, history: List[str]) -> tuple[str, str, str | None]:
+        """
+        Classifies the query and resolves what to search for.
+        Returns (category, search_query, canned_answer); canned_answer is set when no retrieval is needed.
+        """
         # STEP 1: CLASSIFY INTENT
         category = self._classify_input(query)
+        set_intent(category)
         print(f" [CRAG] Intent: {category} | Query: '{query}'")
 
         # STEP 2: HANDLE NON-RETRIEVAL CATEGORIES
-
-        if category == "GREETING":
-            return {"answer": "Hello! I am your Real Estate AI Assistant...", "sources": []}
-
-        if category == "GENERAL":
-            return {"answer": "I am designed specifically for Real Estate queries...", "sources": []}
+        canned = self._canned_answer(category, history)
+        if canned is not None:
+            return category, query, canned
 
         # STEP 3: HANDLE RETRIEVAL CATEGORIES (DOMAIN & DEPENDENT)
         search_query = query
+        if category == "DEPENDENT":
+            print(" [CRAG] Context dependency detected. Rewriting...")
+            raw_rewrite = self._rewrite_query(query, history)
+            search_query = self._clean_rewrite(raw_rewrite, query)
+            print(f" [CRAG] Rewritten Query: '{search_query}'")
 
-        # Only rewrite if it is DEPENDENT and we actually have history
+        return category, search_query, None
+
+    async def _aroute(self, query: str, history: List[str]) -> tuple[str, str, str | None]:
+        category = await self._aclassify_input(query)
+        set_intent(category)
+        print(f" [CRAG] Intent: {category} | Query: '{query}'")
+
+        canned = self._canned_answer(category, history)
+        if canned is not None:
+            return category, query, canned
+
+        search_query = query
         if category == "DEPENDENT":
-            if history:
-                print(" [CRAG] Context dependency detected. Rewriting...")
-                raw_rewrite = self._rewrite_query(query, history)
-                search_query = self._clean_rewrite(raw_rewrite, query)
-                print(f" [CRAG] Rewritten Query: '{search_query}'")
-            else:
-                # If dependent but no history, ask for clarification
-                return {
-                    "answer": "Could you please clarify what specific property or agreement you are asking about?",
-                    "sources": []
-                }
+            print(" [CRAG] Context dependency detected. Rewriting...")
+            raw_rewrite = await self._arewrite_query(query, history)
+            search_query = self._clean_rewrite(raw_rewrite, query)
+            print(f" [CRAG] Rewritten Query: '{search_query}'")
 
-        # STEP 4: EXECUTE RAG
-        return self._run_rag_pipeline(search_query)
+        return category, search_query, None
+
+    def _canned_answer(self, category: str, history: List[str]) -> str | None:
+        if category == "GREETING":
+            return self.GREETING_ANSWER
+        if category == "GENERAL":
+            return self.GENERAL_ANSWER
+        # Only rewrite if it is DEPENDENT and we actually have history;
+        # if dependent but no history, ask for clarification
+        if category == "DEPENDENT" and not history:
+            return self.CLARIFY_ANSWER
+        return None
+
+    # --- CLASSIFICATION ---
+
+    def _build_intent_classifier(self) -> IntentClassifier | None:
+        if not settings.INTENT_CLASSIFIER_ENABLED:
+            return None
+        embed_model = self.vector_service.embed_model
+        return IntentClassifier(
+            embed_query=embed_model.get_query_embedding,
+            # Examples are queries: embed them in the query space, with the same instruction
+            embed_batch=getattr(embed_model, "get_query_embedding_batch", None),
+            examples=load_examples(),
+            min_similarity=settings.INTENT_MIN_SIMILARITY,
+            min_margin=settings.INTENT_MIN_MARGIN,
+        )
+
+    def _classify_locally(self, query: str) -> str | None:
+        """Keyword rules, then the embedding classifier. None means 'ask the LLM'."""
+        category = self._classify_by_rules(query)
+        if category is None and self.intent_classifier is not None:
+            # The query vector lands in the embedding cache and is reused by retrieval
+            category = self.intent_classifier.classify(query)
+        return category
 
     def _classify_input(self, query: str) -> str:
-        """Determines Intent using Phi-3"""
-        try:
-            q_lower = query.lower()
-            
-            # Fast keyword check for greetings
-            greetings = {'hello', 'hi', 'hey', 'good morning', 'thanks'}
-            if q_lower.strip().strip('!.?') in greetings:
-                return "GREETING"
-
-            # Fast keyword check for Domain (Force DOMAIN for these terms)
-            domain_terms = {'rent', 'landlord', 'tenant', 'deposit', 'agreement', 'property', 'house', 'room', 'pay', 'contract'}
-            if any(term in q_lower for term in domain_terms):
+        """Determines Intent: rules -> embedding classifier -> Phi-3 as the last resort"""
+        with self.timings.measure("classify"):
+            try:
+                category = self._classify_locally(query)
+                if category:
+                    return category
+
+                prompt = self.classify_prompt.format(query_str=query)
+                return self._parse_category(self.llm.complete(prompt).text)
+            except:
+                return "DOMAIN"
+
+    async def _aclassify_input(self, query: str) -> str:
+        with self.timings.measure("classify"):
+            try:
+                category = await asyncio.to_thread(self._classify_locally, query)
+                if category:
+                    return category
+
+                prompt = self.classify_prompt.format(query_str=query)
+                response = await self.llm.acomplete(prompt)
+                return self._parse_category(response.text)
+            except:
                 return "DOMAIN"
 
-            prompt = self.classify_prompt.format(query_str=query)
-            response = self.llm.complete(prompt).text.strip().upper()
+    @staticmethod
+    def _classify_by_rules(query: str) -> str | None:
+        q_lower = query.lower()
+
+        # Fast keyword check for greetings
+        greetings = {'hello', 'hi', 'hey', 'good morning', 'thanks'}
+        if q_lower.strip().strip('!.?') in greetings:
+            return "GREETING"
 
-            if "GREETING" in response: return "GREETING"
-            if "GENERAL" in response: return "GENERAL"
-            if "DEPENDENT" in response: return "DEPENDENT"
-            return "DOMAIN"  # Default to Domain if unsure
-        except:
+        # Fast keyword check for Domain (Force DOMAIN for these terms)
+        domain_terms = {'rent', 'landlord', 'tenant', 'deposit', 'agreement', 'property', 'house', 'room', 'pay', 'contract'}
+        if any(term in q_lower for term in domain_terms):
             return "DOMAIN"
+        return None
+
+    @staticmethod
+    def _parse_category(response: str) -> str:
+        response = response.strip().upper()
+        if "GREETING" in response: return "GREETING"
+        if "GENERAL" in response: return "GENERAL"
+        if "DEPENDENT" in response: return "DEPENDENT"
+        return "DOMAIN"  # Default to Domain if unsure
+
+    # --- RETRIEVAL & GENERATION ---
 
     def _run_rag_pipeline(self, search_query: str) -> dict:
-        # 1. Retrieve
-        retriever = VectorIndexRetriever(index=self.index, similarity_top_k=15)
-        nodes = retriever.retrieve(search_query)
+        # 0. Semantic cache (the query embedding is reused for retrieval on a miss)
+        cached, embedding, generation = self._cache_lookup(search_query)
+        if cached is not None:
+            return cached
+
+        # 1. Retrieve & Rerank
+        nodes = self._retrieve(search_query, embedding)
+
+        # 2. Check emptiness
+        if self._is_low_confidence(nodes):
+            return {"answer": self.LOW_CONFIDENCE_ANSWER, "sources": []}
+
+        # 3. Generate Answer
+        synthesizer = get_response_synthesizer(llm=self.llm, response_mode="compact")
+        with self.timings.measure("synthesize"):
+            response_obj = synthesizer.synthesize(search_query, nodes=nodes)
+
+        result = {
+            "answer": str(response_obj),
+            "sources": self._format_sources(response_obj.source_nodes)
+        }
+        self._cache_store(search_query, embedding, generation, result)
+        return result
+
+    async def _arun_rag_pipeline(self, search_query: str) -> dict:
+        cached, embedding, generation = await self._acache_lookup(search_query)
+        if cached is not None:
+            return cached
+
+        nodes = await self._aretrieve(search_query, embedding)
+
+        if self._is_low_confidence(nodes):
+            return {"answer": self.LOW_CONFIDENCE_ANSWER, "sources": []}
+
+        synthesizer = get_response_synthesizer(llm=self.llm, response_mode="compact")
+        with self.timings.measure("synthesize"):
+            response_obj = await synthesizer.asynthesize(search_query, nodes=nodes)
+
+        result = {
+            "answer": str(response_obj),
+            "sources": self._format_sources(response_obj.source_nodes)
+        }
+        self._cache_store(search_query, embedding, generation, result)
+        return result
+
+    def _embed_query(self, query: str) -> list[float]:
+        with self.timings.measure("embed"):
+            return self.vector_service.embed_model.get_query_embedding(query)
 
-        # 2. Rerank
+    def _cache_lookup(self, search_query: str) -> tuple[dict | None, np.ndarray | None, int | None]:
+        """
+        Embeds the query once; the vector is returned for retrieval whether or not the cache is on.
+        Also returns the cache generation seen before generating, for _cache_store.
+        """
+        if self.cache is None:
+            return None, np.asarray(self._embed_query(search_query), dtype=np.float32), None
+        generation = self.cache.generation
+        embedding = self.cache.embed(search_query)
+        with self.timings.measure("cache_lookup"):
+            cached, embedding = self.cache.lookup(search_query, embedding)
+        if cached is not None:
+            print(f" [CRAG] Semantic cache hit for '{search_query}'")
+        return cached, embedding, generation
+
+    async def _acache_lookup(self, search_query: str) -> tuple[dict | None, np.ndarray | None, int | None]:
+        # Embedding is CPU-bound
+        return await asyncio.to_thread(self._cache_lookup, search_query)
+
+    def _cache_store(
+        self, search_query: str, embedding: np.ndarray | None, generation: int | None, result: dict
+    ) -> None:
+        # Dropped if the corpus changed (cache invalidated) while the answer was being generated
+        if self.cache is not None and embedding is not None:
+            self.cache.store(search_query, embedding, result, generation=generation)
+
+    @staticmethod
+    def _query_bundle(search_query: str, embedding: np.ndarray | None) -> QueryBundle:
+        # A pre-computed embedding skips the retriever's own embed call
+        return QueryBundle(
+            query_str=search_query,
+            embedding=embedding.tolist() if embedding is not None else None,
+        )
+
+    def _build_retriever(self):
+        dense = self.vector_service.dense_retriever(self.index, settings.RETRIEVAL_DENSE_TOP_K)
+        if not settings.HYBRID_RETRIEVAL_ENABLED:
+            return dense
+        return HybridRetriever(
+            dense,
+            keyword_top_k=settings.RETRIEVAL_KEYWORD_TOP_K,
+            top_k=settings.RETRIEVAL_FUSED_TOP_K,
+            rrf_k=settings.RETRIEVAL_RRF_K,
+        )
+
+    @staticmethod
+    def _dense_nodes(retriever, nodes: list) -> list:
+        # Hybrid results carry fused (rank) scores; the rerank skip decision needs the cosine ones
+        return getattr(retriever, "dense_nodes", nodes)
+
+    def _retrieve(self, search_query: str, embedding: np.ndarray | None = None) -> list:
+        retriever = self._build_retriever()
+        with self.timings.measure("retrieve"):
+            nodes = retriever.retrieve(self._query_bundle(search_query, embedding))
+        if nodes:
+            with self.timings.measure("rerank"):
+                nodes = self.reranker.rerank(search_query, nodes, self._dense_nodes(retriever, nodes))
+        return nodes
+
+    async def _aretrieve(self, search_query: str, embedding: np.ndarray | None = None) -> list:
+        retriever = self._build_retriever()
+        query_bundle = self._query_bundle(search_query, embedding)
+        with self.timings.measure("retrieve"):
+            if self.vector_service.aclient is None:
+                # Embedded Qdrant has no async client
+                nodes = await asyncio.to_thread(retriever.retrieve, query_bundle)
+            else:
+                nodes = await retriever.aretrieve(query_bundle)
         if nodes:
-            nodes = self.reranker.postprocess_nodes(nodes, query_str=search_query)
+            # Cross-encoder scoring is CPU-bound (and may wait for a shared batch); keep it off the event loop
+            with self.timings.measure("rerank"):
+                nodes = await asyncio.to_thread(
+                    self.reranker.rerank, search_query, nodes, self._dense_nodes(retriever, nodes)
+                )
+        return nodes
 
-        # 3. Check emptiness
-        # If the best match has a score lower than 0.5, it's probably junk.
+    def _is_low_confidence(self, nodes: list) -> bool:
+        # If the best match has a very low rerank score, it's probably junk.
         if not nodes or (nodes[0].score is not None and nodes[0].score < 0.1):  # Threshold varies by model
             print(f" [CRAG] Low confidence score: {nodes[0].score if nodes else 0}")
-            return {
-                "answer": "I found some documents, but they don't seem closely related to your question. Could you be more specific?",
-                "sources": []
-            }
-        # 4. Generate Answer
-        synthesizer = get_response_synthesizer(response_mode="compact")
-        response_obj = synthesizer.synthesize(search_query, nodes=nodes)
-
-        # 5. Extract Sources (NEW)
+            return True
+        return False
+
+    @staticmethod
+    def _format_sources(nodes: list) -> List[str]:
         source_list = []
-        for node in response_obj.source_nodes:
+        for node in nodes:
             # LlamaIndex stores metadata in node.metadata
             file_name = node.metadata.get("file_name", "Unknown File")
             page_label = node.metadata.get("page_label", "N/A")
             score = f"{node.score:.2f}" if node.score else "N/A"
             source_list.append(f"{file_name} (Page {page_label}) - Score: {score}")
+        return source_list[:3]  # Return top 3 sources
 
-        return {
-            "answer": str(response_obj),
-            "sources": source_list[:3]  # Return top 3 unique sources
-        }
+    # --- REWRITING ---
 
     def _rewrite_query(self, query: str, history: List[str]) -> str:
-        try:
-            # Use last 2 turns
-            history_str = "\n".join(history[-2:])
-            prompt = self.rewrite_prompt.format(history_str=history_str, query_str=query)
-            return self.llm.complete(prompt).text.strip()
-        except:
-            return query
+        with self.timings.measure("rewrite"):
+            try:
+                prompt = self._rewrite_prompt_for(query, history)
+                return self.llm.complete(prompt).text.strip()
+            except:
+                return query
+
+    async def _arewrite_query(self, query: str, history: List[str]) -> str:
+        with self.timings.measure("rewrite"):
+            try:
+                prompt = self._rewrite_prompt_for(query, history)
+                response = await self.llm.acomplete(prompt)
+                return response.text.strip()
+            except:
+                return query
+
+    def _rewrite_prompt_for(self, query: str, history: List[str]) -> str:
+        # Callers pass a bounded window (see ConversationMemory), summary line first
+        history_str = "\n".join(history)
+        return self.rewrite_prompt.format(history_str=history_str, query_str=query)
 
     def _clean_rewrite(self, rewrite: str, original: str) -> str:
         clean = re.sub(r'^(Rewritten Question:|Rewritten:|Question:)', '', rewrite, flags=re.IGNORECASE).strip()
@@ -162,9 +463,37 @@ class CRAGService:
             return original
         return clean if clean else original
 
+    # --- LIFECYCLE ---
+
+    def warm_up(self) -> None:
+        """Runs one embedding and one rerank so model weights are resident before the first query."""
+        probe = "tenancy deposit"
+        self.vector_service.embed_model.get_query_embedding(probe)
+        self.reranker.warm_up()
+
+    def reload_llm(self, model: str | None = None) -> None:
+        llm = build_llm(model)
+        self.llm = llm
+        LlamaSettings.llm = llm
+
+    def reload_reranker(self, model: str | None = None) -> None:
+        previous = self.reranker
+        self.reranker = build_reranker(model)
+        # Requests still holding the previous reranker finish unbatched (see MicroBatcher.close)
+        previous.close()
+
+    def reload_embeddings(self, model: str | None = None) -> None:
+        self.vector_service.reload_embed_model(model)
+        self.index = self.vector_service.get_index()
+        # Centroids live in the old model's vector space
+        self.intent_classifier = self._build_intent_classifier()
+        if self.cache is not None:
+            # Cached vectors came from the previous model
+            self.cache.invalidate()
+
     def ingest_file(self, filename: str, content: bytes) -> str:
         """
-        Saves bytes to a temp file, ingests via VectorService, then cleans up.
+        Saves bytes to a temp file and ingests it synchronously via the ingestion pipeline.
         """
         import tempfile
         import os
@@ -175,11 +504,10 @@ class CRAGService:
             tmp.write(content)
             tmp_path = tmp.name
 
-        try:
-            print(f" [CRAG] Ingesting temp file: {tmp_path}")
-            result = self.vector_service.ingest_document(tmp_path)
-            return result
-        finally:
-            if os.path.exists(tmp_path):
-                os.remove(tmp_path)
+        print(f" [CRAG] Ingesting temp file: {tmp_path}")
+        # The ingestion manager removes the temp file when it is done
+        job = self.ingestion.run(filename, tmp_path)
+        if job.status == "failed":
+            raise RuntimeError(job.error)
+        return job.message
 
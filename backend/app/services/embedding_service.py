@@ -0,0 +1,132 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, List
+
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import PrivateAttr
+from sentence_transformers import SentenceTransformer
+
+from app.core.config import settings
+from app.services.batching import MicroBatcher
+
+
+class EmbeddingService(BaseEmbedding):
+    """
+    In-process embedding model shared by retrieval, the semantic cache and ingestion.
+
+    Query embeddings from concurrent requests are coalesced by a MicroBatcher into a
+    single encode() call (up to `max_batch_size` queries or `max_wait_ms`), and recent
+    query vectors are kept in a bounded LRU so repeated questions skip the model.
+    Document batches from ingestion are already large and are encoded directly.
+    Vectors are L2-normalised and queries get the model's query instruction (documents
+    do not), like HuggingFaceEmbedding's defaults for BGE.
+    """
+
+    _model: Any = PrivateAttr()
+    _batcher: Any = PrivateAttr()
+    _cache: Any = PrivateAttr()
+    _cache_size: int = PrivateAttr()
+    _query_instruction: str = PrivateAttr()
+    _lock: Any = PrivateAttr()
+    _hits: int = PrivateAttr(default=0)
+    _misses: int = PrivateAttr(default=0)
+
+    def __init__(
+        self,
+        model_name: str | None = None,
+        max_batch_size: int | None = None,
+        max_wait_ms: float | None = None,
+        cache_size: int | None = None,
+        num_threads: int | None = None,
+        query_instruction: str | None = None,
+        **kwargs: Any,
+    ):
+        super().__init__(
+            model_name=model_name or settings.EMBEDDING_MODEL,
+            embed_batch_size=settings.INGEST_EMBED_BATCH_SIZE,
+            **kwargs,
+        )
+        num_threads = settings.EMBED_NUM_THREADS if num_threads is None else num_threads
+        if num_threads > 0:
+            import torch
+
+            # Process-wide: also bounds the reranker's intra-op threads
+            torch.set_num_threads(num_threads)
+
+        self._model = SentenceTransformer(self.model_name, device="cpu")
+        self._batcher = MicroBatcher(
+            self._encode,
+            max_batch_size=max_batch_size or settings.EMBED_BATCH_SIZE,
+            max_wait_ms=settings.EMBED_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms,
+            name="embed-batcher",
+        )
+        self._cache = OrderedDict()
+        self._cache_size = settings.EMBED_QUERY_CACHE_SIZE if cache_size is None else cache_size
+        self._lock = threading.Lock()
+        self._query_instruction = settings.EMBED_QUERY_INSTRUCTION if query_instruction is None else query_instruction
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "EmbeddingService"
+
+    def _encode(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._model.encode(
+            texts, batch_size=len(texts), normalize_embeddings=True, show_progress_bar=False
+        )
+        return vectors.tolist()
+
+    # --- llama-index interface ---
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        with self._lock:
+            vector = self._cache.get(query)
+            if vector is not None:
+                self._cache.move_to_end(query)
+                self._hits += 1
+                return list(vector)
+            self._misses += 1
+
+        # Cached by the raw query; the instruction is fixed per instance
+        vector = self._batcher.submit([self._query_instruction + query])[0]
+        if self._cache_size > 0:
+            with self._lock:
+                self._cache[query] = vector
+                self._cache.move_to_end(query)
+                while len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+        return list(vector)
+
+    def get_query_embedding_batch(self, queries: List[str]) -> List[List[float]]:
+        """Query-side vectors (with the instruction) for many queries in one encode call; not cached."""
+        return self._encode([self._query_instruction + q for q in queries])
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        # Waiting for a shared batch blocks; keep it off the event loop
+        return await asyncio.to_thread(self._get_query_embedding, query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._encode([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._encode(texts)
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        return await asyncio.to_thread(self._get_text_embedding, text)
+
+    # --- lifecycle ---
+
+    def close(self) -> None:
+        self._batcher.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            cache = {
+                "entries": len(self._cache),
+                "max_entries": self._cache_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else None,
+            }
+        return {"model": self.model_name, "query_cache": cache, "batching": self._batcher.stats()}
@@ -0,0 +1,91 @@
+import asyncio
+from typing import Callable, Hashable, Iterable, TypeVar
+
+from llama_index.core.retrievers import BaseRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle, TextNode
+
+from app.db.repositories.docs import DocsRepository
+from app.db.repositories.documents import DocumentsRepository
+
+T = TypeVar("T")
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[list[T]], key: Callable[[T], Hashable], k: int = 60
+) -> list[tuple[T, float]]:
+    """
+    Merges ranked lists by summing 1 / (k + rank) per item. Only ranks matter, so
+    scores from different systems (cosine, BM25) never need to be made comparable.
+    The first occurrence of an item is the one returned.
+    """
+    scores: dict[Hashable, float] = {}
+    items: dict[Hashable, T] = {}
+    for ranking in rankings:
+        for rank, item in enumerate(ranking, start=1):
+            item_key = key(item)
+            items.setdefault(item_key, item)
+            scores[item_key] = scores.get(item_key, 0.0) + 1.0 / (k + rank)
+    return sorted(((items[i], s) for i, s in scores.items()), key=lambda pair: pair[1], reverse=True)
+
+
+class HybridRetriever(BaseRetriever):
+    """
+    Dense retrieval from Qdrant plus BM25 keyword search in SQLite FTS5 (ingested
+    chunks and the knowledge_docs table), fused with reciprocal rank fusion.
+    Chunk hits share their node id with the Qdrant point, so a chunk found by
+    both searches is counted once with both ranks.
+    """
+
+    def __init__(self, dense: BaseRetriever, keyword_top_k: int = 10, top_k: int = 15, rrf_k: int = 60):
+        super().__init__()
+        self.dense = dense
+        self.keyword_top_k = keyword_top_k
+        self.top_k = top_k
+        self.rrf_k = rrf_k
+        self.docs = DocsRepository()
+        self.documents = DocumentsRepository()
+        # Dense results of the last call (cosine scores), for the reranker's skip decision
+        self.dense_nodes: list[NodeWithScore] = []
+
+    def _retrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        dense = self.dense.retrieve(query_bundle)
+        self.dense_nodes = dense
+        return self._fuse([dense, *self._keyword(query_bundle.query_str)])
+
+    async def _aretrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        dense, keyword = await asyncio.gather(
+            self.dense.aretrieve(query_bundle),
+            asyncio.to_thread(self._keyword, query_bundle.query_str),
+        )
+        self.dense_nodes = dense
+        return self._fuse([dense, *keyword])
+
+    def _keyword(self, query: str) -> list[list[NodeWithScore]]:
+        """One BM25 ranking per index: scores from separate FTS tables are not comparable."""
+        chunks = [
+            NodeWithScore(
+                node=TextNode(
+                    id_=row["point_id"],
+                    text=row["text"],
+                    metadata={"file_name": row["file_name"], "page_label": row["page_label"]},
+                ),
+                score=row["score"],
+            )
+            for row in self.documents.search_chunks(query, self.keyword_top_k)
+        ]
+        knowledge = [
+            NodeWithScore(
+                node=TextNode(
+                    id_=f"knowledge_doc:{row['id']}",
+                    text=f"{row['title']}\n{row['content']}",
+                    metadata={"file_name": row["title"], "tags": row["tags"]},
+                ),
+                score=row["score"],
+            )
+            for row in self.docs.search_keyword(query, self.keyword_top_k)
+        ]
+        return [chunks, knowledge]
+
+    def _fuse(self, rankings: list[list[NodeWithScore]]) -> list[NodeWithScore]:
+        fused = reciprocal_rank_fusion(rankings, key=lambda n: n.node.node_id, k=self.rrf_k)
+        return [NodeWithScore(node=n.node, score=score) for n, score in fused[: self.top_k]]
@@ -0,0 +1,246 @@
+import hashlib
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from llama_index.core import SimpleDirectoryReader
+from llama_index.core.node_parser import SentenceSplitter
+from llama_index.core.schema import MetadataMode
+
+from app.core.config import settings
+from app.db.repositories.documents import DocumentsRepository
+from app.services.vector_store import VectorService
+
+# Namespace for deterministic Qdrant point ids (same file + same chunk -> same id)
+POINT_ID_NAMESPACE = uuid.UUID("6f1c2a1e-3b7d-4d0e-9a55-2f0c8e4b9d10")
+
+
+def parse_file(path: str, file_name: str) -> list:
+    """Runs in a worker process: PDF/TXT -> llama-index Documents (one per page for PDFs)."""
+    documents = SimpleDirectoryReader(input_files=[path]).load_data()
+    for doc in documents:
+        # The upload is parsed from a temp file; keep the name the user uploaded
+        doc.metadata["file_name"] = file_name
+    return documents
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_sha256(node) -> str:
+    # Page label is part of the identity so citations stay correct when pages shift
+    page_label = node.metadata.get("page_label", "")
+    return hashlib.sha256(f"{page_label}\x00{node.get_content()}".encode("utf-8")).hexdigest()
+
+
+@dataclass
+class IngestionJob:
+    id: str
+    file_name: str
+    status: str = "queued"  # queued -> parsing -> embedding -> done | failed
+    pages: int = 0
+    chunks_total: int = 0
+    chunks_embedded: int = 0
+    chunks_reused: int = 0  # unchanged chunks whose existing embedding was kept
+    chunks_deleted: int = 0
+    duplicates_skipped: int = 0
+    message: str | None = None
+    error: str | None = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    started: float | None = None
+    finished: float | None = None
+
+    def to_dict(self) -> dict:
+        elapsed = None
+        if self.started is not None:
+            elapsed = (self.finished or time.monotonic()) - self.started
+        return {
+            "job_id": self.id,
+            "file_name": self.file_name,
+            "status": self.status,
+            "pages": self.pages,
+            "chunks_total": self.chunks_total,
+            "chunks_embedded": self.chunks_embedded,
+            "chunks_reused": self.chunks_reused,
+            "chunks_deleted": self.chunks_deleted,
+            "duplicates_skipped": self.duplicates_skipped,
+            "elapsed_s": round(elapsed, 2) if elapsed is not None else None,
+            "chunks_per_s": round(self.chunks_embedded / elapsed, 2) if elapsed else None,
+            "message": self.message,
+            "error": self.error,
+            "created_at": self.created_at,
+        }
+
+
+class IngestionManager:
+    """
+    Background document ingestion.
+    Upload -> job id immediately; parsing runs in a process pool, chunks are embedded
+    in batches and upserted to Qdrant in bulk while progress is tracked on the job.
+
+    Ingestion is incremental: the documents registry remembers each file's hash and
+    the hash -> point id of every chunk, so an unchanged re-upload is skipped, and a
+    changed one only embeds new chunks and deletes the ones that disappeared.
+    """
+
+    MAX_FINISHED_JOBS = 100
+
+    def __init__(self, vector_service: VectorService):
+        self.vector_service = vector_service
+        self.documents = DocumentsRepository()
+        self.embed_batch_size = settings.INGEST_EMBED_BATCH_SIZE
+        self.upsert_batch_size = settings.INGEST_UPSERT_BATCH_SIZE
+
+        self._parse_pool = ProcessPoolExecutor(
+            max_workers=settings.INGEST_PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        self._job_pool = ThreadPoolExecutor(
+            max_workers=settings.INGEST_MAX_CONCURRENT_JOBS, thread_name_prefix="ingest"
+        )
+        self._jobs: dict[str, IngestionJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, file_name: str, path: str) -> IngestionJob:
+        """Queues a job for `path`; the file is deleted once the job finishes."""
+        job = IngestionJob(id=uuid.uuid4().hex, file_name=file_name)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._job_pool.submit(self._run, job, path)
+        return job
+
+    def run(self, file_name: str, path: str) -> IngestionJob:
+        """Synchronous ingestion in the caller's thread (same pipeline as submit)."""
+        job = IngestionJob(id=uuid.uuid4().hex, file_name=file_name)
+        self._run(job, path)
+        return job
+
+    def delete_document(self, file_name: str) -> bool:
+        """Removes a document's points from Qdrant and its registry entry."""
+        known = self.documents.delete_document(file_name)
+        had_points = self.vector_service.count_file_points(file_name) > 0
+        if had_points:
+            self.vector_service.delete_file_points(file_name)
+            self.vector_service.notify_changed()
+        return known or had_points
+
+    def sync_catalog(self) -> int:
+        """Registers documents that exist in Qdrant but are missing from the catalog. Returns how many were added."""
+        added = self.documents.register_untracked(self.vector_service.file_point_counts())
+        if added:
+            print(f" [Ingest] Catalogued {added} previously untracked documents.")
+        return added
+
+    def get(self, job_id: str) -> IngestionJob | None:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def shutdown(self) -> None:
+        self._job_pool.shutdown(wait=False, cancel_futures=True)
+        self._parse_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job: IngestionJob, path: str) -> None:
+        job.started = time.monotonic()
+        changed = False
+        try:
+            file_hash = file_sha256(path)
+            size_bytes = os.path.getsize(path)
+            existing = self.documents.get_document(job.file_name)
+
+            if existing and existing["file_hash"] == file_hash:
+                job.status = "done"
+                job.pages = existing["page_count"]
+                job.chunks_total = job.chunks_reused = existing["chunk_count"]
+                job.message = f"'{job.file_name}' is unchanged; skipped ({job.chunks_reused} embeddings reused)."
+                return
+
+            job.status = "parsing"
+            documents = self._parse_pool.submit(parse_file, path, job.file_name).result()
+            job.pages = len(documents)
+
+            nodes = SentenceSplitter(chunk_size=512, chunk_overlap=50).get_nodes_from_documents(documents)
+            old_points = self.documents.get_chunk_points(existing["id"]) if existing else {}
+
+            # chunk_hash -> (point id, page label, text); the text feeds the keyword (BM25) index
+            chunks: dict[str, tuple[str, str | None, str]] = {}
+            new_nodes = []
+            for node in nodes:
+                chunk_hash = chunk_sha256(node)
+                if chunk_hash in chunks:
+                    job.duplicates_skipped += 1
+                    continue
+                if chunk_hash in old_points:
+                    point_id = old_points[chunk_hash]
+                    job.chunks_reused += 1
+                else:
+                    point_id = str(uuid.uuid5(POINT_ID_NAMESPACE, f"{job.file_name}:{chunk_hash}"))
+                    node.id_ = point_id
+                    new_nodes.append(node)
+                chunks[chunk_hash] = (point_id, node.metadata.get("page_label"), node.get_content())
+            job.chunks_total = len(chunks)
+
+            job.status = "embedding"
+            self._embed_and_upsert(job, new_nodes)
+
+            stale = [p for h, p in old_points.items() if h not in chunks]
+            self.vector_service.delete_points(stale)
+            if not old_points:
+                # Points ingested before the registry existed cannot be matched chunk-by-chunk.
+                # Dropped only now that the new ones are written, so a failed job leaves them searchable.
+                self.vector_service.delete_file_points(job.file_name, keep=[p for p, _, _ in chunks.values()])
+            job.chunks_deleted = len(stale)
+            changed = bool(new_nodes or stale or not old_points)
+
+            self.documents.save_document(job.file_name, file_hash, size_bytes, job.pages, chunks)
+
+            job.status = "done"
+            job.message = (
+                f"Successfully ingested {job.pages} pages: {job.chunks_embedded} chunks embedded, "
+                f"{job.chunks_reused} unchanged, {job.chunks_deleted} removed."
+            )
+        except Exception as e:
+            print(f" [Ingest] Job {job.id} failed: {e}")
+            job.status = "failed"
+            job.error = str(e)
+            changed = changed or job.chunks_embedded > 0
+        finally:
+            job.finished = time.monotonic()
+            if os.path.exists(path):
+                os.remove(path)
+            if changed:
+                self.vector_service.notify_changed()
+
+    def _embed_and_upsert(self, job: IngestionJob, nodes: list) -> None:
+        embed_model = self.vector_service.embed_model
+        pending = []
+        for start in range(0, len(nodes), self.embed_batch_size):
+            batch = nodes[start:start + self.embed_batch_size]
+            texts = [n.get_content(metadata_mode=MetadataMode.EMBED) for n in batch]
+            for node, embedding in zip(batch, embed_model.get_text_embedding_batch(texts)):
+                node.embedding = embedding
+            pending.extend(batch)
+
+            if len(pending) >= self.upsert_batch_size:
+                self.vector_service.upsert_nodes(pending)
+                job.chunks_embedded += len(pending)
+                pending = []
+
+        if pending:
+            self.vector_service.upsert_nodes(pending)
+            job.chunks_embedded += len(pending)
+
+    def _prune(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status in ("done", "failed")]
+        for job in finished[:-self.MAX_FINISHED_JOBS]:
+            del self._jobs[job.id]
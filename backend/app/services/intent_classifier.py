@@ -0,0 +1,90 @@
+import json
+import os
+import threading
+from typing import Callable, List
+
+import numpy as np
+
+EXAMPLES_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "datasets",
+    "intent_examples.json",
+)
+
+
+def load_examples(path: str = EXAMPLES_PATH) -> dict[str, list[str]]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+class IntentClassifier:
+    """
+    Nearest-centroid intent classifier over labelled example queries.
+    Each label's centroid is the normalised mean of its examples' embeddings; a query
+    takes the label of the most similar centroid. A prediction is only trusted when
+    that similarity is >= `min_similarity` and beats the runner-up by `min_margin`;
+    otherwise classify() returns None and the caller falls back to the LLM.
+    Examples are queries, so they are embedded like queries: `embed_batch` must produce
+    the same vectors as `embed_query` (same query instruction). Without it, examples go
+    through `embed_query` one at a time.
+    """
+
+    def __init__(
+        self,
+        embed_query: Callable[[str], List[float]],
+        embed_batch: Callable[[List[str]], List[List[float]]] | None,
+        examples: dict[str, list[str]],
+        min_similarity: float = 0.6,
+        min_margin: float = 0.02,
+    ):
+        self.embed_query = embed_query
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self.labels = list(examples)
+
+        centroids = []
+        for label in self.labels:
+            if embed_batch is not None:
+                vectors = embed_batch(examples[label])
+            else:
+                vectors = [embed_query(example) for example in examples[label]]
+            vectors = np.asarray(vectors, dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            centroid = vectors.mean(axis=0)
+            centroids.append(centroid / np.linalg.norm(centroid))
+        self._centroids = np.stack(centroids)
+
+        self._lock = threading.Lock()
+        self._confident = 0
+        self._uncertain = 0
+
+    def predict(self, query: str) -> tuple[str, float, float]:
+        """Returns (label, similarity, margin over the second-best label)."""
+        vector = np.asarray(self.embed_query(query), dtype=np.float32)
+        similarities = self._centroids @ (vector / np.linalg.norm(vector))
+        order = np.argsort(-similarities)
+        best = similarities[order[0]]
+        second = similarities[order[1]] if len(order) > 1 else -1.0
+        return self.labels[order[0]], float(best), float(best - second)
+
+    def classify(self, query: str) -> str | None:
+        label, similarity, margin = self.predict(query)
+        confident = similarity >= self.min_similarity and margin >= self.min_margin
+        with self._lock:
+            if confident:
+                self._confident += 1
+            else:
+                self._uncertain += 1
+        return label if confident else None
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._confident + self._uncertain
+            return {
+                "labels": self.labels,
+                "min_similarity": self.min_similarity,
+                "min_margin": self.min_margin,
+                "confident": self._confident,
+                "llm_fallbacks": self._uncertain,
+                "llm_fallback_rate": round(self._uncertain / total, 3) if total else None,
+            }
@@ -0,0 +1,46 @@
+from llama_index.core.instrumentation import get_dispatcher
+from llama_index.core.instrumentation.event_handlers import BaseEventHandler
+from llama_index.core.instrumentation.events.llm import LLMChatEndEvent
+
+from app.core.metrics import record_tokens
+
+
+def _raw_count(raw, key: str) -> int:
+    # The Ollama client returns a dict or a pydantic response depending on its version
+    if raw is None:
+        return 0
+    value = raw.get(key) if isinstance(raw, dict) else getattr(raw, key, None)
+    return int(value or 0)
+
+
+class TokenCountHandler(BaseEventHandler):
+    """
+    Reads Ollama's prompt_eval_count / eval_count from every finished LLM call.
+    Streaming calls end with one event carrying the final chunk, which holds the totals.
+    Only chat events are counted: Ollama's complete() is built on chat(), so each
+    completion also fires a chat event with the same raw response.
+    """
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "TokenCountHandler"
+
+    def handle(self, event, **kwargs) -> None:
+        if not isinstance(event, LLMChatEndEvent) or event.response is None:
+            return
+        raw = event.response.raw
+        prompt = _raw_count(raw, "prompt_eval_count")
+        completion = _raw_count(raw, "eval_count")
+        if prompt or completion:
+            record_tokens(prompt, completion)
+
+
+_installed = False
+
+
+def install_token_counter() -> None:
+    """Attaches the handler to the root dispatcher once per process (LLM reloads keep it)."""
+    global _installed
+    if not _installed:
+        get_dispatcher().add_event_handler(TokenCountHandler())
+        _installed = True
@@ -0,0 +1,127 @@
+import threading
+from datetime import datetime
+
+from app.services.crag_service import CRAGService
+
+
+class ServiceNotReady(Exception):
+    pass
+
+
+class ServiceRegistry:
+    """
+    Application-scoped holder for the heavy AI services.
+    Models are loaded once at startup (in a background thread so auth/chat endpoints
+    are available immediately) and shared by every request.
+    """
+
+    COMPONENTS = ("llm", "reranker", "embeddings")
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._crag: CRAGService | None = None
+        self._thread: threading.Thread | None = None
+        self.state = "cold"  # cold -> warming -> ready | failed
+        self.error: str | None = None
+        self.ready_at: str | None = None
+        self.reloading: str | None = None
+
+    # --- LIFECYCLE ---
+
+    def start_warm_up(self) -> None:
+        with self._lock:
+            if self.state in ("warming", "ready"):
+                return
+            self.state = "warming"
+        self._thread = threading.Thread(target=self.warm_up, name="crag-warm-up", daemon=True)
+        self._thread.start()
+
+    def warm_up(self) -> None:
+        with self._lock:
+            self.state = "warming"
+            self.error = None
+        try:
+            crag = CRAGService()
+            crag.warm_up()
+            crag.ingestion.sync_catalog()
+        except Exception as e:
+            print(f" [Registry] Warm-up failed: {e}")
+            with self._lock:
+                self.state = "failed"
+                self.error = str(e)
+            return
+
+        with self._lock:
+            self._crag = crag
+            self.state = "ready"
+            self.ready_at = datetime.now().isoformat()
+        print(" [Registry] CRAG service ready.")
+
+    def shutdown(self) -> None:
+        if self._crag is not None:
+            self._crag.ingestion.shutdown()
+            self._crag.reranker.close()
+            if hasattr(self._crag.vector_service.embed_model, "close"):
+                self._crag.vector_service.embed_model.close()
+
+    def get_crag(self) -> CRAGService:
+        crag = self._crag
+        if crag is None:
+            detail = f"AI services are {self.state}."
+            if self.error:
+                detail += f" Last error: {self.error}"
+            raise ServiceNotReady(detail)
+        return crag
+
+    def reload(self, component: str, model: str | None = None) -> None:
+        """
+        Hot-reloads one model. The new model is built while the old one keeps serving,
+        then swapped in; a failed load leaves the running model untouched.
+        """
+        if component not in self.COMPONENTS:
+            raise ValueError(f"Unknown component '{component}'.")
+        crag = self.get_crag()
+
+        with self._lock:
+            if self.reloading:
+                raise ServiceNotReady(f"Reload of '{self.reloading}' already in progress.")
+            self.reloading = component
+        try:
+            if component == "llm":
+                crag.reload_llm(model)
+            elif component == "reranker":
+                crag.reload_reranker(model)
+            else:
+                crag.reload_embeddings(model)
+            print(f" [Registry] Reloaded {component}.")
+        finally:
+            with self._lock:
+                self.reloading = None
+
+    @staticmethod
+    def _embedding_stats(crag: CRAGService | None) -> dict | None:
+        embed_model = crag.vector_service.embed_model if crag is not None else None
+        return embed_model.stats() if hasattr(embed_model, "stats") else None
+
+    def status(self) -> dict:
+        crag = self._crag
+        models = {}
+        if crag is not None:
+            models = {
+                "llm": getattr(crag.llm, "model", None),
+                "reranker": getattr(crag.reranker, "model", None),
+                "embeddings": getattr(crag.vector_service.embed_model, "model_name", None),
+            }
+        return {
+            "state": self.state,
+            "ready": crag is not None,
+            "error": self.error,
+            "ready_at": self.ready_at,
+            "reloading": self.reloading,
+            "models": models,
+            "cache": crag.cache.stats() if crag is not None and crag.cache is not None else None,
+            "reranker": crag.reranker.stats() if crag is not None else None,
+            "embeddings": self._embedding_stats(crag),
+            "intent": crag.intent_classifier.stats() if crag is not None and crag.intent_classifier is not None else None,
+            "timings": crag.timings.snapshot() if crag is not None else {},
+        }
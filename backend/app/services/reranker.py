@@ -0,0 +1,113 @@
+import threading
+
+from llama_index.core.schema import NodeWithScore
+from sentence_transformers import CrossEncoder
+
+from app.core.config import settings
+from app.services.batching import MicroBatcher
+
+
+class AdaptiveReranker:
+    """
+    Cross-encoder reranking that only pays for what a query needs:
+    - skipped when the dense scores already show a clear winner (top score high enough
+      and far enough ahead of the runner-up); the dense order is used as-is,
+    - (query, passage) pairs are truncated to `max_tokens` before scoring,
+    - pairs from concurrent requests are scored together in one batched forward pass,
+    - optional ONNX backend (sentence-transformers >= 4 with optimum[onnxruntime]).
+    Output scores are the cross-encoder's, or the dense similarity when skipped.
+    """
+
+    def __init__(
+        self,
+        model: str | None = None,
+        top_n: int | None = None,
+        backend: str | None = None,
+        max_tokens: int | None = None,
+        skip_min_score: float | None = None,
+        skip_margin: float | None = None,
+    ):
+        self.model = model or settings.RERANKER_MODEL
+        self.top_n = top_n or settings.RERANK_TOP_N
+        self.max_tokens = max_tokens or settings.RERANK_MAX_TOKENS
+        self.skip_min_score = settings.RERANK_SKIP_MIN_SCORE if skip_min_score is None else skip_min_score
+        self.skip_margin = settings.RERANK_SKIP_MARGIN if skip_margin is None else skip_margin
+        self.backend = backend or settings.RERANKER_BACKEND
+        self._encoder = self._load_encoder()
+
+        self._batcher = MicroBatcher(
+            self._predict,
+            max_batch_size=settings.RERANK_BATCH_SIZE,
+            max_wait_ms=settings.RERANK_BATCH_WAIT_MS,
+            name="rerank-batcher",
+        )
+        self._lock = threading.Lock()
+        self._reranked = 0
+        self._skipped = 0
+
+    def _load_encoder(self) -> CrossEncoder:
+        if self.backend != "torch":
+            try:
+                model_kwargs = {"file_name": settings.RERANKER_ONNX_FILE} if settings.RERANKER_ONNX_FILE else {}
+                return CrossEncoder(
+                    self.model, max_length=self.max_tokens, backend=self.backend, model_kwargs=model_kwargs
+                )
+            except Exception as e:
+                print(f" [Rerank] {self.backend} backend unavailable ({e}); falling back to torch.")
+                self.backend = "torch"
+        return CrossEncoder(self.model, max_length=self.max_tokens)
+
+    def _predict(self, pairs: list[tuple[str, str]]) -> list[float]:
+        scores = self._encoder.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+        return [float(s) for s in scores]
+
+    def rerank(
+        self, query: str, nodes: list[NodeWithScore], dense_nodes: list[NodeWithScore] | None = None
+    ) -> list[NodeWithScore]:
+        """
+        Returns the best `top_n` of `nodes`. `dense_nodes` are the vector search results
+        (with cosine scores) used for the skip decision; defaults to `nodes`.
+        """
+        if not nodes:
+            return []
+        dense_nodes = nodes if dense_nodes is None else dense_nodes
+        if self.should_skip(dense_nodes):
+            with self._lock:
+                self._skipped += 1
+            return dense_nodes[: self.top_n]
+
+        # The tokenizer truncates to max_tokens; the char cap just avoids tokenizing text it would drop
+        char_budget = self.max_tokens * 8
+        pairs = [(query, n.node.get_content()[:char_budget]) for n in nodes]
+        scores = self._batcher.submit(pairs)
+        with self._lock:
+            self._reranked += 1
+
+        ranked = sorted(zip(nodes, scores), key=lambda pair: pair[1], reverse=True)
+        return [NodeWithScore(node=n.node, score=score) for n, score in ranked[: self.top_n]]
+
+    def should_skip(self, dense_nodes: list[NodeWithScore]) -> bool:
+        scores = sorted((n.score for n in dense_nodes if n.score is not None), reverse=True)
+        if not scores or scores[0] < self.skip_min_score:
+            return False
+        runner_up = scores[1] if len(scores) > 1 else 0.0
+        return scores[0] - runner_up >= self.skip_margin
+
+    def warm_up(self) -> None:
+        self._predict([("tenancy deposit", "tenancy deposit")])
+
+    def close(self) -> None:
+        self._batcher.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self._reranked + self._skipped
+            return {
+                "model": self.model,
+                "backend": self.backend,
+                "max_tokens": self.max_tokens,
+                "reranked": self._reranked,
+                "skipped": self._skipped,
+                "skip_rate": round(self._skipped / total, 3) if total else None,
+                "batching": self._batcher.stats(),
+            }
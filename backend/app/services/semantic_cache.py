@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, List
+
+import numpy as np
+
+
+@dataclass
+class _CacheEntry:
+    query: str
+    vector: np.ndarray
+    result: dict
+    created_at: float
+
+
+class SemanticCache:
+    """
+    Answer cache keyed on query embeddings.
+    A lookup is a hit when a stored query has cosine similarity >= threshold with the new one,
+    so "how much is the deposit?" and "How much is the deposit" share one generation.
+    Entries expire after ttl_s and the least recently used entry is evicted beyond max_entries.
+    invalidate() bumps `generation`; an answer generated from the old corpus is dropped
+    by store() when the caller passes the generation it saw before generating.
+    """
+
+    def __init__(
+        self,
+        embed_fn: Callable[[str], List[float]],
+        threshold: float = 0.95,
+        ttl_s: float = 3600.0,
+        max_entries: int = 1000,
+    ):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+
+        self._entries: OrderedDict[int, _CacheEntry] = OrderedDict()
+        self._next_id = 0
+        self._generation = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_stores = 0
+
+    @property
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def embed(self, query: str) -> np.ndarray:
+        vector = np.asarray(self.embed_fn(query), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def lookup(self, query: str, vector: np.ndarray | None = None) -> tuple[dict | None, np.ndarray]:
+        """Returns (cached_result or None, query_vector). The vector is returned so callers can reuse it for retrieval."""
+        if vector is None:
+            vector = self.embed(query)
+
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            best_id, best_sim = None, -1.0
+            for entry_id, entry in self._entries.items():
+                sim = float(np.dot(entry.vector, vector))
+                if sim > best_sim:
+                    best_id, best_sim = entry_id, sim
+
+            if best_id is None or best_sim < self.threshold:
+                self.misses += 1
+                return None, vector
+
+            self._entries.move_to_end(best_id)
+            self.hits += 1
+            result = self._entries[best_id].result
+            return {**result, "sources": list(result.get("sources", []))}, vector
+
+    def store(self, query: str, vector: np.ndarray, result: dict, generation: int | None = None) -> None:
+        """`generation` is the value read before the answer was generated; a stale one skips the store."""
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                self.stale_stores += 1
+                return
+            self._entries[self._next_id] = _CacheEntry(
+                query=query,
+                vector=vector,
+                result={**result, "sources": list(result.get("sources", []))},
+                created_at=time.monotonic(),
+            )
+            self._next_id += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Drops every entry. Called whenever the document corpus changes."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._generation += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "stale_stores": self.stale_stores,
+                "threshold": self.threshold,
+            }
+
+    def _expire(self, now: float) -> None:
+        # Entries are kept in LRU order, not insertion order, so scan them all
+        expired = [k for k, e in self._entries.items() if now - e.created_at > self.ttl_s]
+        for k in expired:
+            del self._entries[k]
+            self.evictions += 1
@@ -0,0 +1,48 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from app.core.metrics import record_stage
+
+
+class StageTimings:
+    """
+    Rolling per-stage latency samples (last `window` calls per stage) for the status endpoint.
+    Every sample is also exported to /metrics and added to the current request's trace.
+    """
+
+    def __init__(self, window: int = 500):
+        self.window = window
+        self._samples: dict[str, deque[float]] = {}
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def measure(self, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, (time.perf_counter() - start) * 1000)
+
+    def record(self, stage: str, elapsed_ms: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(stage, deque(maxlen=self.window))
+            samples.append(elapsed_ms)
+            self._counts[stage] = self._counts.get(stage, 0) + 1
+        record_stage(stage, elapsed_ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stages = {stage: sorted(samples) for stage, samples in self._samples.items()}
+            counts = dict(self._counts)
+        return {
+            stage: {
+                "count": counts[stage],
+                "p50_ms": round(samples[len(samples) // 2], 2),
+                "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+                "max_ms": round(samples[-1], 2),
+            }
+            for stage, samples in stages.items()
+        }
@@ -0,0 +1,36 @@
+import threading
+
+from app.db.repositories.tokens import TokensRepository
+
+
+class TokenPurger:
+    """Background thread that deletes expired rows from auth_tokens every `interval_s` seconds."""
+
+    def __init__(self, interval_s: float):
+        self.interval_s = interval_s
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="token-purger", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def purge_once(self) -> int:
+        removed = TokensRepository().purge_expired()
+        if removed:
+            print(f" [Auth] Purged {removed} expired tokens.")
+        return removed
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.purge_once()
+            except Exception as e:
+                print(f" [Auth] Token purge failed: {e}")
+            if self._stop.wait(self.interval_s):
+                return
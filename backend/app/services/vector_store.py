@@ -1,86 +1,339 @@
-from typing import List
+import asyncio
+import json
+from typing import Callable, List
 from llama_index.core import VectorStoreIndex, SimpleDirectoryReader, StorageContext, Settings as LlamaSettings
+from llama_index.core.retrievers import BaseRetriever, VectorIndexRetriever
+from llama_index.core.schema import NodeWithScore, QueryBundle
+from llama_index.core.vector_stores.utils import metadata_dict_to_node
 from llama_index.vector_stores.qdrant import QdrantVectorStore
-from llama_index.embeddings.huggingface import HuggingFaceEmbedding
-from qdrant_client import QdrantClient
+from qdrant_client import AsyncQdrantClient, QdrantClient
 from qdrant_client.http import models
 from app.core.config import settings
+from app.db.repositories.documents import DocumentsRepository
+from app.services.embedding_service import EmbeddingService
+
+
+def grpc_options(retries: int) -> dict:
+    """
+    Channel options: keepalive pings hold the connection open between queries, and calls that
+    fail with UNAVAILABLE (server restarting, connection reset) are retried with backoff.
+    Point ids are deterministic, so a retried upsert is idempotent.
+    """
+    service_config = {
+        "methodConfig": [{
+            "name": [{"service": "qdrant.Points"}, {"service": "qdrant.Collections"}],
+            "retryPolicy": {
+                "maxAttempts": retries + 1,
+                "initialBackoff": "0.1s",
+                "maxBackoff": "2s",
+                "backoffMultiplier": 2,
+                "retryableStatusCodes": ["UNAVAILABLE"],
+            },
+        }]
+    }
+    return {
+        "grpc.keepalive_time_ms": 30_000,
+        "grpc.keepalive_timeout_ms": 10_000,
+        "grpc.keepalive_permit_without_calls": 1,
+        "grpc.http2.max_pings_without_data": 0,
+        # Bulk upserts of chunk text exceed the 4 MB default
+        "grpc.max_send_message_length": 64 * 1024 * 1024,
+        "grpc.max_receive_message_length": 64 * 1024 * 1024,
+        "grpc.enable_retries": 1 if retries > 0 else 0,
+        "grpc.service_config": json.dumps(service_config),
+    }
+
+
+def build_clients() -> tuple[QdrantClient, AsyncQdrantClient | None]:
+    if settings.QDRANT_PATH:
+        # Embedded storage is locked to a single client per process, so there is no async twin
+        return QdrantClient(path=settings.QDRANT_PATH), None
+    kwargs = {"url": settings.QDRANT_URL, "timeout": settings.QDRANT_TIMEOUT_S}
+    if settings.QDRANT_PREFER_GRPC:
+        kwargs.update(
+            prefer_grpc=True,
+            grpc_port=settings.QDRANT_GRPC_PORT,
+            grpc_options=grpc_options(settings.QDRANT_GRPC_RETRIES),
+        )
+    return QdrantClient(**kwargs), AsyncQdrantClient(**kwargs)
+
+
+class QdrantSearchRetriever(BaseRetriever):
+    """
+    Dense retrieval through query_points, for when search parameters (hnsw_ef, quantization
+    rescoring) must be sent with each query; the llama-index vector store has no hook for them.
+    """
+
+    def __init__(self, vector_service: "VectorService", top_k: int, search_params: models.SearchParams):
+        super().__init__()
+        self.vector_service = vector_service
+        self.top_k = top_k
+        self.search_params = search_params
+
+    def _query_kwargs(self, query_bundle: QueryBundle) -> dict:
+        embedding = query_bundle.embedding or self.vector_service.embed_model.get_query_embedding(query_bundle.query_str)
+        return {
+            "collection_name": self.vector_service.collection_name,
+            "query": embedding,
+            "limit": self.top_k,
+            "search_params": self.search_params,
+            "with_payload": True,
+        }
+
+    @staticmethod
+    def _to_nodes(points) -> list[NodeWithScore]:
+        # Payloads are written by QdrantVectorStore.add, so they carry the serialised node
+        return [NodeWithScore(node=metadata_dict_to_node(p.payload), score=p.score) for p in points]
+
+    def _retrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        return self._to_nodes(self.vector_service.client.query_points(**self._query_kwargs(query_bundle)).points)
+
+    async def _aretrieve(self, query_bundle: QueryBundle) -> list[NodeWithScore]:
+        aclient = self.vector_service.aclient
+        if aclient is None:
+            return await asyncio.to_thread(self._retrieve, query_bundle)
+        response = await aclient.query_points(**self._query_kwargs(query_bundle))
+        return self._to_nodes(response.points)
 
 
 class VectorService:
-    def __init__(self):
+    def __init__(
+        self,
+        client: QdrantClient | None = None,
+        aclient: AsyncQdrantClient | None = None,
+        embed_model=None,
+    ):
         print(" [VectorStore] Initializing Embedding Model & Settings...")
 
         # 1. Tuning for BGE-Small (Max 512 tokens)
         LlamaSettings.chunk_size = 512
         LlamaSettings.chunk_overlap = 50
 
-        # Load Embedding Model locally
-        LlamaSettings.embed_model = HuggingFaceEmbedding(model_name=settings.EMBEDDING_MODEL)
+        # Load Embedding Model locally (micro-batched, with a query vector cache)
+        self.embed_model = embed_model or EmbeddingService()
+        LlamaSettings.embed_model = self.embed_model
         print(" [VectorStore] Embedding Model Loaded.")
 
-        self.client = QdrantClient(url=settings.QDRANT_URL)
+        if client is None:
+            client, default_aclient = build_clients()
+            aclient = aclient or default_aclient
+        self.client = client
+        # Async twin used by the async retrieval path (aretrieve); None in embedded mode
+        self.aclient = aclient
+        self.embedded = self._is_embedded(client)
         self.collection_name = settings.COLLECTION_NAME
+        if self.embedded:
+            print(" [VectorStore] Embedded Qdrant (exact search; HNSW/quantization settings do not apply).")
+
+        self._ensure_collection()
+
+        # One upsert request per ingestion batch instead of the store's default of 64 points
+        self.vector_store = QdrantVectorStore(
+            client=self.client,
+            aclient=self.aclient,
+            collection_name=self.collection_name,
+            batch_size=settings.INGEST_UPSERT_BATCH_SIZE,
+        )
+        self.storage_context = StorageContext.from_defaults(vector_store=self.vector_store)
+        self._change_listeners: list[Callable[[], None]] = []
+
+    @staticmethod
+    def _is_embedded(client: QdrantClient) -> bool:
+        options = getattr(client, "init_options", None) or {}
+        return bool(options.get("path")) or options.get("location") == ":memory:"
+
+    @staticmethod
+    def _hnsw_config() -> models.HnswConfigDiff:
+        return models.HnswConfigDiff(
+            m=settings.QDRANT_HNSW_M,
+            ef_construct=settings.QDRANT_HNSW_EF_CONSTRUCT,
+            on_disk=settings.QDRANT_ON_DISK,
+        )
+
+    @staticmethod
+    def _quantization_config() -> models.ScalarQuantization | None:
+        if settings.QDRANT_QUANTIZATION == "none":
+            return None
+        if settings.QDRANT_QUANTIZATION != "int8":
+            raise ValueError(f"Unsupported QDRANT_QUANTIZATION '{settings.QDRANT_QUANTIZATION}' (none | int8).")
+        return models.ScalarQuantization(
+            scalar=models.ScalarQuantizationConfig(
+                type=models.ScalarType.INT8,
+                quantile=0.99,
+                always_ram=settings.QDRANT_QUANTIZATION_ALWAYS_RAM,
+            )
+        )
 
+    def _ensure_collection(self) -> None:
         if not self.client.collection_exists(self.collection_name):
             print(f" [VectorStore] Collection '{self.collection_name}' not found. Creating it...")
             self.client.create_collection(
                 collection_name=self.collection_name,
                 vectors_config=models.VectorParams(
                     size=384,
-                    distance=models.Distance.COSINE
-                )
+                    distance=models.Distance.COSINE,
+                    on_disk=settings.QDRANT_ON_DISK,
+                ),
+                hnsw_config=self._hnsw_config(),
+                quantization_config=self._quantization_config(),
             )
+        elif not self.embedded:
+            self._apply_collection_config()
 
-        self.vector_store = QdrantVectorStore(client=self.client, collection_name=self.collection_name)
-        self.storage_context = StorageContext.from_defaults(vector_store=self.vector_store)
+        # Keyword index so file_name filters (delete/count/facet) don't scan every point
+        payload_schema = self.client.get_collection(self.collection_name).payload_schema or {}
+        if "file_name" not in payload_schema:
+            self.client.create_payload_index(
+                collection_name=self.collection_name,
+                field_name="file_name",
+                field_schema=models.PayloadSchemaType.KEYWORD,
+            )
+
+    def _apply_collection_config(self) -> None:
+        """Brings an existing collection in line with the settings; Qdrant rebuilds indexes in the background."""
+        config = self.client.get_collection(self.collection_name).config
+        changes = {}
+
+        hnsw = config.hnsw_config
+        if (hnsw.m, hnsw.ef_construct, bool(hnsw.on_disk)) != (
+            settings.QDRANT_HNSW_M, settings.QDRANT_HNSW_EF_CONSTRUCT, settings.QDRANT_ON_DISK
+        ):
+            changes["hnsw_config"] = self._hnsw_config()
+
+        vectors = config.params.vectors
+        if isinstance(vectors, models.VectorParams) and bool(vectors.on_disk) != settings.QDRANT_ON_DISK:
+            changes["vectors_config"] = {"": models.VectorParamsDiff(on_disk=settings.QDRANT_ON_DISK)}
+
+        wanted = self._quantization_config()
+        current = config.quantization_config
+        if wanted is None and current is not None:
+            changes["quantization_config"] = models.Disabled.DISABLED
+        elif wanted is not None and (
+            not isinstance(current, models.ScalarQuantization)
+            or bool(current.scalar.always_ram) != settings.QDRANT_QUANTIZATION_ALWAYS_RAM
+        ):
+            changes["quantization_config"] = wanted
+
+        if changes:
+            print(f" [VectorStore] Updating collection config: {', '.join(changes)}")
+            self.client.update_collection(collection_name=self.collection_name, **changes)
+
+    def search_params(self) -> models.SearchParams | None:
+        """Per-query parameters, or None when the server defaults apply (always None in embedded mode)."""
+        if self.embedded:
+            return None
+        quantization = None
+        if settings.QDRANT_QUANTIZATION == "int8":
+            quantization = models.QuantizationSearchParams(
+                rescore=settings.QDRANT_QUANTIZATION_RESCORE,
+                oversampling=settings.QDRANT_QUANTIZATION_OVERSAMPLING,
+            )
+        if not settings.QDRANT_SEARCH_HNSW_EF and quantization is None:
+            return None
+        return models.SearchParams(hnsw_ef=settings.QDRANT_SEARCH_HNSW_EF or None, quantization=quantization)
+
+    def dense_retriever(self, index, top_k: int) -> BaseRetriever:
+        params = self.search_params()
+        if params is None:
+            return VectorIndexRetriever(index=index, similarity_top_k=top_k)
+        return QdrantSearchRetriever(self, top_k, params)
+
+    def add_change_listener(self, callback: Callable[[], None]) -> None:
+        """Registers a callback fired whenever documents are added or removed (e.g. cache invalidation)."""
+        self._change_listeners.append(callback)
+
+    def notify_changed(self) -> None:
+        for callback in self._change_listeners:
+            callback()
 
     def get_index(self):
         return VectorStoreIndex.from_vector_store(
             self.vector_store,
-            storage_context=self.storage_context
+            storage_context=self.storage_context,
+            embed_model=self.embed_model,
         )
 
-    def ingest_document(self, file_path: str):
+    def reload_embed_model(self, model_name: str | None = None) -> None:
+        """Swaps the embedding model in place. The new model must keep the collection's vector size."""
+        previous = self.embed_model
+        embed_model = EmbeddingService(model_name=model_name)
+        self.embed_model = embed_model
+        LlamaSettings.embed_model = embed_model
+        if isinstance(previous, EmbeddingService):
+            # In-flight queries keep working on it, unbatched (see MicroBatcher.close)
+            previous.close()
+        print(f" [VectorStore] Embedding Model reloaded: {embed_model.model_name}")
+
+    def upsert_nodes(self, nodes: list) -> list[str]:
+        """Bulk-writes nodes that already carry embeddings. Callers fire notify_changed() when done."""
+        return self.vector_store.add(nodes)
+
+    def delete_points(self, point_ids: list[str]) -> None:
+        if point_ids:
+            self.client.delete(
+                collection_name=self.collection_name,
+                points_selector=models.PointIdsList(points=point_ids),
+            )
+
+    def delete_file_points(self, file_name: str, keep: list[str] | None = None) -> None:
+        """
+        Removes every chunk of one document, including ones ingested before the document registry existed.
+        Points whose ids are in `keep` survive (e.g. the ones a re-ingest just wrote).
+        """
+        self.client.delete(
+            collection_name=self.collection_name,
+            points_selector=models.FilterSelector(
+                filter=models.Filter(
+                    must=[models.FieldCondition(key="file_name", match=models.MatchValue(value=file_name))],
+                    must_not=[models.HasIdCondition(has_id=keep)] if keep else None,
+                )
+            ),
+        )
+
+    def count_file_points(self, file_name: str) -> int:
+        return self.client.count(
+            collection_name=self.collection_name,
+            count_filter=models.Filter(
+                must=[models.FieldCondition(key="file_name", match=models.MatchValue(value=file_name))]
+            ),
+            exact=True,
+        ).count
+
+    def ingest_document(self, file_path: str, file_name: str | None = None):
         documents = SimpleDirectoryReader(input_files=[file_path]).load_data()
+        if file_name:
+            for doc in documents:
+                doc.metadata["file_name"] = file_name
         VectorStoreIndex.from_documents(
             documents,
             storage_context=self.storage_context,
+            embed_model=self.embed_model,
             show_progress=True
         )
+        self.notify_changed()
         return f"Successfully ingested {len(documents)} pages."
 
     def clear_database(self):
         self.client.delete_collection(self.collection_name)
+        self._ensure_collection()
+        DocumentsRepository().clear()
+        self.notify_changed()
         return "Database cleared! Please re-ingest your documents."
 
-    def list_ingested_files(self) -> List[str]:
+    def file_point_counts(self, limit: int = 10_000) -> dict[str, int]:
+        """Number of points per file_name, answered from the payload index (facet) rather than a scroll."""
+        response = self.client.facet(
+            collection_name=self.collection_name, key="file_name", limit=limit, exact=True
+        )
+        return {hit.value: hit.count for hit in response.hits}
+
+    def list_ingested_files(self, limit: int = 100, offset: int = 0) -> List[str]:
         """
-        Scrolls through the Qdrant database to find unique file names in metadata.
+        Lists ingested file names from the document catalog (maintained at ingest time).
         """
         try:
-            # We scroll through points to get metadata
-            # This is a basic implementation; for millions of points, you'd use a Payload index.
-            response = self.client.scroll(
-                collection_name=self.collection_name,
-                limit=100,  # Check first 100 chunks (usually enough to see files)
-                with_payload=True,
-                with_vectors=False
-            )
-
-            seen_files = set()
-            points, _ = response
-
-            for point in points:
-                payload = point.payload or {}
-                # LlamaIndex usually stores file_name in metadata keys like 'file_name' or 'node_info'
-                # Depending on version, it might be directly in payload
-                f_name = payload.get("file_name") or payload.get("metadata", {}).get("file_name")
-                if f_name:
-                    # Clean path to just show filename
-                    clean_name = f_name.split("/")[-1].split("\\")[-1]
-                    seen_files.add(clean_name)
-
-            return list(seen_files) if seen_files else ["No metadata found (Index might be empty)"]
+            documents = DocumentsRepository().list_documents(limit=limit, offset=offset)
+            names = [d["file_name"] for d in documents]
+            return names if names else ["No metadata found (Index might be empty)"]
         except Exception as e:
             return [f"Error fetching files: {str(e)}"]
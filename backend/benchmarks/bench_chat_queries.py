@@ -0,0 +1,150 @@
+"""
+Benchmark the chat/token queries before and after the index migration (version 2).
+
+Builds a throwaway database at schema version 1, fills it with synthetic chat history,
+times the repository queries, applies the remaining migrations and times them again.
+
+Usage (from backend/):
+  python benchmarks/bench_chat_queries.py --messages 1000000
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.migrations import migrate  # noqa: E402
+
+LIST_SESSIONS = "SELECT id, username, title, created_at FROM chat_sessions WHERE username=? ORDER BY id DESC"
+GET_MESSAGES = "SELECT role, content, timestamp, sources, confidence FROM chat_messages WHERE session_id=? ORDER BY id ASC"
+EXPIRED_TOKENS = "SELECT COUNT(*) FROM auth_tokens WHERE expires_at < ?"
+
+
+def populate(conn: sqlite3.Connection, users: int, sessions: int, messages: int, tokens: int) -> None:
+    rng = random.Random(42)
+    now = datetime.now()
+
+    conn.executemany(
+        "INSERT INTO users (username,password_hash,role,name,email,created_at) VALUES (?,?,?,?,?,?)",
+        [(f"user{i}", "!", "staff", f"User {i}", f"user{i}@example.com", "2024-01-01") for i in range(users)],
+    )
+    conn.executemany(
+        "INSERT INTO chat_sessions (username,title,created_at) VALUES (?,?,?)",
+        [(f"user{rng.randrange(users)}", f"Session {i}", "2024-01-01 09:00") for i in range(sessions)],
+    )
+
+    batch = []
+    for i in range(messages):
+        batch.append((
+            rng.randrange(1, sessions + 1),
+            "user" if i % 2 == 0 else "assistant",
+            "How much is the security deposit for a 1-year tenancy?" if i % 2 == 0 else "Typically two months' rent.",
+            now.isoformat(),
+            None if i % 2 == 0 else '["handbook.pdf (Page 3) - Score: 0.91"]',
+            None if i % 2 == 0 else 1.0,
+        ))
+        if len(batch) == 50_000:
+            conn.executemany(
+                "INSERT INTO chat_messages (session_id,role,content,timestamp,sources,confidence) VALUES (?,?,?,?,?,?)",
+                batch,
+            )
+            batch.clear()
+    if batch:
+        conn.executemany(
+            "INSERT INTO chat_messages (session_id,role,content,timestamp,sources,confidence) VALUES (?,?,?,?,?,?)",
+            batch,
+        )
+
+    conn.executemany(
+        "INSERT INTO auth_tokens (token,username,issued_at,expires_at) VALUES (?,?,?,?)",
+        [
+            (f"tok{i}", f"user{rng.randrange(users)}", now.isoformat(),
+             (now + timedelta(minutes=rng.randint(-1440, 1440))).isoformat())
+            for i in range(tokens)
+        ],
+    )
+    conn.commit()
+
+
+def time_query(conn: sqlite3.Connection, sql: str, params_list: list[tuple]) -> dict:
+    samples = []
+    for params in params_list:
+        start = time.perf_counter()
+        conn.execute(sql, params).fetchall()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50_ms": statistics.median(samples),
+        "p95_ms": samples[int(len(samples) * 0.95) - 1],
+        "plan": " | ".join(r[3] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params_list[0])),
+    }
+
+
+def time_cascade_delete(conn: sqlite3.Connection, usernames: list[str]) -> float:
+    start = time.perf_counter()
+    for username in usernames:
+        conn.execute("DELETE FROM chat_sessions WHERE username=?", (username,))
+    elapsed = (time.perf_counter() - start) * 1000 / len(usernames)
+    conn.rollback()
+    return elapsed
+
+
+def run(conn: sqlite3.Connection, users: int, sessions: int, samples: int) -> None:
+    rng = random.Random(7)
+    user_params = [(f"user{rng.randrange(users)}",) for _ in range(samples)]
+    session_params = [(rng.randrange(1, sessions + 1),) for _ in range(samples)]
+    now = [(datetime.now().isoformat(),)] * min(samples, 20)
+
+    for label, sql, params in (
+        ("list_sessions", LIST_SESSIONS, user_params),
+        ("get_messages", GET_MESSAGES, session_params),
+        ("expired_tokens", EXPIRED_TOKENS, now),
+    ):
+        r = time_query(conn, sql, params)
+        print(f"  {label:<15} p50={r['p50_ms']:8.3f} ms  p95={r['p95_ms']:8.3f} ms  plan: {r['plan']}")
+
+    conn.execute("BEGIN")
+    # One user only: without the index every deleted session rescans chat_messages
+    per_delete = time_cascade_delete(conn, [user_params[0][0]])
+    print(f"  {'clear_sessions':<15} {per_delete:8.3f} ms per user (cascade, rolled back)")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=200)
+    ap.add_argument("--sessions", type=int, default=50_000)
+    ap.add_argument("--messages", type=int, default=1_000_000)
+    ap.add_argument("--tokens", type=int, default=100_000)
+    ap.add_argument("--samples", type=int, default=200)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(os.path.join(tmp, "bench.db"))
+        conn.execute("PRAGMA foreign_keys = ON;")
+        migrate(conn, target=1)
+
+        start = time.perf_counter()
+        populate(conn, args.users, args.sessions, args.messages, args.tokens)
+        print(f"Populated {args.messages:,} messages / {args.sessions:,} sessions in {time.perf_counter() - start:.1f}s\n")
+
+        print("Schema v1 (no secondary indexes):")
+        run(conn, args.users, args.sessions, args.samples)
+
+        start = time.perf_counter()
+        migrate(conn)
+        print(f"\nMigrated to latest in {time.perf_counter() - start:.1f}s\n")
+
+        print("Latest schema:")
+        run(conn, args.users, args.sessions, args.samples)
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Benchmark query-embedding throughput under concurrent users.
+
+Compares one encode() per query (what HuggingFaceEmbedding did) with the
+micro-batching EmbeddingService, at several client concurrency levels. The query
+vector cache is disabled so every query reaches the model.
+
+Usage (from backend/):
+  python benchmarks/bench_embedding_service.py --queries 512 --concurrency 1 8 32
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings  # noqa: E402
+from app.services.embedding_service import EmbeddingService  # noqa: E402
+
+TOPICS = ["deposit", "stamp duty", "eviction", "rent increase", "early termination", "maintenance", "utility bills"]
+
+
+def make_queries(n: int) -> list[str]:
+    return [f"Question {i}: what are the rules on {TOPICS[i % len(TOPICS)]} for tenancy #{i}?" for i in range(n)]
+
+
+def run(label: str, embed, queries: list[str], concurrency: int) -> None:
+    latencies: list[float] = []
+
+    def one(query: str) -> None:
+        start = time.perf_counter()
+        embed(query)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, queries))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"  {label:<9} c={concurrency:<3} {len(queries) / elapsed:8.1f} q/s  "
+        f"p50={statistics.median(latencies):7.2f} ms  p95={latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--queries", type=int, default=512)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    ap.add_argument("--threads", type=int, default=settings.EMBED_NUM_THREADS, help="torch threads (0 = default)")
+    args = ap.parse_args()
+
+    service = EmbeddingService(cache_size=0, num_threads=args.threads)
+    model = service._model  # same weights, called one query at a time
+    queries = make_queries(args.queries)
+    service.get_query_embedding("warm up")
+
+    print(f"{settings.EMBEDDING_MODEL}, {args.queries} distinct queries\n")
+    for concurrency in args.concurrency:
+        run("direct", lambda q: model.encode([q], normalize_embeddings=True, show_progress_bar=False),
+            queries, concurrency)
+        run("batched", service.get_query_embedding, queries, concurrency)
+    print(f"\n  batcher: {service.stats()['batching']}")
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+HTTP load test for the FastAPI app (auth, chat history and the CRAG query route).
+
+Boots app.main:app under uvicorn on a free local port, against a throwaway SQLite file
+and a stub CRAG service (fixed, configurable answer latency; no Ollama, Qdrant or
+models are loaded, though the AI requirements must be importable). Each virtual
+user logs in as its own staff account and then replays a weighted mix until the
+duration runs out:
+
+  login      POST /auth/login                     (re-login: bcrypt + token issue)
+  sessions   GET  /chat/sessions
+  history    GET  /chat/sessions/{id}/messages    (one of the user's own sessions)
+  ask        POST /crag/query                     (new or existing session; persists a turn)
+
+Reports per-route throughput, error rate and p50/p95/p99/max latency; --out writes JSON.
+
+Usage (from backend/):
+  python benchmarks/bench_http_load.py --users 50 --duration 60
+  python benchmarks/bench_http_load.py --users 20 --mix login=1,sessions=5,history=3,ask=1 --crag-latency-ms 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DEFAULT_MIX = "login=5,sessions=40,history=30,ask=25"
+PASSWORD = "loadtest-password"
+
+
+class StubCRAGService:
+    """Stands in for CRAGService on the query routes: waits `latency_ms`, then returns a canned answer."""
+
+    def __init__(self, latency_ms: float):
+        from app.services.timings import StageTimings
+
+        self.latency_s = latency_ms / 1000
+        self.timings = StageTimings()
+
+    async def agenerate_response(self, query: str, history: list[str] = []) -> dict:
+        with self.timings.measure("synthesize"):
+            await asyncio.sleep(self.latency_s)
+        return {"answer": f"Stub answer to: {query}", "sources": ["handbook.pdf (Page 1) - Score: 0.90"]}
+
+    async def astream_response(self, query: str, history: list[str] = []):
+        result = await self.agenerate_response(query, history)
+        yield {"event": "intent", "intent": "DOMAIN", "search_query": query}
+        yield {"event": "sources", "sources": result["sources"]}
+        yield {"event": "token", "text": result["answer"]}
+        yield {"event": "done", **result}
+
+
+class StubServiceRegistry:
+    def __init__(self, latency_ms: float):
+        self.crag = StubCRAGService(latency_ms)
+
+    def start_warm_up(self) -> None:
+        pass
+
+    def get_crag(self) -> StubCRAGService:
+        return self.crag
+
+    def status(self) -> dict:
+        return {"state": "ready", "ready": True, "timings": self.crag.timings.snapshot()}
+
+    def shutdown(self) -> None:
+        pass
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def boot_server(args):
+    """Starts uvicorn in a background thread; returns (server, base_url)."""
+    # Settings are read at import time, so the environment is prepared before app.* is imported
+    os.environ["SQLITE_PATH"] = os.path.join(tempfile.mkdtemp(prefix="load_test_"), "load.db")
+    os.environ.setdefault("BCRYPT_ROUNDS", str(args.bcrypt_rounds))
+    if not args.keep_login_throttle:
+        # Every virtual user logs in from 127.0.0.1
+        os.environ["LOGIN_MAX_ATTEMPTS_PER_IP"] = "1000000000"
+
+    import uvicorn
+    import app.main
+
+    app.main.ServiceRegistry = lambda: StubServiceRegistry(args.crag_latency_ms)
+
+    port = free_port()
+    server = uvicorn.Server(uvicorn.Config(app.main.app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, name="uvicorn", daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server, f"http://127.0.0.1:{port}"
+
+
+def create_users(count: int) -> list[str]:
+    from app.db.repositories.users import UsersRepository
+    from app.models.schemas import UserCreateRequest
+
+    repo = UsersRepository()
+    usernames = [f"load{i:04d}" for i in range(count)]
+    for username in usernames:
+        repo.create_user(UserCreateRequest(
+            username=username, password=PASSWORD, role="staff", name=f"Load {username}", email=f"{username}@example.com"
+        ))
+    return usernames
+
+
+def parse_mix(spec: str) -> dict[str, float]:
+    mix = {}
+    for part in spec.split(","):
+        name, weight = part.split("=")
+        if name not in ("login", "sessions", "history", "ask"):
+            raise SystemExit(f"Unknown action in --mix: {name}")
+        mix[name] = float(weight)
+    return mix
+
+
+class VirtualUser:
+    def __init__(self, base_url: str, username: str, record, rng: random.Random):
+        self.base_url = base_url
+        self.username = username
+        self.record = record
+        self.rng = rng
+        self.http = requests.Session()
+        self.session_ids: list[int] = []
+
+    def call(self, method: str, route: str, path: str, **kwargs):
+        start = time.perf_counter()
+        try:
+            r = self.http.request(method, self.base_url + path, timeout=60, **kwargs)
+            status = r.status_code
+        except requests.RequestException:
+            r, status = None, 0
+        self.record(route, status, (time.perf_counter() - start) * 1000)
+        return r if status and status < 400 else None
+
+    def login(self) -> None:
+        r = self.call("POST", "POST /auth/login", "/auth/login", json={"username": self.username, "password": PASSWORD})
+        if r is not None:
+            self.http.headers["Authorization"] = f"Bearer {r.json()['access_token']}"
+
+    def sessions(self) -> None:
+        r = self.call("GET", "GET /chat/sessions", "/chat/sessions")
+        if r is not None:
+            self.session_ids = [s["id"] for s in r.json()]
+
+    def history(self) -> None:
+        if not self.session_ids:
+            return self.sessions()
+        session_id = self.rng.choice(self.session_ids)
+        self.call("GET", "GET /chat/sessions/{id}/messages", f"/chat/sessions/{session_id}/messages")
+
+    def ask(self) -> None:
+        # Mostly follow-ups, sometimes a new chat
+        session_id = self.rng.choice(self.session_ids) if self.session_ids and self.rng.random() < 0.7 else None
+        r = self.call(
+            "POST", "POST /crag/query", "/crag/query",
+            json={"question": "How much is the security deposit for a 1-year tenancy?", "session_id": session_id},
+        )
+        if r is not None and session_id is None:
+            self.session_ids.append(r.json()["session_id"])
+
+    def run(self, mix: dict[str, float], deadline: float) -> None:
+        self.login()
+        actions, weights = zip(*mix.items())
+        while time.monotonic() < deadline:
+            getattr(self, self.rng.choices(actions, weights)[0])()
+
+
+def summarize(samples: dict[str, list[tuple[int, float]]], wall_s: float) -> dict:
+    report = {}
+    for route, rows in sorted(samples.items()):
+        latencies = sorted(ms for _, ms in rows)
+        errors = sum(1 for status, _ in rows if status == 0 or status >= 400)
+        report[route] = {
+            "requests": len(rows),
+            "rps": round(len(rows) / wall_s, 2),
+            "error_rate": round(errors / len(rows), 4),
+            "statuses": {str(s): sum(1 for status, _ in rows if status == s) for s in sorted({s for s, _ in rows})},
+            "p50_ms": round(statistics.median(latencies), 2),
+            "p95_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 2),
+            "p99_ms": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))], 2),
+            "max_ms": round(latencies[-1], 2),
+        }
+    return report
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=20, help="Concurrent virtual users (one thread each)")
+    ap.add_argument("--duration", type=float, default=30.0, help="Seconds of load after login")
+    ap.add_argument("--mix", default=DEFAULT_MIX, help="Relative action weights")
+    ap.add_argument("--crag-latency-ms", type=float, default=200.0, help="Stub CRAG answer time")
+    ap.add_argument("--bcrypt-rounds", type=int, default=12, help="Used unless BCRYPT_ROUNDS is set")
+    ap.add_argument("--keep-login-throttle", action="store_true", help="Keep the per-IP login limit")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--out", help="Write the results as JSON")
+    args = ap.parse_args()
+    mix = parse_mix(args.mix)
+
+    server, base_url = boot_server(args)
+    usernames = create_users(args.users)
+    print(f"Serving {base_url}; {len(usernames)} users, mix {args.mix}, {args.duration:.0f}s\n")
+
+    samples: dict[str, list[tuple[int, float]]] = {}
+    lock = threading.Lock()
+
+    def record(route: str, status: int, elapsed_ms: float) -> None:
+        with lock:
+            samples.setdefault(route, []).append((status, elapsed_ms))
+
+    rng = random.Random(args.seed)
+    users = [VirtualUser(base_url, name, record, random.Random(rng.random())) for name in usernames]
+    start = time.perf_counter()
+    deadline = time.monotonic() + args.duration
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for future in [pool.submit(u.run, mix, deadline) for u in users]:
+            future.result()
+    wall_s = time.perf_counter() - start
+
+    server.should_exit = True
+    report = summarize(samples, wall_s)
+    total = sum(r["requests"] for r in report.values())
+    print(f"{'route':<36} {'req':>7} {'rps':>8} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}")
+    for route, r in report.items():
+        print(
+            f"{route:<36} {r['requests']:>7} {r['rps']:>8.1f} {r['error_rate'] * 100:>6.2f} "
+            f"{r['p50_ms']:>9.2f} {r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['max_ms']:>9.2f}"
+        )
+    print(f"\n{total} requests in {wall_s:.1f}s ({total / wall_s:.1f} req/s); latencies in ms")
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"created_at": datetime.now().isoformat(), "config": vars(args), "routes": report}, f, indent=2)
+        print(f"Wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Benchmark keyword, dense and hybrid retrieval over the knowledge_docs table.
+
+Loads datasets/malaysia_tenancy_qa.json into a throwaway database (optionally padded
+with synthetic filler docs to measure latency at scale) and runs the questions in
+datasets/malaysia_tenancy_eval.json, each labelled with the title of the doc that
+answers it. Reports recall@k, MRR and per-query latency for:
+
+  like    the previous search_keyword (OR chain of LIKE '%term%', unranked)
+  bm25    DocsRepository.search_keyword (SQLite FTS5)
+  dense   BGE embeddings, brute-force cosine       (--dense, needs the AI requirements)
+  hybrid  reciprocal rank fusion of dense + bm25    (--dense)
+
+Usage (from backend/):
+  python benchmarks/bench_hybrid_retrieval.py --filler 50000 --dense
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+DATASET = os.path.join(BACKEND_DIR, "datasets", "malaysia_tenancy_qa.json")
+EVAL_SET = os.path.join(BACKEND_DIR, "datasets", "malaysia_tenancy_eval.json")
+TOP_K = 5
+
+
+def legacy_like_search(conn, query: str, limit: int) -> list[str]:
+    terms = [t.strip() for t in query.lower().split() if len(t.strip()) > 2] or [query.lower()]
+    conditions, params = [], []
+    for term in terms:
+        conditions.append("(lower(title) LIKE ? OR lower(content) LIKE ?)")
+        params.extend([f"%{term}%", f"%{term}%"])
+    sql = f"SELECT title FROM knowledge_docs WHERE {' OR '.join(conditions)} LIMIT ?"
+    return [r[0] for r in conn.execute(sql, [*params, limit])]
+
+
+def populate(conn, docs: list[dict], filler: int) -> None:
+    rows = [(d["title"], d["content"], d.get("tags", ""), "2024-01-01") for d in docs]
+    # Filler reuses the corpus vocabulary so it competes with the real docs for matches
+    rng = random.Random(42)
+    vocabulary = " ".join(d["content"] for d in docs).split()
+    rows += [
+        (f"Filler {i}", " ".join(rng.choices(vocabulary, k=40)), "filler", "2024-01-01")
+        for i in range(filler)
+    ]
+    conn.executemany("INSERT INTO knowledge_docs (title,content,tags,created_at) VALUES (?,?,?,?)", rows)
+    conn.commit()
+
+
+def evaluate(name: str, search, questions: list[dict]) -> None:
+    latencies, ranks = [], []
+    for q in questions:
+        start = time.perf_counter()
+        titles = search(q["question"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        ranks.append(titles.index(q["title"]) + 1 if q["title"] in titles else None)
+
+    latencies.sort()
+    recall = {k: sum(1 for r in ranks if r is not None and r <= k) / len(ranks) for k in (1, 3, 5)}
+    mrr = sum(1 / r for r in ranks if r is not None) / len(ranks)
+    print(
+        f"  {name:<7} recall@1={recall[1]:.2f} @3={recall[3]:.2f} @5={recall[5]:.2f}  MRR={mrr:.3f}  "
+        f"p50={statistics.median(latencies):8.3f} ms  p95={latencies[int(len(latencies) * 0.95) - 1]:8.3f} ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--filler", type=int, default=0, help="Synthetic docs added to the corpus")
+    ap.add_argument("--dense", action="store_true", help="Also run dense and hybrid retrieval")
+    args = ap.parse_args()
+
+    with open(DATASET, encoding="utf-8") as f:
+        docs = json.load(f)
+    with open(EVAL_SET, encoding="utf-8") as f:
+        questions = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Point the app's repositories at the throwaway database before importing them
+        os.environ["SQLITE_PATH"] = os.path.join(tmp, "bench.db")
+        from app.db.init_db import ensure_schema
+        from app.db.repositories.docs import DocsRepository
+        from app.db.seed import DEFAULT_DOCS
+        from app.db.sqlite import close_pool, db
+
+        ensure_schema()
+        with db() as conn:
+            corpus = docs + [{"title": t, "content": c, "tags": g} for t, c, g in DEFAULT_DOCS]
+            start = time.perf_counter()
+            populate(conn, corpus, args.filler)
+            print(f"Indexed {len(corpus) + args.filler:,} docs in {time.perf_counter() - start:.1f}s, "
+                  f"{len(questions)} questions\n")
+
+        repo = DocsRepository()
+
+        def like(query: str) -> list[str]:
+            with db() as conn:
+                return legacy_like_search(conn, query, TOP_K)
+
+        def bm25(query: str, limit: int = TOP_K) -> list[str]:
+            return [r["title"] for r in repo.search_keyword(query, limit)]
+
+        evaluate("like", like, questions)
+        evaluate("bm25", bm25, questions)
+
+        if args.dense:
+            import numpy as np
+            from llama_index.embeddings.huggingface import HuggingFaceEmbedding
+
+            from app.core.config import settings
+            from app.services.hybrid_retriever import reciprocal_rank_fusion
+
+            embed_model = HuggingFaceEmbedding(model_name=settings.EMBEDDING_MODEL)
+            with db() as conn:
+                rows = conn.execute("SELECT title, content FROM knowledge_docs ORDER BY id").fetchall()
+            titles = [r["title"] for r in rows]
+            start = time.perf_counter()
+            matrix = np.asarray(
+                embed_model.get_text_embedding_batch([f"{r['title']}\n{r['content']}" for r in rows]),
+                dtype=np.float32,
+            )
+            matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+            print(f"\n  (embedded {len(rows):,} docs in {time.perf_counter() - start:.1f}s)")
+
+            def dense(query: str, limit: int = TOP_K) -> list[str]:
+                vector = np.asarray(embed_model.get_query_embedding(query), dtype=np.float32)
+                scores = matrix @ (vector / np.linalg.norm(vector))
+                return [titles[i] for i in np.argsort(-scores)[:limit]]
+
+            def hybrid(query: str) -> list[str]:
+                # Same candidate depths as the service defaults (dense 15, keyword 10)
+                fused = reciprocal_rank_fusion(
+                    [dense(query, settings.RETRIEVAL_DENSE_TOP_K), bm25(query, settings.RETRIEVAL_KEYWORD_TOP_K)],
+                    key=lambda title: title,
+                    k=settings.RETRIEVAL_RRF_K,
+                )
+                return [title for title, _ in fused[:TOP_K]]
+
+            evaluate("dense", dense, questions)
+            evaluate("hybrid", hybrid, questions)
+
+        close_pool()
+
+
+if __name__ == "__main__":
+    main()
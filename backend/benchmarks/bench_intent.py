@@ -0,0 +1,137 @@
+"""
+Offline accuracy/latency benchmark for intent classification.
+
+Runs datasets/intent_eval.json (queries that are not in the centroid examples)
+through:
+
+  rules      the keyword prefilter alone (undecided counts as wrong)
+  centroid   embedding nearest-centroid alone, always taking the best label
+  local      rules -> centroid when confident; reports how many would go to the LLM
+  pipeline   local + the LLM for the rest (--llm, needs Ollama running)
+
+--sweep tabulates the local stage over a grid of INTENT_MIN_SIMILARITY x
+INTENT_MIN_MARGIN values (accuracy, precision, LLM fallbacks) for re-tuning them
+whenever the embedding model or its query instruction changes.
+
+Usage (from backend/):
+  python benchmarks/bench_intent.py [--llm] [--sweep]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from app.core.config import settings  # noqa: E402
+from app.services.crag_service import CLASSIFY_TEMPLATE, CRAGService, build_llm  # noqa: E402
+from app.services.embedding_service import EmbeddingService  # noqa: E402
+from app.services.intent_classifier import IntentClassifier, load_examples  # noqa: E402
+
+EVAL_SET = os.path.join(BACKEND_DIR, "datasets", "intent_eval.json")
+
+
+def evaluate(name: str, classify, cases: list[dict]) -> None:
+    latencies, errors = [], Counter()
+    correct = undecided = 0
+    for case in cases:
+        start = time.perf_counter()
+        label = classify(case["query"])
+        latencies.append((time.perf_counter() - start) * 1000)
+        if label is None:
+            undecided += 1
+        elif label == case["label"]:
+            correct += 1
+        else:
+            errors[f"{case['label']}->{label}"] += 1
+
+    latencies.sort()
+    decided = len(cases) - undecided
+    print(
+        f"  {name:<9} accuracy={correct / len(cases):.2f}  "
+        f"precision={correct / decided if decided else 0:.2f}  undecided={undecided:<3} "
+        f"p50={statistics.median(latencies):8.2f} ms  p95={latencies[int(len(latencies) * 0.95) - 1]:8.2f} ms"
+    )
+    if errors:
+        print(f"            confusions: {dict(errors.most_common(5))}")
+
+
+def sweep(classifier: IntentClassifier, cases: list[dict]) -> None:
+    """Each query is classified once; the thresholds are then applied to the recorded scores."""
+    scored = [
+        (case["label"], CRAGService._classify_by_rules(case["query"]), *classifier.predict(case["query"]))
+        for case in cases
+    ]
+    print("\n  min_sim  min_margin  accuracy  precision  llm_fallbacks")
+    for min_similarity in (0.5, 0.55, 0.6, 0.65, 0.7, 0.75, 0.8):
+        for min_margin in (0.0, 0.01, 0.02, 0.03, 0.05):
+            correct = undecided = 0
+            for expected, rule_label, label, similarity, margin in scored:
+                if rule_label is None:
+                    confident = similarity >= min_similarity and margin >= min_margin
+                    rule_label = label if confident else None
+                if rule_label is None:
+                    undecided += 1
+                elif rule_label == expected:
+                    correct += 1
+            decided = len(scored) - undecided
+            print(
+                f"  {min_similarity:7.2f}  {min_margin:10.2f}  {correct / len(scored):8.2f}  "
+                f"{correct / decided if decided else 0:9.2f}  {undecided:13}"
+            )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--llm", action="store_true", help="Send undecided queries to the LLM")
+    ap.add_argument("--sweep", action="store_true", help="Tabulate the local stage over threshold values")
+    args = ap.parse_args()
+
+    with open(EVAL_SET, encoding="utf-8") as f:
+        cases = json.load(f)
+
+    # Cache off: every query is embedded, as on a first visit
+    embed_model = EmbeddingService(cache_size=0)
+    start = time.perf_counter()
+    classifier = IntentClassifier(
+        embed_query=embed_model.get_query_embedding,
+        embed_batch=embed_model.get_query_embedding_batch,
+        examples=load_examples(),
+        min_similarity=settings.INTENT_MIN_SIMILARITY,
+        min_margin=settings.INTENT_MIN_MARGIN,
+    )
+    print(f"Built centroids in {(time.perf_counter() - start) * 1000:.0f} ms; {len(cases)} eval queries\n")
+
+    def local(query: str) -> str | None:
+        return CRAGService._classify_by_rules(query) or classifier.classify(query)
+
+    evaluate("rules", CRAGService._classify_by_rules, cases)
+    evaluate("centroid", lambda q: classifier.predict(q)[0], cases)
+    evaluate("local", local, cases)
+
+    if args.llm:
+        llm = build_llm()
+
+        def pipeline(query: str) -> str:
+            label = local(query)
+            if label is not None:
+                return label
+            response = llm.complete(CLASSIFY_TEMPLATE.format(query_str=query))
+            return CRAGService._parse_category(response.text)
+
+        evaluate("pipeline", pipeline, cases)
+
+    if args.sweep:
+        sweep(classifier, cases)
+
+    print(f"\n  {classifier.stats()}")
+    embed_model.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark Qdrant over REST vs gRPC for the calls the app makes.
+
+For each transport a fresh client loads the same points into a scratch collection
+(384-d vectors plus a chunk-sized text payload, like ingested documents) and times:
+
+  upsert        bulk ingestion in --batch sized requests (points/s)
+  search        one query_points call per query, payload included (as retrieval does)
+  batch search  query_batch_points with --search-batch queries per request (per-query cost)
+
+The gRPC client uses the same channel options as the app (keepalive, retry policy),
+see app.services.vector_store.grpc_options.
+
+Usage (from backend/):
+  docker compose up -d qdrant
+  python benchmarks/bench_qdrant_transport.py --points 20000 --queries 500
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client import QdrantClient  # noqa: E402
+from qdrant_client.http import models  # noqa: E402
+
+from app.services.vector_store import grpc_options  # noqa: E402
+
+DIM = 384
+COLLECTION = "bench_qdrant_transport"
+CHUNK_TEXT = "The tenant shall pay a security deposit equal to two months' rent. " * 8  # ~550 chars
+
+
+def random_vectors(n: int, seed: int) -> np.ndarray:
+    vectors = np.random.default_rng(seed).normal(size=(n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def build_client(transport: str, args) -> QdrantClient:
+    if transport == "grpc":
+        return QdrantClient(
+            url=args.url, prefer_grpc=True, grpc_port=args.grpc_port,
+            grpc_options=grpc_options(retries=2), timeout=args.timeout,
+        )
+    return QdrantClient(url=args.url, timeout=args.timeout)
+
+
+def bench_upsert(client: QdrantClient, vectors: np.ndarray, batch: int) -> float:
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE),
+    )
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), batch):
+        chunk = vectors[offset:offset + batch]
+        client.upsert(
+            collection_name=COLLECTION,
+            points=models.Batch(
+                ids=list(range(offset, offset + len(chunk))),
+                vectors=chunk.tolist(),
+                payloads=[{"file_name": f"doc{i % 100}.pdf", "text": CHUNK_TEXT} for i in range(len(chunk))],
+            ),
+            wait=True,
+        )
+    return time.perf_counter() - start
+
+
+def bench_search(client: QdrantClient, queries: np.ndarray, k: int) -> list[float]:
+    latencies = []
+    for q in queries:
+        start = time.perf_counter()
+        client.query_points(collection_name=COLLECTION, query=q.tolist(), limit=k, with_payload=True)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def bench_batch_search(client: QdrantClient, queries: np.ndarray, k: int, size: int) -> float:
+    """Milliseconds per query when `size` queries share one request."""
+    start = time.perf_counter()
+    for offset in range(0, len(queries), size):
+        client.query_batch_points(
+            collection_name=COLLECTION,
+            requests=[
+                models.QueryRequest(query=q.tolist(), limit=k, with_payload=True)
+                for q in queries[offset:offset + size]
+            ],
+        )
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--url", default="http://localhost:6333")
+    ap.add_argument("--grpc-port", type=int, default=6334)
+    ap.add_argument("--timeout", type=int, default=30)
+    ap.add_argument("--points", type=int, default=20_000)
+    ap.add_argument("--batch", type=int, default=256, help="Points per upsert request")
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("--search-batch", type=int, default=16, help="Queries per query_batch_points request")
+    ap.add_argument("--k", type=int, default=15, help="Results per query (RETRIEVAL_DENSE_TOP_K)")
+    args = ap.parse_args()
+
+    vectors = random_vectors(args.points, seed=42)
+    queries = random_vectors(args.queries, seed=7)
+    print(f"{args.points:,} points (+{len(CHUNK_TEXT)}-char payload), {args.queries} queries, k={args.k}\n")
+
+    for transport in ("rest", "grpc"):
+        client = build_client(transport, args)
+        upsert_s = bench_upsert(client, vectors, args.batch)
+        # First call after connecting pays for channel setup; keep it out of the percentiles
+        bench_search(client, queries[:5], args.k)
+        latencies = sorted(bench_search(client, queries, args.k))
+        per_query = bench_batch_search(client, queries, args.k, args.search_batch)
+        print(
+            f"  {transport:<5} upsert {args.points / upsert_s:9.0f} points/s   "
+            f"search p50={statistics.median(latencies):6.2f} ms  p95={latencies[int(len(latencies) * 0.95) - 1]:6.2f} ms   "
+            f"batch({args.search_batch}) {per_query:6.2f} ms/query"
+        )
+        client.delete_collection(COLLECTION)
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
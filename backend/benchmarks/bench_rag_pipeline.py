@@ -0,0 +1,307 @@
+"""
+Benchmark the whole CRAG pipeline offline (no Ollama, no Qdrant server).
+
+CRAGService is built with stand-ins injected through its constructor:
+  llm        FakeLLM: deterministic answers with a configurable per-call and per-token latency
+  qdrant     QdrantClient(":memory:") with seed.DEFAULT_DOCS plus
+             datasets/malaysia_tenancy_qa.json ingested as one chunk per doc
+  embedding  EmbeddingService(--embed-model), or --hash-embeddings for a model-free hashed bag of words
+  reranker   AdaptiveReranker, or --no-rerank to keep the dense order
+
+The labelled questions in datasets/malaysia_tenancy_eval.json are sent through
+generate_response by N concurrent clients (threads) for each --concurrency level,
+reporting p50/p95/p99 latency, queries/sec and the per-stage breakdown. Retrieval
+quality (recall@k, MRR on the document that answers each question) is measured once;
+questions whose document is not in the corpus are skipped and counted.
+--out writes everything as JSON so runs can be diffed between releases.
+
+Usage (from backend/):
+  python benchmarks/bench_rag_pipeline.py --concurrency 1,4,8 --llm-latency-ms 200 --out bench_rag.json
+  python benchmarks/bench_rag_pipeline.py --hash-embeddings --no-rerank   # no model downloads
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Chunks and the keyword index go to a throwaway database, never the app's
+WORK_DIR = tempfile.mkdtemp(prefix="bench_rag_")
+os.environ["SQLITE_PATH"] = os.path.join(WORK_DIR, "bench.db")
+
+import numpy as np  # noqa: E402
+from llama_index.core.base.embeddings.base import BaseEmbedding  # noqa: E402
+from llama_index.core.llms import CompletionResponse, CompletionResponseGen, CustomLLM, LLMMetadata  # noqa: E402
+from llama_index.core.llms.callbacks import llm_completion_callback  # noqa: E402
+from llama_index.core.schema import TextNode  # noqa: E402
+from qdrant_client import QdrantClient  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.db.init_db import ensure_schema  # noqa: E402
+from app.db.repositories.documents import DocumentsRepository  # noqa: E402
+from app.db.seed import DEFAULT_DOCS, dataset_docs  # noqa: E402
+from app.services.crag_service import CRAGService  # noqa: E402
+from app.services.ingestion import POINT_ID_NAMESPACE, chunk_sha256  # noqa: E402
+from app.services.timings import StageTimings  # noqa: E402
+from app.services.vector_store import VectorService  # noqa: E402
+
+EVAL_SET = os.path.join(BACKEND_DIR, "datasets", "malaysia_tenancy_eval.json")
+RECALL_KS = (1, 3, 5)
+
+
+class FakeLLM(CustomLLM):
+    """Deterministic Ollama stand-in; sleeps like a model would (time.sleep releases the GIL, as a socket wait does)."""
+
+    latency_ms: float = 50.0
+    ms_per_token: float = 0.0
+    answer_tokens: int = 40
+
+    @property
+    def metadata(self) -> LLMMetadata:
+        return LLMMetadata(context_window=2048, num_output=512, model_name="fake-llm")
+
+    def _answer(self, prompt: str) -> str:
+        if "Answer ONLY with the Category Name" in prompt:
+            return "DOMAIN"
+        if "Rewritten Question:" in prompt:
+            match = re.search(r"Follow-up: (.*)\n", prompt)
+            return match.group(1) if match else ""
+        # QA prompt: echo the start of the retrieved context
+        context = prompt.split("---------------------")[1] if "---------------------" in prompt else prompt
+        return " ".join(context.split()[: self.answer_tokens])
+
+    def _sleep(self, text: str) -> None:
+        time.sleep((self.latency_ms + self.ms_per_token * len(text.split())) / 1000)
+
+    @llm_completion_callback()
+    def complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponse:
+        text = self._answer(prompt)
+        self._sleep(text)
+        return CompletionResponse(text=text)
+
+    @llm_completion_callback()
+    def stream_complete(self, prompt: str, formatted: bool = False, **kwargs: Any) -> CompletionResponseGen:
+        text = self._answer(prompt)
+        time.sleep(self.latency_ms / 1000)
+        so_far = ""
+        for i, token in enumerate(text.split()):
+            time.sleep(self.ms_per_token / 1000)
+            delta = token if i == 0 else f" {token}"
+            so_far += delta
+            yield CompletionResponse(text=so_far, delta=delta)
+
+
+class HashEmbedding(BaseEmbedding):
+    """Model-free embedding: L2-normalised hashed bag of lower-cased words (same vector size as BGE-small)."""
+
+    dim: int = 384
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "HashEmbedding"
+
+    def _embed(self, text: str) -> list[float]:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            digest = hashlib.md5(word.encode("utf-8")).digest()
+            vector[int.from_bytes(digest[:4], "little") % self.dim] += 1.0 if digest[4] & 1 else -1.0
+        norm = np.linalg.norm(vector)
+        return (vector / norm if norm else vector).tolist()
+
+    def _get_query_embedding(self, query: str) -> list[float]:
+        return self._embed(query)
+
+    async def _aget_query_embedding(self, query: str) -> list[float]:
+        return self._embed(query)
+
+    def _get_text_embedding(self, text: str) -> list[float]:
+        return self._embed(text)
+
+
+class PassthroughReranker:
+    """Keeps the dense (cosine) order, like AdaptiveReranker's skip path."""
+
+    def __init__(self, top_n: int):
+        self.top_n = top_n
+
+    def rerank(self, query: str, nodes: list, dense_nodes: list | None = None) -> list:
+        return (nodes if dense_nodes is None else dense_nodes)[: self.top_n]
+
+    def warm_up(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {"model": "passthrough"}
+
+
+def ingest_corpus(vector_service: VectorService, docs: list[dict]) -> int:
+    """One chunk per knowledge doc, file_name = doc title; mirrors what IngestionManager stores."""
+    nodes = []
+    for doc in docs:
+        node = TextNode(text=doc["content"], metadata={"file_name": doc["title"], "page_label": "1"})
+        chunk_hash = chunk_sha256(node)
+        node.id_ = str(uuid.uuid5(POINT_ID_NAMESPACE, f"{doc['title']}:{chunk_hash}"))
+        nodes.append((node, chunk_hash))
+
+    embeddings = vector_service.embed_model.get_text_embedding_batch([n.get_content() for n, _ in nodes])
+    for (node, _), embedding in zip(nodes, embeddings):
+        node.embedding = embedding
+    vector_service.upsert_nodes([n for n, _ in nodes])
+
+    documents = DocumentsRepository()
+    for node, chunk_hash in nodes:
+        text = node.get_content()
+        documents.save_document(
+            node.metadata["file_name"], chunk_hash, len(text), 1, {chunk_hash: (node.id_, "1", text)}
+        )
+    return len(nodes)
+
+
+def percentile(samples: list[float], q: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def measure_recall(service: CRAGService, questions: list[dict]) -> dict:
+    ranks = []
+    for q in questions:
+        files = []
+        for node in service._retrieve(q["question"]):
+            name = node.metadata.get("file_name")
+            if name not in files:
+                files.append(name)
+        ranks.append(files.index(q["title"]) + 1 if q["title"] in files else None)
+    found = [r for r in ranks if r is not None]
+    result = {f"recall@{k}": round(sum(1 for r in found if r <= k) / len(ranks), 3) for k in RECALL_KS}
+    result["mrr"] = round(sum(1 / r for r in found) / len(ranks), 3)
+    return result
+
+
+def run_level(service: CRAGService, questions: list[str], concurrency: int) -> dict:
+    service.timings = StageTimings()
+    latencies, low_confidence = [], 0
+
+    def one(question: str) -> tuple[float, dict]:
+        start = time.perf_counter()
+        result = service.generate_response(question)
+        return (time.perf_counter() - start) * 1000, result
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed_ms, result in pool.map(one, questions):
+            latencies.append(elapsed_ms)
+            low_confidence += result["answer"] == service.LOW_CONFIDENCE_ANSWER
+    wall_s = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "queries": len(questions),
+        "qps": round(len(questions) / wall_s, 2),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "low_confidence": low_confidence,
+        "stages": service.timings.snapshot(),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--concurrency", default="1,4,8", help="Comma-separated client counts")
+    ap.add_argument("--rounds", type=int, default=3, help="Passes over the eval questions per level")
+    ap.add_argument("--llm-latency-ms", type=float, default=50.0, help="Fake LLM time per call")
+    ap.add_argument("--llm-ms-per-token", type=float, default=0.0, help="Fake LLM time per generated token")
+    ap.add_argument("--embed-model", default=settings.EMBEDDING_MODEL)
+    ap.add_argument("--hash-embeddings", action="store_true", help="Use the model-free hashed embedding")
+    ap.add_argument("--no-rerank", action="store_true", help="Skip the cross-encoder")
+    ap.add_argument("--no-hybrid", action="store_true", help="Dense retrieval only")
+    ap.add_argument("--semantic-cache", action="store_true", help="Leave the answer cache on (repeats become hits)")
+    ap.add_argument("--out", help="Write the results as JSON")
+    args = ap.parse_args()
+
+    settings.SEMANTIC_CACHE_ENABLED = args.semantic_cache
+    settings.HYBRID_RETRIEVAL_ENABLED = not args.no_hybrid
+    ensure_schema()
+
+    # Same corpus as bench_hybrid_retrieval (and the knowledge base seeded with SEED_DATASET_DOCS=true)
+    docs = [{"title": t, "content": c} for t, c, _ in DEFAULT_DOCS + dataset_docs()]
+    with open(EVAL_SET, encoding="utf-8") as f:
+        eval_set = json.load(f)
+    titles = {d["title"] for d in docs}
+    skipped = sum(1 for q in eval_set if q["title"] not in titles)
+    eval_set = [q for q in eval_set if q["title"] in titles]
+
+    if args.hash_embeddings:
+        embed_model = HashEmbedding()
+    else:
+        from app.services.embedding_service import EmbeddingService
+        embed_model = EmbeddingService(model_name=args.embed_model)
+    if args.no_rerank:
+        reranker = PassthroughReranker(settings.RERANK_TOP_N)
+    else:
+        from app.services.reranker import AdaptiveReranker
+        reranker = AdaptiveReranker()
+
+    vector_service = VectorService(client=QdrantClient(":memory:"), embed_model=embed_model)
+    chunks = ingest_corpus(vector_service, docs)
+    service = CRAGService(
+        llm=FakeLLM(latency_ms=args.llm_latency_ms, ms_per_token=args.llm_ms_per_token),
+        vector_service=vector_service,
+        reranker=reranker,
+    )
+    service.warm_up()
+    print(f"\nIngested {chunks} chunks; {len(eval_set)} labelled questions ({skipped} skipped, document not in corpus)\n")
+
+    quality = measure_recall(service, eval_set)
+    print("Retrieval: " + "  ".join(f"{k}={v:.3f}" for k, v in quality.items()) + "\n")
+
+    questions = [q["question"] for q in eval_set] * args.rounds
+    levels = []
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        level = run_level(service, questions, concurrency)
+        levels.append(level)
+        print(
+            f"  clients={concurrency:<3} qps={level['qps']:8.2f}  p50={level['p50_ms']:9.2f} ms  "
+            f"p95={level['p95_ms']:9.2f} ms  p99={level['p99_ms']:9.2f} ms  low_conf={level['low_confidence']}"
+        )
+        for stage, s in level["stages"].items():
+            print(f"      {stage:<13} n={s['count']:<5} p50={s['p50_ms']:9.2f} ms  p95={s['p95_ms']:9.2f} ms")
+
+    service.ingestion.shutdown()
+    reranker.close()
+
+    if args.out:
+        report = {
+            "created_at": datetime.now().isoformat(),
+            "config": {
+                **vars(args),
+                "embed_model": "hash" if args.hash_embeddings else args.embed_model,
+                "reranker": "passthrough" if args.no_rerank else settings.RERANKER_MODEL,
+            },
+            "corpus_chunks": chunks,
+            "questions_skipped": skipped,
+            "retrieval": quality,
+            "levels": levels,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
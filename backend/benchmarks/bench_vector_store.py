@@ -0,0 +1,186 @@
+"""
+Benchmark Qdrant collection layouts: memory footprint, query latency and recall.
+
+Loads N synthetic 384-d embeddings (clustered like real sentence embeddings, or
+--vectors file.npy) into one collection per layout, waits for indexing, then runs
+the same queries with each search-time setting. Recall@k is measured against exact
+(brute-force) search, so the cost of quantization and a smaller hnsw_ef is visible.
+
+Layouts (server mode):
+  float32          originals and HNSW graph in RAM (the previous default)
+  float32-disk     originals and graph memory-mapped from disk
+  int8             scalar int8 quantization in RAM, float32 originals in RAM for rescoring
+  int8-disk        int8 in RAM, originals on disk (rescoring reads them via mmap)
+  --path DIR runs embedded Qdrant instead (single layout, exact search, no server)
+
+Memory is reported as the layout's estimated resident size plus, when available,
+the server's resident bytes from /metrics (or this process's RSS in embedded mode).
+
+Usage (from backend/):
+  python benchmarks/bench_vector_store.py --points 100000 --url http://localhost:6333
+  python benchmarks/bench_vector_store.py --points 100000 --path /tmp/qdrant-bench
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qdrant_client import QdrantClient  # noqa: E402
+from qdrant_client.http import models  # noqa: E402
+
+DIM = 384
+COLLECTION = "bench_vector_store"
+INT8 = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+)
+LAYOUTS = {
+    "float32": {"on_disk": False, "quantization": None},
+    "float32-disk": {"on_disk": True, "quantization": None},
+    "int8": {"on_disk": False, "quantization": INT8},
+    "int8-disk": {"on_disk": True, "quantization": INT8},
+}
+
+
+def synthetic_vectors(n: int, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(n // 500, 8), DIM)).astype(np.float32)
+    vectors = centers[rng.integers(len(centers), size=n)] + 0.35 * rng.normal(size=(n, DIM)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def estimate_ram_mb(n: int, layout: dict, m: int) -> float:
+    originals = 0 if layout["on_disk"] else n * DIM * 4
+    quantized = n * DIM if layout["quantization"] is not None else 0
+    # Layer-0 links dominate the graph: 2*m neighbours of 4 bytes per point
+    graph = 0 if layout["on_disk"] else n * 2 * m * 4
+    return (originals + quantized + graph) / 2**20
+
+
+def measured_ram_mb(url: str | None) -> float | None:
+    if url is None:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+        return None
+    try:
+        for line in requests.get(f"{url}/metrics", timeout=5).text.splitlines():
+            if line.startswith("memory_resident_bytes"):
+                return float(line.split()[-1]) / 2**20
+    except requests.RequestException:
+        pass
+    return None
+
+
+def load(client: QdrantClient, vectors: np.ndarray, layout: dict, args) -> float:
+    if client.collection_exists(COLLECTION):
+        client.delete_collection(COLLECTION)
+    client.create_collection(
+        collection_name=COLLECTION,
+        vectors_config=models.VectorParams(size=DIM, distance=models.Distance.COSINE, on_disk=layout["on_disk"]),
+        hnsw_config=models.HnswConfigDiff(m=args.m, ef_construct=args.ef_construct, on_disk=layout["on_disk"]),
+        quantization_config=layout["quantization"],
+    )
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), args.batch):
+        batch = vectors[offset:offset + args.batch]
+        client.upsert(
+            collection_name=COLLECTION,
+            points=models.Batch(ids=list(range(offset, offset + len(batch))), vectors=batch.tolist()),
+            wait=True,
+        )
+    # Indexing and quantization run in the background optimizer
+    while client.get_collection(COLLECTION).status != models.CollectionStatus.GREEN:
+        time.sleep(0.5)
+    return time.perf_counter() - start
+
+
+def run_queries(client: QdrantClient, queries: np.ndarray, k: int, params: models.SearchParams | None) -> tuple[list, list]:
+    results, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        points = client.query_points(
+            collection_name=COLLECTION, query=q.tolist(), limit=k, search_params=params, with_payload=False
+        ).points
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append({p.id for p in points})
+    return results, latencies
+
+
+def report(label: str, results: list, truth: list, latencies: list, k: int) -> None:
+    recall = statistics.mean(len(r & t) / k for r, t in zip(results, truth))
+    latencies.sort()
+    print(
+        f"    {label:<22} recall@{k}={recall:.3f}  p50={statistics.median(latencies):7.2f} ms  "
+        f"p95={latencies[int(len(latencies) * 0.95) - 1]:7.2f} ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--points", type=int, default=100_000)
+    ap.add_argument("--queries", type=int, default=200)
+    ap.add_argument("--k", type=int, default=10)
+    ap.add_argument("--m", type=int, default=16)
+    ap.add_argument("--ef-construct", type=int, default=100)
+    ap.add_argument("--ef", default="32,64,128", help="Search-time hnsw_ef values to compare")
+    ap.add_argument("--batch", type=int, default=1000)
+    ap.add_argument("--layouts", default=",".join(LAYOUTS))
+    ap.add_argument("--vectors", help=".npy file of real embeddings (N x 384) instead of synthetic ones")
+    ap.add_argument("--url", default="http://localhost:6333")
+    ap.add_argument("--path", help="Run embedded Qdrant in this directory instead of a server")
+    args = ap.parse_args()
+
+    vectors = np.load(args.vectors).astype(np.float32) if args.vectors else synthetic_vectors(args.points)
+    rng = np.random.default_rng(7)
+    queries = vectors[rng.integers(len(vectors), size=args.queries)] + 0.05 * rng.normal(size=(args.queries, DIM))
+    queries = (queries / np.linalg.norm(queries, axis=1, keepdims=True)).astype(np.float32)
+
+    url = None if args.path else args.url
+    client = QdrantClient(path=args.path) if args.path else QdrantClient(url=args.url)
+    layouts = ["embedded"] if args.path else args.layouts.split(",")
+    baseline_mb = measured_ram_mb(url)
+    print(f"{len(vectors):,} vectors x {DIM}, {args.queries} queries, m={args.m} ef_construct={args.ef_construct}\n")
+
+    truth = None
+    for name in layouts:
+        layout = LAYOUTS["float32"] if args.path else LAYOUTS[name]
+        load_s = load(client, vectors, layout, args)
+        measured = measured_ram_mb(url)
+        delta = f"{measured - baseline_mb:8.1f} MB" if measured is not None and baseline_mb is not None else "     n/a"
+        print(
+            f"  {name:<13} loaded in {load_s:6.1f}s  est. RAM={estimate_ram_mb(len(vectors), layout, args.m):8.1f} MB  "
+            f"measured={delta}"
+        )
+
+        if truth is None:
+            truth, _ = run_queries(client, queries, args.k, models.SearchParams(exact=True))
+        if args.path:
+            results, latencies = run_queries(client, queries, args.k, None)
+            report("exact (embedded)", results, truth, latencies, args.k)
+            continue
+
+        for ef in (int(e) for e in args.ef.split(",")):
+            variants = [(f"hnsw_ef={ef}", models.SearchParams(hnsw_ef=ef))]
+            if layout["quantization"] is not None:
+                quant = models.QuantizationSearchParams
+                variants = [
+                    (f"hnsw_ef={ef} rescore", models.SearchParams(hnsw_ef=ef, quantization=quant(rescore=True, oversampling=2.0))),
+                    (f"hnsw_ef={ef} no-rescore", models.SearchParams(hnsw_ef=ef, quantization=quant(rescore=False))),
+                ]
+            for label, params in variants:
+                results, latencies = run_queries(client, queries, args.k, params)
+                report(label, results, truth, latencies, args.k)
+
+    client.delete_collection(COLLECTION)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import os
 sys.path.append(os.path.join(os.getcwd()))
 
 import requests
+from app.db.init_db import ensure_schema
 from app.services.vector_store import VectorService
 from app.core.config import settings
 
@@ -23,6 +24,7 @@ def check_ollama():
 def check_qdrant_and_content():
     print(f"\n[2] Checking Qdrant & Vector Store Content ({settings.QDRANT_URL})...")
     try:
+        ensure_schema()  # the file list comes from the SQLite document catalog
         vs = VectorService()
         files = vs.list_ingested_files()
         print(f" - Connection Successful.")
@@ -0,0 +1,68 @@
+"""
+Benchmark the data fetching behind one Chat page render, with and without the pooled client.
+
+"before" calls the module-level requests functions (a new TCP connection per call, as
+ApiClient did); "after" uses the shared keep-alive session from mvvm.services.http_session.
+Each render performs the Chat page's uncached requests: the session list and the
+latest page of the most recent session's messages.
+
+Needs a running backend. Usage (from frontend/):
+  python benchmarks/bench_api_client.py --base-url http://127.0.0.1:8000 --username admin --password admin123
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mvvm.services.api_client import ApiClient  # noqa: E402
+from mvvm.services.http_session import build_session  # noqa: E402
+
+
+def render(api: ApiClient) -> None:
+    sessions = api.get("/chat/sessions", {"limit": 50})
+    if sessions:
+        api.get(f"/chat/sessions/{sessions[0]['id']}/messages", {"limit": 50})
+
+
+def run(label: str, api: ApiClient, renders: int) -> None:
+    render(api)  # warm-up
+    samples = []
+    for _ in range(renders):
+        start = time.perf_counter()
+        render(api)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    print(
+        f"  {label:<7} p50={statistics.median(samples):7.2f} ms  "
+        f"p95={samples[int(len(samples) * 0.95) - 1]:7.2f} ms  mean={statistics.fmean(samples):7.2f} ms"
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--base-url", default=os.getenv("API_BASE_URL", "http://127.0.0.1:8000"))
+    ap.add_argument("--username", default="admin")
+    ap.add_argument("--password", default="admin123")
+    ap.add_argument("--renders", type=int, default=200)
+    args = ap.parse_args()
+
+    login = requests.post(
+        f"{args.base_url}/auth/login", json={"username": args.username, "password": args.password}, timeout=30
+    )
+    login.raise_for_status()
+    token = login.json()["access_token"]
+
+    print(f"{args.renders} Chat page renders against {args.base_url}\n")
+    # The requests module exposes get/post/... with the same signature as a Session
+    run("before", ApiClient(base_url=args.base_url, token=token, session=requests), args.renders)
+    run("after", ApiClient(base_url=args.base_url, token=token, session=build_session()), args.renders)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,44 @@
 from __future__ import annotations
 
+import json
 import os
 import requests
-from typing import Any
+from typing import Any, Iterator, MutableMapping
+from urllib.parse import urlencode
+
+from mvvm.services.http_session import get_http_session
 
 
 class ApiClient:
-    def __init__(self, base_url: str | None = None, token: str | None = None, timeout_s: int = 30):
+    CONNECT_TIMEOUT_S = 3.05
+
+    # Read timeouts by path prefix (longest match wins); LLM-backed calls may take minutes on CPU
+    READ_TIMEOUTS_S = {
+        "/crag/query": 300,
+        "/crag/ingest": 120,
+        "/crag/reload": 300,
+        "/auth": 15,
+        "/users": 10,
+        "/chat": 15,
+    }
+
+    def __init__(
+        self,
+        base_url: str | None = None,
+        token: str | None = None,
+        timeout_s: int = 30,
+        session: requests.Session | None = None,
+    ):
         self.base_url = (base_url or os.getenv("API_BASE_URL", "http://localhost:8000")).rstrip("/")
         self.token = token
         self.timeout_s = timeout_s
+        # Pooled keep-alive connections shared across reruns (see http_session)
+        self.http = session or get_http_session()
+
+    def _timeout(self, path: str) -> tuple[float, float]:
+        matches = [prefix for prefix in self.READ_TIMEOUTS_S if path.startswith(prefix)]
+        read = self.READ_TIMEOUTS_S[max(matches, key=len)] if matches else self.timeout_s
+        return self.CONNECT_TIMEOUT_S, read
 
     def _headers(self, content_type: str | None = "application/json") -> dict[str, str]:
         headers = {}
@@ -19,33 +48,81 @@ class ApiClient:
             headers["Authorization"] = f"Bearer {self.token}"
         return headers
 
-    def get(self, path: str) -> Any:
-        r = requests.get(self.base_url + path, headers=self._headers(), timeout=self.timeout_s)
+    def get(self, path: str, params: dict | None = None) -> Any:
+        r = self.http.get(self.base_url + path, params=params, headers=self._headers(), timeout=self._timeout(path))
         self._raise(r)
         return r.json()
 
+    def get_conditional(self, path: str, cache: MutableMapping[str, dict], params: dict | None = None) -> Any:
+        """
+        GET with If-None-Match: `cache` keeps {"etag", "data"} per URL, and a 304 reply
+        returns the cached data without a body being sent.
+        """
+        query = {k: v for k, v in (params or {}).items() if v is not None}
+        key = path + ("?" + urlencode(sorted(query.items())) if query else "")
+        headers = self._headers()
+        cached = cache.get(key)
+        if cached:
+            headers["If-None-Match"] = cached["etag"]
+
+        r = self.http.get(self.base_url + path, params=query, headers=headers, timeout=self._timeout(path))
+        if r.status_code == 304 and cached:
+            return cached["data"]
+        self._raise(r)
+        data = r.json()
+        etag = r.headers.get("ETag")
+        if etag:
+            cache[key] = {"etag": etag, "data": data}
+        return data
+
     def post(self, path: str, payload: dict) -> Any:
-        r = requests.post(self.base_url + path, json=payload, headers=self._headers(), timeout=self.timeout_s)
+        r = self.http.post(self.base_url + path, json=payload, headers=self._headers(), timeout=self._timeout(path))
         self._raise(r)
         return r.json()
 
     def put(self, path: str, payload: dict) -> Any:
-        r = requests.put(self.base_url + path, json=payload, headers=self._headers(), timeout=self.timeout_s)
+        r = self.http.put(self.base_url + path, json=payload, headers=self._headers(), timeout=self._timeout(path))
         self._raise(r)
         return r.json()
 
     def delete(self, path: str) -> Any:
-        r = requests.delete(self.base_url + path, headers=self._headers(), timeout=self.timeout_s)
+        r = self.http.delete(self.base_url + path, headers=self._headers(), timeout=self._timeout(path))
         self._raise(r)
         return r.json() if r.text else {"status": "ok"}
 
     def post_file(self, path: str, files: dict) -> Any:
         # For file uploads, we let requests library set the Content-Type boundary
         headers = self._headers(content_type=None)
-        r = requests.post(self.base_url + path, files=files, headers=headers, timeout=self.timeout_s)
+        r = self.http.post(self.base_url + path, files=files, headers=headers, timeout=self._timeout(path))
         self._raise(r)
         return r.json()
 
+    def stream_events(self, path: str, payload: dict) -> Iterator[dict]:
+        """POST and parse a Server-Sent Events response, yielding {"event": ..., **data} per message."""
+        headers = self._headers()
+        headers["Accept"] = "text/event-stream"
+        # A compressing proxy would buffer the stream; ask for it uncompressed
+        headers["Accept-Encoding"] = "identity"
+        with self.http.post(
+            self.base_url + path, json=payload, headers=headers, timeout=self._timeout(path), stream=True
+        ) as r:
+            self._raise(r)
+            event_name, data_lines = "message", []
+            for line in r.iter_lines(decode_unicode=True):
+                if line:
+                    field, _, value = line.partition(":")
+                    value = value[1:] if value.startswith(" ") else value
+                    if field == "event":
+                        event_name = value
+                    elif field == "data":
+                        data_lines.append(value)
+                    continue
+                # Blank line terminates one event
+                if data_lines:
+                    data = json.loads("\n".join(data_lines))
+                    yield {"event": event_name, **data}
+                event_name, data_lines = "message", []
+
     @staticmethod
     def _raise(r: requests.Response) -> None:
         if r.status_code >= 400:
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import os
+
+import requests
+import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+def build_session(pool_maxsize: int = 20, retries: int = 2) -> requests.Session:
+    """
+    requests.Session with a keep-alive connection pool to the backend.
+    Only idempotent methods are retried (connection errors and 502/503/504), so a
+    query or upload is never sent twice. gzip responses are decoded by requests.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_maxsize, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """One pooled session per Streamlit server process, shared across reruns and users (no cookies are used)."""
+    return build_session(
+        pool_maxsize=int(os.getenv("API_POOL_MAXSIZE", "20")),
+        retries=int(os.getenv("API_RETRIES", "2")),
+    )
@@ -0,0 +1,35 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Hashable
+
+
+class TTLCache:
+    """
+    Read-through cache over a plain dict that outlives Streamlit reruns (e.g. one kept in
+    st.session_state). Entries expire after `ttl_s`; viewmodels call invalidate() after
+    every mutation so a change made in this session shows up on the next rerun.
+    """
+
+    def __init__(self, store: dict, ttl_s: float):
+        self.store = store
+        self.ttl_s = ttl_s
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], refresh: bool = False) -> Any:
+        hit = self.store.get(key)
+        if hit is not None and not refresh and time.monotonic() < hit[1]:
+            return hit[0]
+        value = loader()
+        self.store[key] = (value, time.monotonic() + self.ttl_s)
+        return value
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """Drops the given keys (tuple keys match on their first element), or everything when none are given."""
+        if not keys:
+            self.store.clear()
+            return
+        for cached in list(self.store):
+            name = cached[0] if isinstance(cached, tuple) else cached
+            if name in keys:
+                del self.store[cached]
+
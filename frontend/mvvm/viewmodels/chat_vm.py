@@ -1,37 +1,107 @@
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from mvvm.services.api_client import ApiClient
+from mvvm.services.ttl_cache import TTLCache
 from mvvm.models import ChatSession, ChatMessage, ChatqueryResponse
 
 class ChatViewModel:
-    def __init__(self, api: ApiClient):
+    """
+    `cache` should outlive a Streamlit rerun (e.g. a dict in st.session_state): it holds
+    ETags for conditional GETs and the messages already loaded per session, so reruns
+    don't refetch history and a new turn only fetches messages newer than the last one seen.
+    The session list is reused for SESSIONS_TTL_S without asking the backend at all; it is
+    dropped early after a query (a new session or title may appear) and after clearing history.
+    """
+
+    PAGE_SIZE = 50
+    SESSIONS_TTL_S = 30
+
+    def __init__(self, api: ApiClient, cache: Optional[dict] = None):
         self.api = api
+        self.cache = cache if cache is not None else {}
+        self.cache.setdefault("etags", {})
+        self.cache.setdefault("messages", {})  # session_id -> {"items": [...], "has_more": bool, "stale": bool}
+        self.lists = TTLCache(self.cache.setdefault("lists", {}), ttl_s=self.SESSIONS_TTL_S)
 
-    def list_sessions(self) -> List[ChatSession]:
-        """Fetch all chat sessions for the current user."""
-        data = self.api.get("/chat/sessions/")
+    def list_sessions(self, limit: int = PAGE_SIZE, refresh: bool = False) -> List[ChatSession]:
+        """Fetch the current user's most recent chat sessions (cached for SESSIONS_TTL_S, then 304 when unchanged)."""
+        data = self.lists.get_or_load(
+            ("sessions", limit),
+            lambda: self.api.get_conditional("/chat/sessions", self.cache["etags"], {"limit": limit}),
+            refresh=refresh,
+        )
         # specific validation or transformation logic
         return [ChatSession(**item) for item in data]
 
     def get_messages(self, session_id: int) -> List[ChatMessage]:
-        """Fetch message history for a specific session."""
-        data = self.api.get(f"/chat/sessions/{session_id}/messages")
-        return [ChatMessage(**item) for item in data]
+        """Message history for a session: the latest page on first view, then only new messages."""
+        entry = self.cache["messages"].get(session_id)
+        if entry is None:
+            data = self.api.get(f"/chat/sessions/{session_id}/messages", {"limit": self.PAGE_SIZE})
+            entry = {"items": data, "has_more": len(data) == self.PAGE_SIZE, "stale": False}
+            self.cache["messages"][session_id] = entry
+        elif entry["stale"]:
+            last_id = entry["items"][-1]["id"] if entry["items"] else 0
+            entry["items"] += self.api.get(f"/chat/sessions/{session_id}/messages", {"after_id": last_id})
+            entry["stale"] = False
+        return [ChatMessage(**item) for item in entry["items"]]
+
+    def has_older_messages(self, session_id: int) -> bool:
+        entry = self.cache["messages"].get(session_id)
+        return bool(entry and entry["has_more"])
+
+    def load_older_messages(self, session_id: int) -> None:
+        """Prepend the previous page of history to the cached session."""
+        entry = self.cache["messages"].get(session_id)
+        if not entry or not entry["items"]:
+            return
+        data = self.api.get(
+            f"/chat/sessions/{session_id}/messages",
+            {"before_id": entry["items"][0]["id"], "limit": self.PAGE_SIZE},
+        )
+        entry["items"] = data + entry["items"]
+        entry["has_more"] = len(data) == self.PAGE_SIZE
 
     def clear_sessions(self) -> bool:
         """Clear all sessions for the user."""
         self.api.delete("/chat/sessions")
+        self.cache["messages"].clear()
+        self.cache["etags"].clear()
+        self.lists.invalidate()
         return True
 
     def query(self, question: str, session_id: Optional[int]) -> ChatqueryResponse:
         """Send a question to the CRAG engine."""
         payload = {"question": question, "session_id": session_id}
         data = self.api.post("/crag/query", payload)
+        self._mark_stale(data["session_id"])
         return ChatqueryResponse(**data)
 
-    def ingest_document(self, file_obj) -> str:
-        """Upload a file for ingestion."""
+    def query_stream(self, question: str, session_id: Optional[int]) -> Iterator[dict]:
+        """
+        Stream a question through the CRAG engine.
+        Yields events: intent, sources, token (incremental answer text), done (carries session_id).
+        """
+        payload = {"question": question, "session_id": session_id}
+        for event in self.api.stream_events("/crag/query/stream", payload):
+            if event["event"] == "error":
+                raise RuntimeError(event.get("detail", "Streaming failed."))
+            if event["event"] == "done":
+                self._mark_stale(event.get("session_id") or session_id)
+            yield event
+
+    def _mark_stale(self, session_id: Optional[int]) -> None:
+        # The turn was just saved; the next get_messages fetches it with after_id
+        self.lists.invalidate("sessions")
+        entry = self.cache["messages"].get(session_id)
+        if entry is not None:
+            entry["stale"] = True
+
+    def ingest_document(self, file_obj) -> dict:
+        """Upload a file for background ingestion. Returns the queued job (see get_ingest_job)."""
         # files dict for requests: {'field_name': (filename, fileobj, content_type)}
         files = {"file": (file_obj.name, file_obj, file_obj.type)}
-        data = self.api.post_file("/crag/ingest", files)
-        return data.get("message", "Ingested successfully.")
+        return self.api.post_file("/crag/ingest", files)
 
+    def get_ingest_job(self, job_id: str) -> dict:
+        """Poll progress of an ingestion job."""
+        return self.api.get(f"/crag/ingest/{job_id}")
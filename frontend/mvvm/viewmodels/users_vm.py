@@ -1,18 +1,31 @@
+from typing import Optional
+
 from mvvm.services.api_client import ApiClient
+from mvvm.services.ttl_cache import TTLCache
 
 
 class UsersViewModel:
-    def __init__(self, api: ApiClient):
+    """
+    `cache` should outlive a Streamlit rerun (e.g. a dict in st.session_state) and be shared by
+    the user pages: the directory is reused for USERS_TTL_S and dropped on every mutation.
+    """
+
+    USERS_TTL_S = 60
+
+    def __init__(self, api: ApiClient, cache: Optional[dict] = None):
         self.api = api
+        self.users = TTLCache(cache if cache is not None else {}, ttl_s=self.USERS_TTL_S)
 
-    def list_users(self) -> list[dict]:
-        return self.api.get("/users")
+    def list_users(self, refresh: bool = False) -> list[dict]:
+        return self.users.get_or_load("users", lambda: self.api.get("/users"), refresh=refresh)
 
     def create_user(self, username: str, password: str, name: str, email: str, role: str = "staff") -> dict:
-        return self.api.post(
+        created = self.api.post(
             "/users",
             {"username": username, "password": password, "role": role, "name": name, "email": email},
         )
+        self.users.invalidate()
+        return created
 
     def update_user(self, username: str, name: str | None = None, email: str | None = None, password: str | None = None) -> dict:
         payload = {}
@@ -22,10 +35,16 @@ class UsersViewModel:
             payload["email"] = email
         if password is not None:
             payload["password"] = password
-        return self.api.put(f"/users/{username}", payload)
+        updated = self.api.put(f"/users/{username}", payload)
+        self.users.invalidate()
+        return updated
 
     def update_role(self, username: str, role: str) -> dict:
-        return self.api.put(f"/users/{username}/role", {"role": role})
+        updated = self.api.put(f"/users/{username}/role", {"role": role})
+        self.users.invalidate()
+        return updated
 
     def delete_user(self, username: str) -> dict:
-        return self.api.delete(f"/users/{username}")
+        deleted = self.api.delete(f"/users/{username}")
+        self.users.invalidate()
+        return deleted
@@ -1,3 +1,5 @@
+import time
+
 import streamlit as st
 
 from mvvm.services.api_client import ApiClient
@@ -22,7 +24,8 @@ st.session_state.setdefault("active_session_id", None)
 # -----------------------------
 base_url = st.session_state.get("api_base_url", "http://127.0.0.1:8000")
 api = ApiClient(base_url=base_url, token=token)
-vm = ChatViewModel(api)
+# Survives reruns: ETags and already-loaded messages, so history isn't refetched every time
+vm = ChatViewModel(api, cache=st.session_state.setdefault("chat_cache", {}))
 
 # -----------------------------
 # UI (View)
@@ -74,12 +77,25 @@ with st.sidebar:
     uploaded = st.file_uploader("Upload PDF/TXT", type=["pdf", "txt"])
     if uploaded is not None:
         if st.button("Ingest", use_container_width=True):
-            with st.spinner("Ingesting document..."):
-                try:
-                    msg = vm.ingest_document(uploaded)
-                    st.success(f"Done! {msg}")
-                except Exception as e:
-                    st.error(f"Ingestion failed: {e}")
+            try:
+                job = vm.ingest_document(uploaded)
+                progress = st.progress(0.0, text="Queued...")
+                while job["status"] not in ("done", "failed"):
+                    time.sleep(1)
+                    job = vm.get_ingest_job(job["job_id"])
+                    total = job["chunks_total"] or 1
+                    done_chunks = job["chunks_embedded"] + job.get("chunks_reused", 0)
+                    progress.progress(
+                        min(done_chunks / total, 1.0),
+                        text=f"{job['status'].capitalize()}: {job['pages']} pages, "
+                        f"{done_chunks}/{job['chunks_total']} chunks",
+                    )
+                if job["status"] == "done":
+                    st.success(f"Done! {job['message']}")
+                else:
+                    st.error(f"Ingestion failed: {job['error']}")
+            except Exception as e:
+                st.error(f"Ingestion failed: {e}")
 
 # -----------------------------
 # Load messages for active session
@@ -94,6 +110,14 @@ if active_session_id:
         st.error(f"Failed to load messages: {e}")
         messages = []
 
+if active_session_id and vm.has_older_messages(active_session_id):
+    if st.button("Load earlier messages"):
+        try:
+            vm.load_older_messages(active_session_id)
+        except Exception as e:
+            st.error(f"Failed to load messages: {e}")
+        st.rerun()
+
 # Render messages
 for m in messages:
     chat_bubble(
@@ -108,10 +132,30 @@ for m in messages:
 # -----------------------------
 question = st.chat_input("Ask about tenancy agreements, policies, real estate procedures...")
 if question:
-    with st.spinner("CRAG is retrieving relevant knowledge..."):
-        try:
-            resp = vm.query(question, active_session_id)
-            st.session_state["active_session_id"] = resp.session_id or active_session_id
-        except Exception as e:
-            st.error(f"Query failed: {e}")
+    chat_bubble("user", question)
+    answer_slot = st.empty()
+    answer, sources = "", []
+    try:
+        with st.spinner("CRAG is retrieving relevant knowledge..."):
+            events = vm.query_stream(question, active_session_id)
+            # Keep the spinner up until the first answer token arrives
+            for event in events:
+                if event["event"] == "sources":
+                    sources = event["sources"]
+                elif event["event"] == "token":
+                    answer += event["text"]
+                    break
+        answer_slot.empty()
+        with answer_slot.container():
+            chat_bubble("assistant", answer, sources)
+
+        for event in events:
+            if event["event"] == "token":
+                answer += event["text"]
+                with answer_slot.container():
+                    chat_bubble("assistant", answer, sources)
+            elif event["event"] == "done":
+                st.session_state["active_session_id"] = event.get("session_id") or active_session_id
+    except Exception as e:
+        st.error(f"Query failed: {e}")
     st.rerun()
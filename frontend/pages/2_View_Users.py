@@ -11,27 +11,29 @@ token, _me = require_role("admin", "master")
 
 base_url = st.session_state.get("api_base_url", "http://127.0.0.1:8000")
 api = ApiClient(base_url=base_url, token=token)
-vm = UsersViewModel(api)
+# Shared with the other user pages; mutations there invalidate it
+vm = UsersViewModel(api, cache=st.session_state.setdefault("users_cache", {}))
 
-def onLoad_view_users():
+def onLoad_view_users(refresh: bool = False):
     try:
-        users = vm.list_users()
+        users = vm.list_users(refresh=refresh)
         st.session_state["view_users_data"] = users
-        set_flash("success", f"Loaded {len(users)} users.")
+        if refresh or "view_users_loaded" not in st.session_state:
+            set_flash("success", f"Loaded {len(users)} users.")
     except Exception as e:
         st.session_state["view_users_data"] = []
         set_flash("error", f"Failed to load users: {e}")
 
-if "view_users_loaded" not in st.session_state:
-    onLoad_view_users()
-    st.session_state["view_users_loaded"] = True
+# Reruns are served from the cache, so this only reaches the backend when it has expired
+onLoad_view_users()
+st.session_state["view_users_loaded"] = True
 
 st.title("View Users")
 st.caption("Read-only list of all users (Admin/Master only).")
 render_flash()
 
 if st.button("Refresh"):
-    onLoad_view_users()
+    onLoad_view_users(refresh=True)
 
 users = st.session_state.get("view_users_data", [])
 df = pd.DataFrame(users)
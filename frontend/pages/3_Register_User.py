@@ -9,7 +9,7 @@ token, _me = require_role("admin", "master")
 
 base_url = st.session_state.get("api_base_url", "http://127.0.0.1:8000")
 api = ApiClient(base_url=base_url, token=token)
-vm = UsersViewModel(api)
+vm = UsersViewModel(api, cache=st.session_state.setdefault("users_cache", {}))
 
 st.title("Register User")
 st.caption("Create a new staff user (Admin & Master).")
@@ -26,15 +26,16 @@ if role not in ("admin", "master"):
 token = st.session_state.get("token")
 base_url = st.session_state.get("api_base_url", "http://127.0.0.1:8000")
 api = ApiClient(base_url=base_url, token=token)
-vm = UsersViewModel(api)
+# Shared with the other user pages; every mutation below invalidates it
+vm = UsersViewModel(api, cache=st.session_state.setdefault("users_cache", {}))
 
 
 # -----------------------------
 # Handlers
 # -----------------------------
-def onLoad_manage_users():
+def onLoad_manage_users(refresh: bool = False):
     try:
-        users = vm.list_users()
+        users = vm.list_users(refresh=refresh)
         st.session_state["manage_users_all"] = users
         # Filter out myself
         candidates = [u for u in users if u.get("username") != user.get("username")]
@@ -46,7 +47,8 @@ def onLoad_manage_users():
         if candidates and (not current or current not in valid_usernames):
             st.session_state["selected_username"] = candidates[0]["username"]
 
-        set_flash("success", f"Loaded {len(users)} users.")
+        if refresh or "manage_users_loaded" not in st.session_state:
+            set_flash("success", f"Loaded {len(users)} users.")
     except Exception as e:
         set_flash("error", f"Failed to load users: {e}")
         st.session_state["manage_users_candidates"] = []
@@ -106,9 +108,9 @@ def onPress_delete_user():
 # -----------------------------
 # Init
 # -----------------------------
-if "manage_users_loaded" not in st.session_state:
-    onLoad_manage_users()
-    st.session_state["manage_users_loaded"] = True
+# Reruns are served from the cache, so this only reaches the backend when it has expired
+onLoad_manage_users()
+st.session_state["manage_users_loaded"] = True
 
 # -----------------------------
 # UI
@@ -117,7 +119,7 @@ st.title("Manage Users")
 render_flash()
 
 if st.button("Refresh"):
-    onLoad_manage_users()
+    onLoad_manage_users(refresh=True)
     st.rerun()
 
 candidates = st.session_state.get("manage_users_candidates", [])
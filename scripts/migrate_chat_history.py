@@ -1,14 +1,24 @@
-"""Optional migration helper:
+"""Optional import helper:
 Imports your old `chat_history.db` into the new `backend/app.db`.
 
+The target database is first brought to the latest schema with the backend's
+versioned migrations (backend/app/db/migrations.py), so it also works on a fresh file.
+Everything is imported in a single transaction.
+
 Usage:
   python scripts/migrate_chat_history.py --old path/to/chat_history.db --new backend/app.db
 """
 
 import argparse
+import os
 import sqlite3
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend"))
+
+from app.db.migrations import migrate  # noqa: E402
+
 
 def main() -> None:
     ap = argparse.ArgumentParser()
@@ -22,6 +32,7 @@ def main() -> None:
     new = sqlite3.connect(args.new)
     new.row_factory = sqlite3.Row
     new.execute("PRAGMA foreign_keys = ON;")
+    migrate(new)
 
     sessions = old.execute("SELECT * FROM chat_sessions").fetchall()
     msgs = old.execute("SELECT * FROM chat_messages").fetchall()
@@ -43,11 +54,10 @@ def main() -> None:
         )
         id_map[s["id"]] = cur.lastrowid
 
-    for m in msgs:
-        new.execute(
-            "INSERT INTO chat_messages (session_id, role, content, timestamp) VALUES (?,?,?,?)",
-            (id_map[m["session_id"]], m["role"], m["content"], m["timestamp"]),
-        )
+    new.executemany(
+        "INSERT INTO chat_messages (session_id, role, content, timestamp) VALUES (?,?,?,?)",
+        [(id_map[m["session_id"]], m["role"], m["content"], m["timestamp"]) for m in msgs],
+    )
 
     new.commit()
     old.close()